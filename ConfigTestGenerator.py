@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ConfigTestGenerator.py
+----------------------
+Entry point of the bundled ConfigTestGenerator.exe.
+
+Without arguments the GUI starts. With a command, the matching generator
+runs headless: tkinter is never imported and no window is created, so
+the exe works on CI agents without Python or a desktop session.
+
+  config    Excel -> config.hwtp (+ variant configs)   GenSymb_ConfigVRG.py
+  tests     config -> test menu(s)                     generate_test_menu_v4.py
+  all       workbook -> configs + tests, in parallel   vrg_gen.py all
+  batch     many workbooks, one folder each            vrg_gen.py batch
+  search    symbol search in a generated config        vrg_gen.py search
+  validate  simulate config + test menu (no bench)     isodiag_sim.py
+  emit      C header / JSON / CSV / SQLite outputs     config_emitters.py
+  db        query a symbol database                    symbol_db.py
+  inspect   section index of a large .hwtp             hwtp_reader.py
+  analyze   summarize a bench test log                 analyze_test_log.py
+
+Arguments after the command are those of the underlying script; the exit
+code is the script's (0 = success).
+
+The exe is a windowed (GUI subsystem) program: it writes to the console it
+was started from, or to redirected stdout/stderr. Shells do not wait for
+windowed programs, so scripts should wait explicitly:
+  start /wait ConfigTestGenerator.exe all input.xlsx --out-dir out
+  Start-Process ConfigTestGenerator.exe -ArgumentList "all","input.xlsx" -Wait -NoNewWindow
+
+Usage:
+  ConfigTestGenerator.exe                                  (GUI)
+  ConfigTestGenerator.exe all input.xlsx --out-dir out --jobs 4
+  ConfigTestGenerator.exe batch workbooks/ --out-dir out
+  ConfigTestGenerator.exe validate out/config_DZC.hwtp out/test_DZC_v4.hwtp --quiet
+  python ConfigTestGenerator.py config input.xlsx --out out/config.hwtp --multi
+"""
+
+import multiprocessing
+import os
+import sys
+import traceback
+from typing import Dict, List, Optional, Tuple
+
+
+# Set by build_exe.py --bench: the GUI exits once its window is drawn
+STARTUP_PROBE_ENV = "VRG_STARTUP_PROBE"
+
+# command -> (module, vrg_gen subcommand or None, description)
+COMMANDS: Dict[str, Tuple[str, Optional[str], str]] = {
+    "config": ("GenSymb_ConfigVRG", None, "Excel -> config.hwtp (+ variant configs with --multi)"),
+    "tests": ("generate_test_menu_v4", None, "Config -> test menu (all variants with --variants)"),
+    "all": ("vrg_gen", "all", "Workbook -> every config and test menu, in parallel"),
+    "batch": ("vrg_gen", "batch", "Many workbooks, one output folder each"),
+    "search": ("vrg_gen", "search", "Substring / fuzzy symbol search in a generated config"),
+    "validate": ("isodiag_sim", None, "Simulate a config + test menu: undefined symbols, labels"),
+    "emit": ("config_emitters", None, "C header / JSON / CSV / SQLite outputs of a workbook"),
+    "db": ("symbol_db", None, "Query a symbol database"),
+    "inspect": ("hwtp_reader", None, "Section index / records of a large .hwtp"),
+    "analyze": ("analyze_test_log", None, "Summarize a bench test log"),
+}
+
+
+def program_name() -> str:
+    return os.path.basename(sys.executable if getattr(sys, "frozen", False) else sys.argv[0])
+
+
+def attach_console():
+    """
+    A windowed exe starts with no stdout/stderr. Write to the console of
+    the calling shell if there is one; output redirected by the caller
+    (CI pipes, > file) already arrives as real streams.
+    """
+    if sys.stdout is not None and sys.stderr is not None:
+        return
+    attached = False
+    if sys.platform.startswith("win"):
+        import ctypes
+        ATTACH_PARENT_PROCESS = -1
+        attached = bool(ctypes.windll.kernel32.AttachConsole(ATTACH_PARENT_PROCESS))
+    target = "CONOUT$" if attached else os.devnull
+    if sys.stdout is None:
+        sys.stdout = open(target, "w", encoding="utf-8", errors="replace")
+    if sys.stderr is None:
+        sys.stderr = open(target, "w", encoding="utf-8", errors="replace")
+
+
+def print_usage():
+    name = program_name()
+    print(f"Usage: {name} [command] [arguments]")
+    print(f"       {name}                 (no arguments: start the GUI)")
+    print("\nCommands:")
+    for command, (_, _, description) in COMMANDS.items():
+        print(f"  {command:<10} {description}")
+    print(f"\n'{name} <command> --help' shows the arguments of a command.")
+
+
+def run_command(argv: List[str]) -> int:
+    """Run one headless command; returns the process exit code."""
+    command, args = argv[0], argv[1:]
+    if command in ("-h", "--help", "help"):
+        print_usage()
+        return 0
+    if command not in COMMANDS:
+        print(f"[ERROR] Unknown command: {command}")
+        print_usage()
+        return 2
+
+    module_name, subcommand, _ = COMMANDS[command]
+    module = __import__(module_name)
+    try:
+        if subcommand is not None:
+            code = module.main([subcommand] + args)
+        else:
+            # The scripts parse sys.argv themselves
+            sys.argv = [f"{program_name()} {command}"] + args
+            code = module.main()
+    except SystemExit as e:
+        # argparse errors / --help
+        code = e.code
+    except KeyboardInterrupt:
+        print("[ERROR] Interrupted")
+        return 130
+    except Exception:
+        traceback.print_exc()
+        return 1
+
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return code
+    print(code)
+    return 1
+
+
+def main() -> int:
+    if len(sys.argv) > 1:
+        attach_console()
+        return run_command(sys.argv[1:])
+
+    import ConfigTestGenerator_GUI
+    ConfigTestGenerator_GUI.main(startup_probe=bool(os.environ.get(STARTUP_PROBE_ENV)))
+    return 0
+
+
+if __name__ == "__main__":
+    # Batch workers are processes: in the bundled exe, worker start-up
+    # re-runs this entry point and must be handled before any dispatch
+    multiprocessing.freeze_support()
+    sys.exit(main())
@@ -9,6 +9,14 @@ Features:
 - Import Excel file
 - Generate configs (single + multi-variant)
 - Generate tests automatically
+- Generation runs on a background thread: progress bar + Cancel
+- Batch queue: many workbooks (multi-select or drag & drop), run
+  concurrently with a bounded worker count, per-job status and timing
+- Preview of generated configs/tests: virtualized line view (only the
+  visible rows exist), files grouped by variant, jump to any section
+- Diagnostics toggle: every generation also writes profile_configs.json /
+  profile_tests.json (per-stage timings, row counters); with Memory also
+  ticked, per-stage peak memory too (tracemalloc, slows generation down)
 - Modern dark theme interface
 
 Author: VRG Team
@@ -18,11 +26,36 @@ Date: 2025-01-03
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 from pathlib import Path
+import queue
 import subprocess
 import sys
+import threading
 import traceback
 import os
-from typing import Optional
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+from vrg_events import GenerationEvent
+from vrg_profile import NULL_PROFILER, Profiler
+
+# Drag & drop onto the batch queue needs the optional tkinterdnd2 package
+try:
+    from tkinterdnd2 import DND_FILES, TkinterDnD
+except ImportError:
+    DND_FILES = None
+    TkinterDnD = None
+
+
+# Worker -> UI queue polling interval (ms)
+POLL_MS = 50
+
+# Progress events shown in the status bar (vrg_events kinds)
+EVENT_LABELS = {"sheet_done": "Sheets", "variant_written": "Variants", "tests_written": "Tests"}
+
+
+class GenerationCancelled(Exception):
+    """Raised inside the worker thread when the user presses Cancel."""
 
 
 def get_resource_path(relative_path):
@@ -116,6 +149,12 @@ class ConfigTestGeneratorGUI:
         self.excel_path: Optional[Path] = None
         self.config_dir: Optional[Path] = None
         
+        # Background job state (one job at a time)
+        self.job_queue: "queue.Queue[tuple]" = queue.Queue()
+        self.cancel_event = threading.Event()
+        self.job_running = False
+        self.job_title = ""
+        
         # Configure root background
         self.root.configure(bg=self.bg_dark)
         
@@ -128,6 +167,10 @@ class ConfigTestGeneratorGUI:
         
         self.create_widgets()
         
+        # Load pandas in the background once the window is shown, so the
+        # first "Generate" click does not freeze the UI on the import
+        self.root.after(200, self.preload_generators)
+        
     def create_widgets(self):
         """Create all GUI widgets."""
         
@@ -177,6 +220,12 @@ class ConfigTestGeneratorGUI:
                                       bg_color=self.accent_blue, width=200, height=38)
         self.import_btn.grid(row=2, column=0, pady=(0, 15), padx=30, sticky="w")
         
+        # Batch queue (many workbooks, full pipeline each)
+        self.queue_btn = ModernButton(self.content_frame, "🗂 Batch Queue", self.open_queue,
+                                      bg_color=self.bg_light, hover_color="#505050", width=160, height=38)
+        self.queue_btn.grid(row=2, column=0, pady=(0, 15), padx=30, sticky="e")
+        self.queue_window: Optional["JobQueueWindow"] = None
+        
         # Step 2: Generate Configs
         self.create_step_section(self.content_frame, "STEP 2: Generate Configurations", 3)
         
@@ -207,6 +256,13 @@ class ConfigTestGeneratorGUI:
         self.test_btn.grid(row=8, column=0, pady=(0, 15), padx=30, sticky="nw")
         self.test_btn.set_enabled(False)
         
+        # Preview generated files
+        self.preview_btn = ModernButton(self.content_frame, "🔍 Preview", self.open_preview,
+                                        bg_color=self.bg_light, hover_color="#505050", width=160, height=38)
+        self.preview_btn.grid(row=8, column=0, pady=(0, 15), padx=30, sticky="ne")
+        self.preview_btn.set_enabled(False)
+        self.preview_window: Optional["PreviewWindow"] = None
+        
         # Status bar at bottom (compact)
         self.status_frame = tk.Frame(self.root, bg=self.bg_medium, height=35)
         self.status_frame.grid(row=2, column=0, sticky="ew")
@@ -217,6 +273,28 @@ class ConfigTestGeneratorGUI:
                                      bg=self.bg_medium, fg=self.text_gray, anchor="w")
         self.status_label.pack(side=tk.LEFT, padx=20, pady=8)
         
+        # Diagnostics: write a per-stage profile (profile_*.json) next to the outputs;
+        # Memory adds per-stage heap peaks (tracemalloc: noticeably slower runs)
+        self.diagnostics_var = tk.BooleanVar(value=False)
+        self.memory_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(self.status_frame, text="Memory", variable=self.memory_var,
+                       font=("Segoe UI", 9), bg=self.bg_medium, fg=self.text_gray,
+                       selectcolor=self.bg_light, activebackground=self.bg_medium
+                       ).pack(side=tk.RIGHT, padx=(0, 15))
+        tk.Checkbutton(self.status_frame, text="Diagnostics", variable=self.diagnostics_var,
+                       font=("Segoe UI", 9), bg=self.bg_medium, fg=self.text_gray,
+                       selectcolor=self.bg_light, activebackground=self.bg_medium
+                       ).pack(side=tk.RIGHT, padx=(0, 5))
+        
+        # Progress bar + Cancel (only shown while a job runs)
+        style = ttk.Style(self.root)
+        style.configure("VRG.Horizontal.TProgressbar", troughcolor=self.bg_light,
+                        background=self.accent_blue, borderwidth=0)
+        self.cancel_btn = ModernButton(self.status_frame, "✖ Cancel", self.cancel_job,
+                                       bg_color="#F44336", hover_color="#D32F2F", width=90, height=26)
+        self.progress = ttk.Progressbar(self.status_frame, mode="determinate", length=220,
+                                        style="VRG.Horizontal.TProgressbar")
+        
     def create_step_section(self, parent, title, row):
         """Create a step section header."""
         section_frame = tk.Frame(parent, bg=self.bg_light, height=38)
@@ -256,12 +334,139 @@ class ConfigTestGeneratorGUI:
             # Update status label font
             self.status_label.config(font=("Segoe UI", int(9 * scale)))
         
+    def preload_generators(self):
+        """Import the generators and pandas on a daemon thread (best effort)."""
+        def worker():
+            try:
+                import pandas  # noqa: F401
+                import GenSymb_ConfigVRG  # noqa: F401
+                import generate_test_menu_v4  # noqa: F401
+            except Exception:
+                # Reported properly by the button handlers if still missing
+                pass
+        
+        threading.Thread(target=worker, daemon=True).start()
+    
+    def new_profiler(self) -> Optional[Profiler]:
+        """A Profiler for the next job when Diagnostics is on (heap peaks with Memory)."""
+        if not self.diagnostics_var.get():
+            return None
+        return Profiler(trace_memory=self.memory_var.get())
+    
+    @staticmethod
+    def finish_profiler(profiler: Optional[Profiler], path: Path):
+        """Write the job's profile (also for failed / cancelled jobs)."""
+        if profiler:
+            profiler.close()
+            profiler.write_json(str(path))
+    
     def set_status(self, message: str, color: str = None):
         """Update status bar message."""
         self.status_label.config(text=message)
         if color:
             self.status_label.config(fg=color)
-        self.root.update()
+    
+    # ----------------------- Background jobs -----------------------
+    
+    def run_job(self, title: str, work: Callable, on_done: Callable, on_error: Callable):
+        """
+        Run work(report) on a worker thread. report(event) is the
+        vrg_events listener handed to the generators (events=report); it
+        raises GenerationCancelled once Cancel was pressed. on_done(result) /
+        on_error(message) run on the Tk thread.
+        """
+        if self.job_running:
+            return
+        self.job_running = True
+        self.cancel_event.clear()
+        self.job_title = title
+        self.job_done, self.job_error = on_done, on_error
+        
+        self.close_preview()
+        for btn in (self.import_btn, self.config_btn, self.test_btn, self.preview_btn):
+            btn.set_enabled(False)
+        self.progress.config(value=0, maximum=1)
+        self.cancel_btn.pack(side=tk.RIGHT, padx=(5, 20), pady=4)
+        self.progress.pack(side=tk.RIGHT, padx=5, pady=8)
+        self.set_status(f"{title}...", self.accent_blue)
+        
+        def report(event: GenerationEvent):
+            if self.cancel_event.is_set():
+                raise GenerationCancelled()
+            if event.kind in EVENT_LABELS:
+                self.job_queue.put(("progress", event))
+        
+        def worker():
+            try:
+                self.job_queue.put(("done", work(report)))
+            except GenerationCancelled:
+                self.job_queue.put(("cancelled",))
+            except Exception as e:
+                self.job_queue.put(("error", str(e)))
+        
+        threading.Thread(target=worker, daemon=True).start()
+        self.root.after(POLL_MS, self.poll_job)
+    
+    def poll_job(self):
+        """Drain the worker queue on the Tk thread."""
+        finished = None
+        try:
+            while True:
+                message = self.job_queue.get_nowait()
+                if message[0] == "progress":
+                    event = message[1]
+                    self.progress.config(maximum=max(event.total, 1), value=event.done)
+                    self.set_status(f"{self.job_title}... {EVENT_LABELS[event.kind]} "
+                                    f"{event.done}/{event.total}: {event.name}", self.accent_blue)
+                else:
+                    finished = message
+        except queue.Empty:
+            pass
+        
+        if finished is None:
+            self.root.after(POLL_MS, self.poll_job)
+            return
+        
+        self.job_running = False
+        self.progress.pack_forget()
+        self.cancel_btn.pack_forget()
+        self.import_btn.set_enabled(True)
+        self.config_btn.set_enabled(self.excel_path is not None)
+        self.test_btn.set_enabled(self.config_dir is not None)
+        self.preview_btn.set_enabled(self.config_dir is not None)
+        
+        if finished[0] == "done":
+            self.job_done(finished[1])
+        elif finished[0] == "cancelled":
+            self.set_status(f"{self.job_title} cancelled", "#FF9800")
+        else:
+            self.job_error(finished[1])
+    
+    def open_preview(self):
+        """Show the preview window for the current output folder."""
+        if not self.config_dir:
+            return
+        self.close_preview()
+        self.preview_window = PreviewWindow(self, self.config_dir)
+    
+    def close_preview(self):
+        """Close the preview (its memory maps would lock the files on Windows)."""
+        if self.preview_window is not None and self.preview_window.winfo_exists():
+            self.preview_window.on_close()
+        self.preview_window = None
+    
+    def open_queue(self):
+        """Show the batch queue window (one instance)."""
+        if self.queue_window is not None and self.queue_window.winfo_exists():
+            self.queue_window.lift()
+            return
+        self.queue_window = JobQueueWindow(self)
+    
+    def cancel_job(self):
+        """Ask the worker to stop at the next sheet/variant boundary."""
+        if self.job_running:
+            self.cancel_event.set()
+            self.set_status(f"Cancelling {self.job_title.lower()}...", "#FF9800")
         
     def import_excel(self):
         """Import Excel file."""
@@ -295,12 +500,12 @@ class ConfigTestGeneratorGUI:
             return
             
         self.config_dir = Path(output_dir)
+        excel_path = str(self.excel_path)
+        config_dir = str(self.config_dir)
+        profiler = self.new_profiler()
+        profile_file = self.config_dir / "profile_configs.json"
         
-        # Update status
-        self.set_status("Generating configs...", self.accent_blue)
-        self.root.update()
-        
-        try:
+        def work(report):
             # Prefer direct import to work inside bundled .exe
             try:
                 import GenSymb_ConfigVRG as genconf
@@ -310,18 +515,21 @@ class ConfigTestGeneratorGUI:
                 raise RuntimeError(f"Failed to import GenSymb_ConfigVRG module.\n\n{tb}") from imp_err
 
             # Run multi-config generation directly via API
-            genconf.generate_multi_configs(str(self.excel_path), str(self.config_dir), base_name="config")
-
-            # Count generated files
-            config_files = list(self.config_dir.glob("config*.hwtp"))
-            num_configs = len(config_files)
+            try:
+                genconf.generate_multi_configs(excel_path, config_dir, base_name="config", events=report,
+                                               profiler=profiler)
+            finally:
+                self.finish_profiler(profiler, profile_file)
+            return len(list(Path(config_dir).glob("config*.hwtp")))
 
+        def done(num_configs):
             self.config_label.config(
                 text=f"✅ Generated {num_configs} config file(s) in:\n{self.config_dir}",
                 fg=self.accent_green
             )
             self.test_btn.set_enabled(True)
-            self.set_status(f"Success! Generated {num_configs} configs", self.accent_green)
+            profiled = f" (profile: {profile_file.name})" if profiler else ""
+            self.set_status(f"Success! Generated {num_configs} configs{profiled}", self.accent_green)
 
             messagebox.showinfo(
                 "Success",
@@ -329,9 +537,11 @@ class ConfigTestGeneratorGUI:
                 f"Location: {self.config_dir}"
             )
 
-        except Exception as e:
+        def failed(message):
             self.set_status("Config generation failed!", "#F44336")
-            messagebox.showerror("Error", f"Error generating configs:\n\n{str(e)}")
+            messagebox.showerror("Error", f"Error generating configs:\n\n{message}")
+
+        self.run_job("Generating configs", work, done, failed)
             
     def generate_tests(self):
         """Generate test menu files."""
@@ -346,11 +556,11 @@ class ConfigTestGeneratorGUI:
             messagebox.showerror("Error", "No config files found!\nPlease generate configs first.")
             return
             
-        # Update status
-        self.set_status("Generating tests...", self.accent_blue)
-        self.root.update()
+        config_dir = self.config_dir
+        profiler = self.new_profiler()
+        profile_file = config_dir / "profile_tests.json"
         
-        try:
+        def work(report):
             # Import test generator as a module and call its API
             try:
                 import generate_test_menu_v4 as gentest
@@ -358,29 +568,48 @@ class ConfigTestGeneratorGUI:
                 tb = traceback.format_exc()
                 raise RuntimeError(f"Failed to import generate_test_menu_v4 module.\n\n{tb}") from imp_err
 
-            tests_generated = 0
+            master_config = config_dir / "config.hwtp"
+            jobs = min(8, os.cpu_count() or 1)
+
+            if master_config.exists():
+                # Parse the master config once; variants are written concurrently
+                try:
+                    return len(gentest.generate_variant_tests(master_config, config_dir, jobs=jobs,
+                                                              events=report, profiler=profiler))
+                finally:
+                    self.finish_profiler(profiler, profile_file)
+
+            from concurrent.futures import ThreadPoolExecutor, as_completed
 
-            for config_file in config_files:
+            def write_one(config_file: Path):
                 # Extract variant name (e.g., config_DZC.hwtp -> DZC)
                 variant = config_file.stem.replace("config_", "")
-                test_file = self.config_dir / f"test_{variant}_v4.hwtp"
+                test_file = config_dir / f"test_{variant}_v4.hwtp"
 
-                # Parse config and generate menu lines
+                # Parse config and stream the menu to the output file
                 groups = gentest.parse_config(config_file)
-                lines = gentest.generate_test_menu(groups)
+                lines = gentest.write_test_menu(groups, test_file)
+                return variant, {"path": str(test_file), "lines": lines, "groups": len(groups)}
 
-                # Write output file
-                with open(test_file, "w", encoding="utf-8") as f:
-                    f.write("\n".join(lines))
-
-                tests_generated += 1
+            try:
+                with (profiler or NULL_PROFILER).stage("write:test_menus", jobs=jobs), \
+                        ThreadPoolExecutor(max_workers=jobs) as pool:
+                    futures = [pool.submit(write_one, config_file) for config_file in config_files]
+                    for n, future in enumerate(as_completed(futures), 1):
+                        variant, data = future.result()
+                        report(GenerationEvent("tests_written", variant, n, len(futures), data))
+            finally:
+                self.finish_profiler(profiler, profile_file)
+            return len(futures)
 
+        def done(tests_generated):
             if tests_generated > 0:
                 self.test_label.config(
                     text=f"✅ Generated {tests_generated} test file(s) in:\n{self.config_dir}",
                     fg=self.accent_green
                 )
-                self.set_status(f"Success! Generated {tests_generated} tests", self.accent_green)
+                profiled = f" (profile: {profile_file.name})" if profiler else ""
+                self.set_status(f"Success! Generated {tests_generated} tests{profiled}", self.accent_green)
 
                 messagebox.showinfo(
                     "Success",
@@ -391,17 +620,510 @@ class ConfigTestGeneratorGUI:
                 self.set_status("No tests generated!", "#F44336")
                 messagebox.showwarning("Warning", "No tests were generated. Check config files.")
 
-        except Exception as e:
+        def failed(message):
             self.set_status("Test generation failed!", "#F44336")
-            messagebox.showerror("Error", f"Error generating tests:\n\n{str(e)}")
+            messagebox.showerror("Error", f"Error generating tests:\n\n{message}")
+
+        self.run_job("Generating tests", work, done, failed)
+
+
+class PreviewWindow(tk.Toplevel):
+    """
+    Preview of the generated .hwtp files of one output folder.
+    
+    Left: files grouped by variant (Master, DZC, MAN, ...); a file's
+    sections are listed lazily when it is expanded, from the HwtpReader
+    section index. Right: a virtualized line view - the Treeview only ever
+    holds as many rows as fit on screen and scrolling just rewrites their
+    values from the memory-mapped file, so a 200k-line config scrolls as
+    fast as a small one. Jumping to a section is one array lookup.
+    
+    The search box queries the trigram symbol index of config.hwtp
+    (symbol_search.py, loaded on a background thread); selecting a match
+    jumps to its definition line.
+    """
+    
+    SEARCH_DELAY_MS = 150
+    
+    FILE_RE = re.compile(r'^(?:config_(\w+)|test_(\w+)_v4)\.hwtp$')
+    ROW_HEIGHT = 20
+    
+    def __init__(self, app: "ConfigTestGeneratorGUI", folder: Path):
+        super().__init__(app.root)
+        self.app = app
+        self.folder = Path(folder)
+        self.title(f"Preview - {self.folder}")
+        self.geometry("1000x620")
+        self.minsize(700, 400)
+        self.configure(bg=app.bg_dark)
+        
+        self.readers: Dict[str, "HwtpReader"] = {}   # path -> open reader
+        self.nav_targets: Dict[str, tuple] = {}      # nav item -> (path, section index or None)
+        self.reader = None
+        self.top = 0
+        self.row_items: List[str] = []
+        self.symbol_index = None
+        self.search_job = None
+        self.result_lines: Dict[str, int] = {}        # result item -> line number
+        
+        self.grid_rowconfigure(0, weight=1)
+        self.grid_columnconfigure(1, weight=1)
+        
+        left = tk.Frame(self, bg=app.bg_dark)
+        left.grid(row=0, column=0, sticky="nsew", padx=(8, 0), pady=8)
+        left.grid_rowconfigure(2, weight=1)
+        left.grid_columnconfigure(0, weight=1)
+        
+        # Symbol search: box + fuzzy toggle + results
+        search_bar = tk.Frame(left, bg=app.bg_dark)
+        search_bar.grid(row=0, column=0, sticky="ew")
+        self.search_var = tk.StringVar()
+        self.fuzzy_var = tk.BooleanVar(value=False)
+        entry = ttk.Entry(search_bar, textvariable=self.search_var)
+        entry.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        tk.Checkbutton(search_bar, text="fuzzy", variable=self.fuzzy_var, command=self.schedule_search,
+                       bg=app.bg_dark, fg=app.text_gray, selectcolor=app.bg_light,
+                       activebackground=app.bg_dark).pack(side=tk.LEFT, padx=(4, 0))
+        self.search_var.trace_add("write", lambda *args: self.schedule_search())
+        
+        self.results = ttk.Treeview(left, columns=("symbol", "variant", "group"), show="headings",
+                                    selectmode="browse", height=7)
+        for column, width in (("symbol", 150), ("variant", 50), ("group", 80)):
+            self.results.heading(column, text=column.capitalize())
+            self.results.column(column, width=width, anchor="w")
+        self.results.grid(row=1, column=0, sticky="ew", pady=(4, 4))
+        self.results.bind("<<TreeviewSelect>>", self.on_result_select)
+        
+        # Navigation tree: variant -> file -> sections
+        self.nav = ttk.Treeview(left, show="tree", selectmode="browse")
+        self.nav.column("#0", width=280)
+        self.nav.grid(row=2, column=0, sticky="nsew")
+        self.nav.bind("<<TreeviewOpen>>", self.on_nav_open)
+        self.nav.bind("<<TreeviewSelect>>", self.on_nav_select)
+        
+        # Virtualized line view
+        view = tk.Frame(self, bg=app.bg_dark)
+        view.grid(row=0, column=1, sticky="nsew", padx=8, pady=8)
+        view.grid_rowconfigure(0, weight=1)
+        view.grid_columnconfigure(0, weight=1)
+        style = ttk.Style(self)
+        style.configure("Preview.Treeview", font=("Consolas", 10), rowheight=self.ROW_HEIGHT)
+        self.lines = ttk.Treeview(view, columns=("no", "text"), show="headings",
+                                  selectmode="none", style="Preview.Treeview", height=1)
+        self.lines.heading("no", text="Line")
+        self.lines.heading("text", text="Text")
+        self.lines.column("no", width=70, anchor="e", stretch=False)
+        self.lines.column("text", width=800, anchor="w")
+        self.lines.grid(row=0, column=0, sticky="nsew")
+        self.vbar = ttk.Scrollbar(view, orient=tk.VERTICAL, command=self.on_scrollbar)
+        self.vbar.grid(row=0, column=1, sticky="ns")
+        
+        self.lines.bind("<Configure>", self.on_view_resize)
+        self.lines.bind("<MouseWheel>", lambda e: self.scroll_to(self.top - 3 * (1 if e.delta > 0 else -1)))
+        self.lines.bind("<Button-4>", lambda e: self.scroll_to(self.top - 3))
+        self.lines.bind("<Button-5>", lambda e: self.scroll_to(self.top + 3))
+        for key, step in (("<Up>", -1), ("<Down>", 1)):
+            self.lines.bind(key, lambda e, step=step: self.scroll_to(self.top + step))
+        self.lines.bind("<Prior>", lambda e: self.scroll_to(self.top - len(self.row_items)))
+        self.lines.bind("<Next>", lambda e: self.scroll_to(self.top + len(self.row_items)))
+        self.lines.bind("<Home>", lambda e: self.scroll_to(0))
+        self.lines.bind("<End>", lambda e: self.scroll_to(self.total_lines()))
+        self.lines.bind("<Button-1>", lambda e: self.lines.focus_set())
+        
+        self.status = tk.Label(self, text="", bg=app.bg_medium, fg=app.text_gray,
+                               anchor="w", font=("Segoe UI", 9))
+        self.status.grid(row=1, column=0, columnspan=2, sticky="ew")
+        
+        self.populate_files()
+        self.load_symbol_index()
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+    
+    # ----------------------- Navigation -----------------------
+    
+    def populate_files(self):
+        """Group the folder's .hwtp files by variant; sections are loaded on expand."""
+        variants: Dict[str, List[Path]] = {}
+        for path in sorted(self.folder.glob("*.hwtp")):
+            match = self.FILE_RE.match(path.name)
+            variant = (match.group(1) or match.group(2)) if match else "Master"
+            variants.setdefault(variant, []).append(path)
+        
+        for variant in sorted(variants, key=lambda v: (v != "Master", v)):
+            group = self.nav.insert("", tk.END, text=variant, open=(variant == "Master"))
+            for path in variants[variant]:
+                item = self.nav.insert(group, tk.END, text=path.name)
+                self.nav_targets[item] = (str(path), None)
+                self.nav.insert(item, tk.END, text="...")   # placeholder: expandable
+        self.status.config(text=f"{sum(len(p) for p in variants.values())} file(s) in {self.folder}")
+    
+    def get_reader(self, path: str):
+        if path not in self.readers:
+            from hwtp_reader import HwtpReader
+            self.readers[path] = HwtpReader(path)
+        return self.readers[path]
+    
+    def on_nav_open(self, event):
+        item = self.nav.focus()
+        target = self.nav_targets.get(item)
+        children = self.nav.get_children(item)
+        if target is None or target[1] is not None or not children or \
+                self.nav.item(children[0], "text") != "...":
+            return
+        self.nav.delete(*children)
+        reader = self.get_reader(target[0])
+        for index, name in enumerate(reader.sections):
+            section_item = self.nav.insert(item, tk.END, text=name)
+            self.nav_targets[section_item] = (target[0], index)
+    
+    def on_nav_select(self, event):
+        selection = self.nav.selection()
+        target = self.nav_targets.get(selection[0]) if selection else None
+        if target is None:
+            return
+        path, section = target
+        reader = self.get_reader(path)
+        if reader is not self.reader:
+            self.reader = reader
+            self.top = 0
+        line = reader.section_line_numbers[section] if section is not None else 0
+        self.scroll_to(line)
+    
+    # ----------------------- Symbol search -----------------------
+    
+    def master_config(self) -> Path:
+        return self.folder / "config.hwtp"
+    
+    def load_symbol_index(self):
+        """Load (or build and cache) the trigram index without blocking the UI."""
+        if not self.master_config().exists():
+            return
+        
+        def worker():
+            try:
+                from symbol_search import SymbolIndex
+                self.symbol_index = SymbolIndex.load(self.master_config())
+            except Exception as e:
+                self.index_error = str(e)
+        
+        self.index_error = None
+        self.index_thread = threading.Thread(target=worker, daemon=True)
+        self.index_thread.start()
+        self.after(POLL_MS, self.poll_symbol_index)
+    
+    def poll_symbol_index(self):
+        if self.index_thread.is_alive():
+            self.after(POLL_MS, self.poll_symbol_index)
+        elif self.index_error:
+            self.status.config(text=f"Symbol search unavailable: {self.index_error}")
+        elif self.search_var.get().strip():
+            # Run the query typed while the index was loading
+            self.run_search()
+    
+    def schedule_search(self):
+        """Debounce keystrokes: search once typing pauses."""
+        if self.search_job is not None:
+            self.after_cancel(self.search_job)
+        self.search_job = self.after(self.SEARCH_DELAY_MS, self.run_search)
+    
+    def run_search(self):
+        self.search_job = None
+        self.results.delete(*self.results.get_children())
+        self.result_lines.clear()
+        query = self.search_var.get().strip()
+        if not query:
+            return
+        if self.symbol_index is None:
+            if self.master_config().exists():
+                self.status.config(text="Indexing symbols...")
+            else:
+                self.status.config(text="Symbol search needs config.hwtp in this folder")
+            return
+        
+        hits = self.symbol_index.search(query, fuzzy=self.fuzzy_var.get(), limit=200)
+        for hit in hits:
+            item = self.results.insert("", tk.END, values=(hit.symbol, hit.variant or "-", hit.group or "-"))
+            self.result_lines[item] = hit.line_no
+        self.status.config(text=f"{len(hits)} match(es) for '{query}'")
+    
+    def on_result_select(self, event):
+        selection = self.results.selection()
+        if not selection:
+            return
+        reader = self.get_reader(str(self.master_config()))
+        self.reader = reader
+        # Show the definition a few lines below the top, with its section above
+        self.scroll_to(self.result_lines[selection[0]] - 1 - 3)
+    
+    # ----------------------- Virtualized view -----------------------
+    
+    def total_lines(self) -> int:
+        return self.reader.line_count if self.reader is not None else 0
+    
+    def on_view_resize(self, event):
+        """Keep exactly one Treeview item per visible row."""
+        heading = 24
+        rows = max(1, (event.height - heading) // self.ROW_HEIGHT)
+        while len(self.row_items) < rows:
+            self.row_items.append(self.lines.insert("", tk.END, values=("", "")))
+        while len(self.row_items) > rows:
+            self.lines.delete(self.row_items.pop())
+        self.render()
+    
+    def scroll_to(self, line: int):
+        rows = len(self.row_items)
+        self.top = max(0, min(line, self.total_lines() - rows))
+        self.render()
+    
+    def on_scrollbar(self, action, value, unit=None):
+        rows = len(self.row_items)
+        if action == "moveto":
+            self.scroll_to(int(float(value) * self.total_lines()))
+        elif action == "scroll":
+            step = rows if unit == "pages" else 1
+            self.scroll_to(self.top + int(value) * step)
+    
+    def render(self):
+        """Rewrite the visible rows from the mapped file."""
+        total = self.total_lines()
+        for k, item in enumerate(self.row_items):
+            n = self.top + k
+            if n < total:
+                self.lines.item(item, values=(n + 1, self.reader.line(n)))
+            else:
+                self.lines.item(item, values=("", ""))
+        
+        if total:
+            rows = len(self.row_items)
+            self.vbar.set(self.top / total, min(1.0, (self.top + rows) / total))
+            reader = self.reader
+            section = reader.section_of_offset(reader.line_offsets[self.top])
+            where = f" - {reader.sections[section]}" if section >= 0 else ""
+            self.status.config(text=f"{reader.path.name}: lines {self.top + 1}-"
+                                    f"{min(total, self.top + rows)} of {total}{where}")
+        else:
+            self.vbar.set(0.0, 1.0)
+    
+    def on_close(self):
+        for reader in self.readers.values():
+            reader.close()
+        self.destroy()
+
+
+class JobQueueWindow(tk.Toplevel):
+    """
+    Batch queue: each workbook runs the full pipeline (master + variant
+    configs + variant tests, vrg_gen.run_workbook) in a process pool with a
+    bounded number of workers. Jobs show status, time and output folder;
+    double-click opens the output folder.
+    """
+    
+    COLUMNS = ("workbook", "status", "time", "output")
+    
+    def __init__(self, app: "ConfigTestGeneratorGUI"):
+        super().__init__(app.root)
+        self.app = app
+        self.title("VRG Batch Queue")
+        self.geometry("860x420")
+        self.minsize(600, 300)
+        self.configure(bg=app.bg_dark)
+        
+        self.jobs: Dict[str, dict] = {}     # tree item id -> job
+        self.output_root: Optional[Path] = None
+        self.pool: Optional[ProcessPoolExecutor] = None
+        self.futures: Dict[str, object] = {}
+        
+        self.grid_rowconfigure(1, weight=1)
+        self.grid_columnconfigure(0, weight=1)
+        
+        # Toolbar
+        bar = tk.Frame(self, bg=app.bg_medium)
+        bar.grid(row=0, column=0, sticky="ew")
+        for text, command, color in (("➕ Add", self.add_files, app.accent_blue),
+                                     ("➖ Remove", self.remove_selected, app.bg_light),
+                                     ("📂 Output", self.choose_output, app.bg_light),
+                                     ("▶ Run", self.run, app.accent_green),
+                                     ("✖ Cancel", self.cancel, "#F44336")):
+            ModernButton(bar, text, command, bg_color=color, width=110, height=32).pack(
+                side=tk.LEFT, padx=(8, 0), pady=6)
+        
+        tk.Label(bar, text="Workers:", bg=app.bg_medium, fg=app.text_gray,
+                 font=("Segoe UI", 9)).pack(side=tk.LEFT, padx=(16, 4))
+        self.workers = tk.IntVar(value=min(4, os.cpu_count() or 1))
+        tk.Spinbox(bar, from_=1, to=max(1, os.cpu_count() or 1), width=4,
+                   textvariable=self.workers).pack(side=tk.LEFT)
+        
+        # Job list
+        self.tree = ttk.Treeview(self, columns=self.COLUMNS, show="headings", selectmode="extended")
+        for column, width in zip(self.COLUMNS, (220, 90, 70, 420)):
+            self.tree.heading(column, text=column.capitalize())
+            self.tree.column(column, width=width, anchor="w", stretch=(column == "output"))
+        self.tree.grid(row=1, column=0, sticky="nsew", padx=8, pady=8)
+        self.tree.bind("<Double-1>", self.open_output)
+        
+        hint = "Add workbooks with ➕ Add"
+        if DND_FILES is not None and hasattr(self.tree, "drop_target_register"):
+            self.tree.drop_target_register(DND_FILES)
+            self.tree.dnd_bind("<<Drop>>", self.on_drop)
+            hint += " or drag & drop .xlsx files here"
+        self.status = tk.Label(self, text=hint + ". Output: next to each workbook",
+                               bg=app.bg_medium, fg=app.text_gray, anchor="w", font=("Segoe UI", 9))
+        self.status.grid(row=2, column=0, sticky="ew")
+        
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+    
+    # ----------------------- Queue editing -----------------------
+    
+    def add_paths(self, paths: List[str]):
+        known = {job["path"] for job in self.jobs.values()}
+        for path in paths:
+            path = os.path.abspath(path)
+            if (not path.lower().endswith(".xlsx") or os.path.basename(path).startswith("~$")
+                    or path in known):
+                continue
+            job = {"path": path, "status": "queued", "seconds": None, "output": self.output_for(path)}
+            item = self.tree.insert("", tk.END, values=self.row(job))
+            self.jobs[item] = job
+            known.add(path)
+    
+    def add_files(self):
+        paths = filedialog.askopenfilenames(parent=self, title="Add Excel Workbooks",
+                                            filetypes=[("Excel files", "*.xlsx"), ("All files", "*.*")])
+        self.add_paths(list(paths))
+    
+    def on_drop(self, event):
+        self.add_paths(list(self.tk.splitlist(event.data)))
+    
+    def remove_selected(self):
+        for item in self.tree.selection():
+            if self.jobs[item]["status"] not in ("running", "pending"):
+                self.tree.delete(item)
+                del self.jobs[item]
+    
+    def choose_output(self):
+        folder = filedialog.askdirectory(parent=self, title="Select Output Root (one folder per workbook)")
+        if not folder:
+            return
+        self.output_root = Path(folder)
+        for item, job in self.jobs.items():
+            if job["status"] == "queued":
+                job["output"] = self.output_for(job["path"])
+                self.tree.item(item, values=self.row(job))
+        self.status.config(text=f"Output: {self.output_root}/<workbook>")
+    
+    def output_for(self, path: str) -> str:
+        """<output root or workbook folder>/<workbook name>, unique within the queue."""
+        name = Path(path).stem
+        root = self.output_root or Path(path).parent
+        used = {job["output"] for job in self.jobs.values() if job["path"] != path}
+        output, n = root / name, 2
+        while str(output) in used:
+            output, n = root / f"{name}_{n}", n + 1
+        return str(output)
+    
+    @staticmethod
+    def row(job: dict) -> tuple:
+        seconds = "" if job["seconds"] is None else f"{job['seconds']:.1f} s"
+        return (os.path.basename(job["path"]), job["status"], seconds, job["output"])
+    
+    # ----------------------- Running -----------------------
+    
+    def run(self):
+        """Submit every queued job to a bounded process pool."""
+        todo = [item for item, job in self.jobs.items() if job["status"] in ("queued", "error", "cancelled")]
+        if not todo:
+            return
+        try:
+            import vrg_gen
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to import vrg_gen module.\n\n{e}", parent=self)
+            return
+        
+        polling = bool(self.futures)
+        if not polling:
+            # Fresh pool per run so a changed worker count takes effect
+            if self.pool is not None:
+                self.pool.shutdown(wait=False)
+            self.pool = ProcessPoolExecutor(max_workers=max(1, self.workers.get()))
+        for item in todo:
+            job = self.jobs[item]
+            job["status"], job["seconds"] = "pending", None
+            self.tree.item(item, values=self.row(job))
+            self.futures[item] = self.pool.submit(vrg_gen.run_workbook, job["path"], job["output"])
+        if not polling:
+            self.after(POLL_MS * 4, self.poll)
+    
+    def poll(self):
+        """Refresh job rows from their futures (Tk thread)."""
+        for item, future in list(self.futures.items()):
+            job = self.jobs.get(item)
+            if job is None:
+                continue
+            if future.done():
+                del self.futures[item]
+                if future.cancelled():
+                    job["status"] = "cancelled"
+                else:
+                    try:
+                        result = future.result()
+                        job["status"], job["seconds"] = result["status"], result["seconds"]
+                        job["error"] = result.get("error")
+                    except Exception as e:
+                        job["status"], job["error"] = "error", str(e)
+            elif future.running() and job["status"] == "pending":
+                job["status"] = "running"
+            else:
+                continue
+            self.tree.item(item, values=self.row(job))
+        
+        counts = {}
+        for job in self.jobs.values():
+            counts[job["status"]] = counts.get(job["status"], 0) + 1
+        self.status.config(text="  ".join(f"{status}: {n}" for status, n in sorted(counts.items())))
+        
+        if self.futures:
+            self.after(POLL_MS * 4, self.poll)
+        else:
+            failed = [job for job in self.jobs.values() if job["status"] == "error"]
+            for job in failed:
+                self.status.config(text=f"{self.status.cget('text')}  |  "
+                                        f"{os.path.basename(job['path'])}: {job.get('error')}")
+    
+    def cancel(self):
+        """Drop jobs that have not started; running ones finish."""
+        for future in self.futures.values():
+            future.cancel()
+    
+    def open_output(self, event):
+        item = self.tree.identify_row(event.y)
+        if not item or not os.path.isdir(self.jobs[item]["output"]):
+            return
+        folder = self.jobs[item]["output"]
+        if sys.platform.startswith("win"):
+            os.startfile(folder)
+        else:
+            subprocess.Popen(["open" if sys.platform == "darwin" else "xdg-open", folder])
+    
+    def on_close(self):
+        self.cancel()
+        if self.pool is not None:
+            self.pool.shutdown(wait=False)
+        self.destroy()
 
 
-def main():
+def main(startup_probe: bool = False):
     """Main entry point."""
-    root = tk.Tk()
+    root = TkinterDnD.Tk() if TkinterDnD is not None else tk.Tk()
     app = ConfigTestGeneratorGUI(root)
+    if startup_probe:
+        # build_exe.py --bench: exit as soon as the window has been drawn
+        root.update()
+        root.destroy()
+        return
     root.mainloop()
 
 
 if __name__ == "__main__":
+    # Batch queue workers are processes; required inside the bundled .exe
+    import multiprocessing
+    multiprocessing.freeze_support()
     main()
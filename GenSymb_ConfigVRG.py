@@ -40,21 +40,59 @@ Rules implemented (summary):
 
 The script writes a single combined "config.hwtp" file.
 
+- Multiple workbooks (base platform + overlays), lowest priority first:
+  sheets with the same name are merged into one section, symbols share one
+  symbol space (overlays may reference base symbols), identical definitions
+  are written once and conflicting ones are reported; the highest-priority
+  workbook wins.
+
+- Workbook reader (--engine): pandas, or "stream" (xlsx_stream.py, openpyxl
+  only, identical output); "auto" uses pandas when it is installed.
+
+- Progress is a stream of events (vrg_events.py): --verbose prints one line
+  per sheet, --event-log PATH appends every event as JSON lines.
+
+- --profile [PATH]: per-stage timings and heap peaks (workbook open, sheet
+  parse, processors, variant split, writes) plus row counters (processed,
+  skipped by reason) as JSON, see vrg_profile.py.
+
+- --map firmware.map: cross-check the Master sheet addresses (and symbols
+  resolved from them) against a GNU ld / TASKING linker map; mismatches
+  are reported as warnings, see linker_map.py.
+
 Usage:
   python GenSymb_ConfigVRG.py /path/to/workbook.xlsx --out /path/to/config.hwtp
   python GenSymb_ConfigVRG.py /path/to/workbook.xlsx  (outputs to ./config.hwtp)
+  python GenSymb_ConfigVRG.py base.xlsx customer.xlsx --out config.hwtp --multi
+  python GenSymb_ConfigVRG.py /path/to/workbook.xlsx --engine stream
+  python GenSymb_ConfigVRG.py /path/to/workbook.xlsx --multi --profile --cprofile prof/
+  python GenSymb_ConfigVRG.py /path/to/workbook.xlsx --multi --verbose --event-log events.jsonl
+  python GenSymb_ConfigVRG.py /path/to/workbook.xlsx --multi --map firmware.map
 
 Author: Modified for VRG requirements
 """
 
+from __future__ import annotations
+
 import argparse
+import importlib.util
 import os
 import re
-from collections import defaultdict
+import time
+from collections import Counter, defaultdict
+from contextlib import ExitStack
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Tuple, Set
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple, Set
+
+from symbol_table import SymbolTable
+from vrg_events import add_event_arguments, as_emitter, console_listener, emitter_from_args
+from vrg_profile import NULL_PROFILER, add_profile_arguments, finish_profile, profile_path, profiler_from_args
 
-import pandas as pd
+# pandas is imported lazily by open_workbook() only (and not at all with the
+# stream engine), so --help, the parsing helpers and the test generator
+# start without it.
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 # --------------------------- Helpers ---------------------------
@@ -94,8 +132,17 @@ def best_col(cm: Dict[str, str], *candidates: str) -> Optional[str]:
     return None
 
 
+def is_missing(v) -> bool:
+    """pandas-free equivalent of pd.isna() for a single cell value."""
+    if v is None:
+        return True
+    if isinstance(v, float):
+        return v != v  # NaN
+    return type(v).__name__ in ("NAType", "NaTType")
+
+
 def as_str(v) -> str:
-    if pd.isna(v):
+    if is_missing(v):
         return ""
     return str(v).strip()
 
@@ -114,7 +161,7 @@ def parse_int_from_str(s: str, base: int) -> Optional[int]:
 
 def parse_hex_cell(x) -> Optional[int]:
     """Parse a value coming from a 'Hex' column. Accepts forms like '48', '0x48', 'A', '0xa' etc."""
-    if pd.isna(x):
+    if is_missing(x):
         return None
     s = as_str(x)
     if s == "":
@@ -132,7 +179,7 @@ def parse_hex_cell(x) -> Optional[int]:
 
 def parse_dec_cell(x) -> Optional[int]:
     """Parse a value coming from an 'Offset' column (decimal). Accept '8', '8.', '72d', etc."""
-    if pd.isna(x):
+    if is_missing(x):
         return None
     s = as_str(x).lower().strip()
     s = s.replace("d", "")
@@ -241,15 +288,56 @@ def is_common_sheet(sheet_name: str) -> bool:
     return False
 
 
+@dataclass
+class SymbolRecord:
+    """One symbol definition written by the processors (see Context.records, config_emitters.py)."""
+    section: str
+    variant: Optional[str]
+    op: str                          # wo32 / wo16 / by / var
+    symbol: str
+    size: int                        # bytes (multi-word parents: full size)
+    base: Optional[str] = None       # reference symbol, None for absolute addresses
+    offset: Optional[int] = None     # offset from base (or the absolute address)
+    radix: Optional[str] = None      # "hex" (0x..) or "dec" (N.) as written in the sheet
+    indirect: bool = False           # $$$$() dereference of base + offset
+    expression: str = ""             # address expression as written in the .hwtp
+    parent: Optional[str] = None     # multi-word parent for _low/_high/_wN words
+
+
 @dataclass
 class Context:
     master_symbol: Optional[str] = None
     std_symtab_ref: Optional[str] = None  # e.g., main_c_SymtabStd_u32
     defined_symbols: set = None  # Set of all defined symbols
+    counters: Counter = None  # rows processed / skipped by reason (see --profile)
+    master_addresses: Dict[str, int] = None  # Master sheet symbol -> address (see --map)
+    symbols: SymbolTable = None  # statically placed symbols -> address (see --map)
+    records: Optional[Dict[str, List[SymbolRecord]]] = None  # section -> SymbolRecords, only if set to {}
+    section: str = ""  # section (sheet) being processed, see run_processor()
+    variant: Optional[str] = None  # its variant suffix
     
     def __post_init__(self):
         if self.defined_symbols is None:
             self.defined_symbols = set()
+        if self.symbols is None:
+            self.symbols = SymbolTable()
+        if self.master_addresses is None:
+            self.master_addresses = {}
+        if self.counters is None:
+            self.counters = Counter()
+
+    def skip(self, reason: str):
+        """Count a row the processors dropped (rows_skipped_<reason>)."""
+        self.counters[f"rows_skipped_{reason}"] += 1
+
+    def record(self, op: str, symbol: str, expression: str, size: int, base: Optional[str] = None,
+               offset: Optional[int] = None, radix: Optional[str] = None, indirect: bool = False,
+               parent: Optional[str] = None):
+        """Keep the structured form of a definition line (no-op unless records were requested)."""
+        if self.records is None:
+            return
+        self.records.setdefault(self.section, []).append(SymbolRecord(
+            self.section, self.variant, op, symbol, size, base, offset, radix, indirect, expression, parent))
 
 
 # --------------------------- Processors ---------------------------
@@ -267,9 +355,11 @@ def process_master(df: pd.DataFrame, ctx: Context) -> List[str]:
     first_symbol = None
 
     for _, row in df.iterrows():
+        ctx.counters["rows_processed"] += 1
         sym = as_str(row.get(c_symbol))
         addr_raw = as_str(row.get(c_addr))
         if not sym or not addr_raw:
+            ctx.skip("empty")
             continue
 
         # Pick first non-empty for fallback
@@ -299,12 +389,19 @@ def process_master(df: pd.DataFrame, ctx: Context) -> List[str]:
             addr_fmt = addr
 
         lines.append(f"wo32 {sym:<28} {addr_fmt}")
+        address = parse_int_from_str(addr_fmt[2:], 16) if addr_fmt[:2].lower() == "0x" else None
+        if address is not None:
+            ctx.master_addresses[sym] = address
+        ctx.record("wo32", sym, addr_fmt, size=4, offset=address, radix="hex" if address is not None else None)
 
     # set ctx.master_symbol
     ctx.master_symbol = candidate_master or first_symbol
     # Add master symbol to defined symbols
     if ctx.master_symbol:
         ctx.defined_symbols.add(ctx.master_symbol)
+        address = ctx.master_addresses.get(ctx.master_symbol)
+        if address is not None:
+            ctx.symbols.locate(ctx.master_symbol, address)
     return lines
 
 
@@ -319,12 +416,15 @@ def process_symbol_tables(df: pd.DataFrame, ctx: Context) -> List[str]:
         return lines
 
     for _, row in df.iterrows():
+        ctx.counters["rows_processed"] += 1
         sym = as_str(row.get(c_sym))
         ref = as_str(row.get(c_ref))
         if not sym or not ref:
+            ctx.skip("empty")
             continue
         off_dec = parse_dec_cell(row.get(c_off))
         if off_dec is None:
+            ctx.skip("bad_offset")
             continue
         off_fmt = fmt_off_from_dec(off_dec)
 
@@ -334,8 +434,11 @@ def process_symbol_tables(df: pd.DataFrame, ctx: Context) -> List[str]:
 
         # Add symbol to defined symbols
         ctx.defined_symbols.add(sym)
+        ctx.symbols.forget(sym)  # $$$$(): no static address
         
         lines.append(f"wo32 {sym:<28} $$$$({ref} +  {off_fmt})")
+        ctx.record("wo32", sym, f"$$$$({ref} +  {off_fmt})", size=4, base=ref, offset=off_dec,
+                   radix="dec", indirect=True)
     return lines
 
 
@@ -353,8 +456,10 @@ def process_standard_symbol_table(df: pd.DataFrame, ctx: Context) -> List[str]:
         return lines
 
     for _, row in df.iterrows():
+        ctx.counters["rows_processed"] += 1
         sym_raw = as_str(row.get(c_sym))
         if not sym_raw:
+            ctx.skip("empty")
             continue
 
         # Normalize symbol name (replace spaces with underscores)
@@ -373,14 +478,18 @@ def process_standard_symbol_table(df: pd.DataFrame, ctx: Context) -> List[str]:
                 val_int = v
                 val_src = "dec"
         if val_int is None:
+            ctx.skip("bad_offset")
             continue
 
         off_fmt = fmt_off_from_hex(val_int) if val_src == "hex" else fmt_off_from_dec(val_int)
         
         # Add symbol to defined symbols
         ctx.defined_symbols.add(sym)
+        ctx.symbols.forget(sym)  # $$$$(): no static address
         
         lines.append(f"wo32 {sym:<28} $$$$({ctx.std_symtab_ref} +  {off_fmt})")
+        ctx.record("wo32", sym, f"$$$$({ctx.std_symtab_ref} +  {off_fmt})", size=4, base=ctx.std_symtab_ref,
+                   offset=val_int, radix=val_src, indirect=True)
     return lines
 
 
@@ -414,9 +523,13 @@ def process_generic(df: pd.DataFrame, ctx: Context = None) -> List[str]:
         return lines
 
     for _, row in df.iterrows():
+        if ctx:
+            ctx.counters["rows_processed"] += 1
         sym_raw = as_str(row.get(c_sym))
         base_raw = as_str(row.get(c_ref))
         if not sym_raw or not base_raw:
+            if ctx:
+                ctx.skip("empty")
             continue
 
         # Normalize symbol name (replace spaces with underscores)
@@ -427,11 +540,14 @@ def process_generic(df: pd.DataFrame, ctx: Context = None) -> List[str]:
         # This happens when Excel has errors like psu_g_Control_b16 -> psu_g_Control_b16
         # Skip these entries as they are invalid
         if sym == base:
+            if ctx:
+                ctx.skip("circular")
             continue
         
         # Check if base symbol is defined (exists in context)
         # If not, skip this entry to avoid "Error : ???" in ISODiag
         if ctx and base not in ctx.defined_symbols:
+            ctx.skip("missing_base")
             continue
 
         # size
@@ -461,6 +577,8 @@ def process_generic(df: pd.DataFrame, ctx: Context = None) -> List[str]:
                 off_int = v
                 off_src = "dec"
         if off_int is None:
+            if ctx:
+                ctx.skip("bad_offset")
             continue
 
         # prepare formatter for offsets
@@ -470,23 +588,37 @@ def process_generic(df: pd.DataFrame, ctx: Context = None) -> List[str]:
         # Check if this symbol is a pointer type OR if the base reference is a pointer type
         # If either is true, we need to use $$$$() for address indirection
         use_dollar_wrapper = is_pointer_type(sym) or is_pointer_type(base)
+        is_can_msg = re.search(r"can", sym, re.IGNORECASE) and re.search(r"msg", sym, re.IGNORECASE)
+
+        # Static address (--map): base + offset, unless read through a pointer
+        base_address = ctx.symbols.address_of(base) if ctx else None
 
         # simple sizes
         op = op_for_size(size)
         if op:
             # Use $$$$() wrapper for pointer types or when referencing through pointers
             if use_dollar_wrapper:
-                lines.append(f"{op:<4} {sym:<28} $$$$({base} +  {fmt_off(off_int)})")
+                expr = f"$$$$({base} +  {fmt_off(off_int)})"
             else:
-                lines.append(f"{op:<4} {sym:<28} {base} +  {fmt_off(off_int)}")
+                expr = f"{base} +  {fmt_off(off_int)}"
+            lines.append(f"{op:<4} {sym:<28} {expr}")
+            if ctx:
+                ctx.record(op, sym, expr, size=size, base=base, offset=off_int, radix=off_src,
+                           indirect=use_dollar_wrapper)
 
             # CAN+MSG additional rule (emit VAR line with same offset format)
-            if re.search(r"can", sym, re.IGNORECASE) and re.search(r"msg", sym, re.IGNORECASE):
+            if is_can_msg:
                 lines.append(f"var  {sym:<28} {fmt_off(off_int)}")
+                if ctx:
+                    ctx.record("var", sym, fmt_off(off_int), size=0, offset=off_int, radix=off_src)
 
             # Add symbol to defined symbols so it can be referenced by other symbols
             if ctx:
                 ctx.defined_symbols.add(sym)
+                if base_address is None or use_dollar_wrapper:
+                    ctx.symbols.forget(sym)
+                else:
+                    ctx.symbols.locate(sym, base_address + off_int)
 
             continue
 
@@ -495,10 +627,17 @@ def process_generic(df: pd.DataFrame, ctx: Context = None) -> List[str]:
         if words > 0:
             # First, declare the base symbol (without suffix) so it can be referenced
             lines.append(f"wo32 {sym:<28} {base} +  {fmt_off(off_int)}")
+            if ctx:
+                ctx.record("wo32", sym, f"{base} +  {fmt_off(off_int)}", size=size, base=base,
+                           offset=off_int, radix=off_src)
             
             # Add base symbol to defined symbols
             if ctx:
                 ctx.defined_symbols.add(sym)
+                if base_address is None:
+                    ctx.symbols.forget(sym)
+                else:
+                    ctx.symbols.locate(sym, base_address + off_int)
             
             # naming strategy:
             #  - if words == 2 -> _low, _high
@@ -519,58 +658,115 @@ def process_generic(df: pd.DataFrame, ctx: Context = None) -> List[str]:
                 
                 # Add split symbol to defined symbols
                 if ctx:
+                    ctx.record("wo32", sym_i, f"{base} +  {fmt_off(off_i)}", size=4, base=base,
+                               offset=off_i, radix=off_src, parent=sym)
                     ctx.defined_symbols.add(sym_i)
+                    if base_address is None:
+                        ctx.symbols.forget(sym_i)
+                    else:
+                        ctx.symbols.locate(sym_i, base_address + off_i)
 
             # CAN+MSG rule for base symbol (one VAR at base offset)
-            if re.search(r"can", sym, re.IGNORECASE) and re.search(r"msg", sym, re.IGNORECASE):
+            if is_can_msg:
                 lines.append(f"var  {sym:<28} {fmt_off(off_int)}")
+                if ctx:
+                    ctx.record("var", sym, fmt_off(off_int), size=0, offset=off_int, radix=off_src)
 
     return lines
 
 
 # --------------------------- Orchestrator ---------------------------
 
-def generate_from_excel(xlsx_path: str) -> Tuple[str, Dict[str, List[str]]]:
+EXCEL_ENGINES = ("auto", "pandas", "stream")
+
+
+def open_workbook(xlsx_path: str, engine: str = "auto"):
+    """
+    Workbook with sheet_names and parse(sheet, dtype=object).
+    engine: "pandas" (pd.ExcelFile), "stream" (xlsx_stream, openpyxl only,
+            same cell values) or "auto" (pandas if installed, else stream).
+    """
+    if engine == "auto":
+        engine = "pandas" if importlib.util.find_spec("pandas") else "stream"
+    if engine == "pandas":
+        import pandas as pd
+        return pd.ExcelFile(xlsx_path, engine="openpyxl")
+    if engine == "stream":
+        from xlsx_stream import StreamWorkbook
+        return StreamWorkbook(xlsx_path)
+    raise ValueError(f"Unknown Excel engine: {engine} (available: {', '.join(EXCEL_ENGINES)})")
+
+
+def parse_sheet(xls, sname: str, profiler=NULL_PROFILER):
+    with profiler.stage(f"sheet_parse:{sname}"):
+        return xls.parse(sname, dtype=object)
+
+
+def run_processor(processor, df, ctx: Context, sname: str, profiler=NULL_PROFILER) -> List[str]:
+    header = section_header(sname)
+    ctx.section = header.strip(';= ')
+    ctx.variant = extract_suffix_from_section_header(header)
+    with profiler.stage(f"{processor.__name__}:{sname}", rows=len(df)):
+        return processor(df, ctx)
+
+
+def generate_from_excel(xlsx_path: str, progress=None, engine: str = "auto",
+                        profiler=None, events=None, ctx: Optional[Context] = None) -> Tuple[str, Dict[str, List[str]]]:
     """
+    progress: optional callback progress("sheet", done, total), called after
+              each sheet is processed; it may raise to cancel the run.
+    engine:   workbook reader, see open_workbook().
+    profiler: optional vrg_profile.Profiler: workbook open, sheet parse and
+              processor stages, row counters.
+    events:   optional vrg_events.EventEmitter or listener: workbook_opened,
+              sheet_started, sheet_done(rows, lines, ms); a listener may
+              raise to cancel the run.
+    ctx:      optional Context to fill (symbols, Master addresses), e.g.
+              for check_link_map() afterwards; a fresh one by default.
+              With ctx.records = {} the processors also keep a
+              SymbolRecord per definition line (config_emitters.py).
     Returns:
       combined_text (str)
       per_sheet_lines: dict of sheet_name -> list(lines)
     """
-    xls = pd.ExcelFile(xlsx_path, engine="openpyxl")
-    sheet_names = xls.sheet_names
+    profiler = profiler or NULL_PROFILER
+    emitter = as_emitter(events, progress)
+    with profiler.stage("workbook_open", engine=engine):
+        xls = open_workbook(xlsx_path, engine)
+        sheet_names = xls.sheet_names
+    emitter.emit("workbook_opened", str(xlsx_path), 0, len(sheet_names))
 
-    ctx = Context()
+    ctx = ctx or Context()
 
     # First pass: find master symbol + build "Master" and "Symbol Tables" right away
     per_sheet: Dict[str, List[str]] = {}
 
-    # Capture "Master" + "Symbol Tables" first
+    def run_sheet(sname: str, processor):
+        emitter.emit("sheet_started", sname, len(per_sheet), len(sheet_names))
+        start = time.perf_counter()
+        df = parse_sheet(xls, sname, profiler)
+        lines = [section_header(sname)]
+        # generic sheets are kept even if they produce no output (sheet structure)
+        lines += run_processor(processor, df, ctx, sname, profiler)
+        per_sheet[sname] = lines
+        emitter.emit("sheet_done", sname, len(per_sheet), len(sheet_names), rows=len(df),
+                     lines=len(lines) - 1, ms=round((time.perf_counter() - start) * 1000, 1))
+
+    # Capture "Master" + "Symbol Tables" first (other sheets are read in the second pass)
     for sname in sheet_names:
-        df = xls.parse(sname, dtype=object)
         if is_master_sheet(sname):
-            lines = [section_header(sname)]
-            lines += process_master(df, ctx)
-            per_sheet[sname] = lines
+            run_sheet(sname, process_master)
         elif is_symbol_tables_sheet(sname):
-            lines = [section_header(sname)]
-            lines += process_symbol_tables(df, ctx)
-            per_sheet[sname] = lines
+            run_sheet(sname, process_symbol_tables)
 
     # Second pass: process "Standard Symbol Table" and others
     for sname in sheet_names:
         if sname in per_sheet:
             continue
-        df = xls.parse(sname, dtype=object)
         if is_standard_symbol_table_sheet(sname):
-            lines = [section_header(sname)]
-            lines += process_standard_symbol_table(df, ctx)
-            per_sheet[sname] = lines
+            run_sheet(sname, process_standard_symbol_table)
         else:
-            # generic - process all sheets even if they produce no output
-            lines = [section_header(sname)]
-            glines = process_generic(df, ctx)
-            lines += glines  # Add even if empty to preserve sheet structure
-            per_sheet[sname] = lines
+            run_sheet(sname, process_generic)
 
     # Combine in original Excel sheet order
     combined_lines: List[str] = []
@@ -578,12 +774,189 @@ def generate_from_excel(xlsx_path: str) -> Tuple[str, Dict[str, List[str]]]:
         combined_lines.extend(per_sheet.get(s, []))
 
     combined_text = "\n".join(combined_lines) + "\n"
+    profiler.add_counters(ctx.counters)
+    profiler.count("sheets", len(sheet_names))
+    profiler.count("config_lines", len(combined_lines))
     return combined_text, per_sheet
 
 
-def generate_multi_configs(xlsx_path: str, output_dir: str, base_name: str = "config"):
+# --------------------------- Multi-workbook merge ---------------------------
+
+DEFINITION_RE = re.compile(r"^(wo32|wo16|by|var)\s+(\S+)\s+(.*)$")
+
+
+@dataclass
+class MergeConflict:
+    symbol: str
+    variant: Optional[str]
+    kept_workbook: str
+    kept_definition: str
+    dropped_workbook: str
+    dropped_definition: str
+
+
+@dataclass
+class MergeReport:
+    workbooks: List[str]
+    duplicates: int = 0
+    conflicts: List[MergeConflict] = None
+
+    def __post_init__(self):
+        if self.conflicts is None:
+            self.conflicts = []
+
+
+def definition_key(line: str) -> Optional[Tuple[str, str]]:
+    """(symbol key, normalized definition) of a config line, None for headers/comments."""
+    match = DEFINITION_RE.match(line)
+    if not match:
+        return None
+    op, sym, expr = match.groups()
+    expr = " ".join(expr.split(";", 1)[0].split())
+    # var lines live next to the wo32 of the same name; keep them apart
+    key = f"var {sym}" if op == "var" else sym
+    return key, f"{op} {expr}"
+
+
+def generate_from_workbooks(xlsx_paths: List[str], engine: str = "auto", profiler=None,
+                            ctx: Optional[Context] = None) -> Tuple[str, Dict[str, List[str]], MergeReport]:
+    """
+    Merge several workbooks into one config, lowest priority first.
+
+    Every sheet is read once. All workbooks share one Context, so overlay
+    sheets can reference symbols defined by the base workbook. Definitions
+    go through a hash index keyed by symbol name (per variant suffix, since
+    each variant has its own symbol space): identical redefinitions from
+    another workbook are dropped, conflicting ones are replaced in place by
+    the higher-priority workbook's definition and reported.
+
+    profiler: optional vrg_profile.Profiler, as for generate_from_excel().
+    ctx:      optional shared Context to fill, as for generate_from_excel().
+
+    Returns:
+      combined_text (str)
+      per_sheet_lines: dict of sheet_name -> list(lines)
+      report: MergeReport (duplicates dropped, conflicts)
+    """
+    profiler = profiler or NULL_PROFILER
+    books = []
+    for p in xlsx_paths:
+        with profiler.stage(f"workbook_open:{os.path.basename(p)}", engine=engine):
+            books.append((os.path.basename(p), open_workbook(p, engine)))
+    ctx = ctx or Context()
+    report = MergeReport([name for name, _ in books])
+
+    per_sheet: Dict[str, List[str]] = {}   # merged sections, first-seen order
+    # (variant suffix, symbol key) -> (sheet, line index, workbook index, definition)
+    index: Dict[Tuple[Optional[str], str], Tuple[str, int, int, str]] = {}
+
+    def merge_lines(book_no: int, sname: str, lines: List[str]):
+        section = per_sheet.setdefault(sname, [section_header(sname)])
+        suffix = extract_suffix_from_section_header(section[0])
+        for line in lines:
+            parsed = definition_key(line)
+            if parsed is None:
+                section.append(line)
+                continue
+            key, definition = (suffix, parsed[0]), parsed[1]
+            seen = index.get(key)
+            if seen is None or seen[2] == book_no:
+                # New symbol (or redefined inside the same workbook: kept as-is)
+                index[key] = (sname, len(section), book_no, definition)
+                section.append(line)
+            elif seen[3] == definition:
+                report.duplicates += 1
+            else:
+                kept_sheet, pos, kept_book, kept_def = seen
+                report.conflicts.append(MergeConflict(
+                    parsed[0], suffix, books[book_no][0], definition, books[kept_book][0], kept_def))
+                per_sheet[kept_sheet][pos] = line
+                index[key] = (kept_sheet, pos, book_no, definition)
+
+    # Phase 1 across all workbooks: Master + Symbol Tables (anchors for everything else)
+    for book_no, (_, xls) in enumerate(books):
+        for sname in xls.sheet_names:
+            if is_master_sheet(sname):
+                anchor = ctx.master_symbol
+                lines = run_processor(process_master, parse_sheet(xls, sname, profiler), ctx, sname, profiler)
+                # The base workbook's master symbol stays the anchor
+                ctx.master_symbol = anchor or ctx.master_symbol
+                merge_lines(book_no, sname, lines)
+            elif is_symbol_tables_sheet(sname):
+                merge_lines(book_no, sname, run_processor(
+                    process_symbol_tables, parse_sheet(xls, sname, profiler), ctx, sname, profiler))
+
+    # Phase 2: Standard Symbol Table and generic sheets, resolved against the shared context
+    for book_no, (_, xls) in enumerate(books):
+        for sname in xls.sheet_names:
+            if is_master_sheet(sname) or is_symbol_tables_sheet(sname):
+                continue
+            df = parse_sheet(xls, sname, profiler)
+            if is_standard_symbol_table_sheet(sname):
+                merge_lines(book_no, sname, run_processor(process_standard_symbol_table, df, ctx, sname, profiler))
+            else:
+                merge_lines(book_no, sname, run_processor(process_generic, df, ctx, sname, profiler))
+
+    # Original sheet order of the base workbook, then sheets only found in overlays
+    order: List[str] = []
+    for _, xls in books:
+        order += [s for s in xls.sheet_names if s not in order]
+
+    combined_lines: List[str] = []
+    for s in order:
+        combined_lines.extend(per_sheet.get(s, []))
+    combined_text = "\n".join(combined_lines) + "\n"
+    profiler.add_counters(ctx.counters)
+    profiler.count("sheets", len(order))
+    profiler.count("config_lines", len(combined_lines))
+    return combined_text, per_sheet, report
+
+
+def print_merge_report(report: MergeReport):
+    print(f"[INFO] Merged {len(report.workbooks)} workbooks (lowest priority first): {', '.join(report.workbooks)}")
+    print(f"[INFO] {report.duplicates} identical duplicate definition(s) dropped")
+    for c in report.conflicts:
+        where = f" [{c.variant}]" if c.variant else ""
+        print(f"[WARN] Conflict {c.symbol}{where}: {c.kept_workbook} '{c.kept_definition}' "
+              f"overrides {c.dropped_workbook} '{c.dropped_definition}'")
+    if report.conflicts:
+        print(f"[WARN] {len(report.conflicts)} conflicting definition(s)")
+
+
+# --------------------------- Linker map check ---------------------------
+
+def check_link_map(ctx: Context, map_path: str, profiler=None):
+    """
+    Cross-check a decoded workbook against a linker map (GNU ld / TASKING):
+    every Master sheet address, and every symbol whose address follows from
+    the config (<base> + <off> down to a Master address). Returns a
+    linker_map.MapCheckReport; see linker_map.py.
+    """
+    import linker_map
+    profiler = profiler or NULL_PROFILER
+    with profiler.stage("map_parse", map=os.path.basename(map_path)):
+        link_map = linker_map.parse_map(map_path)
+    with profiler.stage("map_check"):
+        report = linker_map.cross_check(link_map, ctx.master_addresses, ctx.symbols.absolute_addresses())
+    profiler.count("map_symbols", len(link_map))
+    profiler.count("map_mismatches", len(report.mismatches))
+    return report
+
+
+def generate_multi_configs(xlsx_path: str, output_dir: str, base_name: str = "config",
+                           combined_text: Optional[str] = None, progress=None, engine: str = "auto",
+                           profiler=None, events=None):
     """
     Generate multiple config files by analyzing the generated master config.
+    combined_text: already generated (e.g. merged) master config; skips the workbook decode.
+    engine: workbook reader, see open_workbook().
+    progress: optional callback progress(stage, done, total) with stage "sheet"
+              (workbook decode) and "variant" (variant configs written).
+    profiler: optional vrg_profile.Profiler: decode stages (see
+              generate_from_excel()), variant split and every file write.
+    events:   optional vrg_events.EventEmitter or listener: the decode's
+              sheet events, config_written, variants_found, variant_written.
+              Without one (and without progress) the events are printed.
     
     Process:
     1. Generate complete master config with all symbols
@@ -593,18 +966,56 @@ def generate_multi_configs(xlsx_path: str, output_dir: str, base_name: str = "co
        - Only blocks with that specific suffix
        - Excluding blocks with other suffixes
     """
+    profiler = profiler or NULL_PROFILER
+    if events is None and progress is None:
+        events = console_listener()
+    emitter = as_emitter(events, progress)
+
     # Step 1: Generate complete master config
-    print("[INFO] Generating master config...")
-    combined_text, _ = generate_from_excel(xlsx_path)
+    if combined_text is None:
+        combined_text, _ = generate_from_excel(xlsx_path, engine=engine, profiler=profiler, events=emitter)
     
     # Write master config
     master_path = os.path.join(output_dir, f"{base_name}.hwtp")
     os.makedirs(output_dir, exist_ok=True)
-    with open(master_path, "w", encoding="utf-8") as f:
-        f.write(combined_text)
-    print(f"[OK] Master config generated: {master_path}")
+    with profiler.stage(f"write:{base_name}.hwtp"):
+        with open(master_path, "w", encoding="utf-8") as f:
+            f.write(combined_text)
+    emitter.emit("config_written", f"{base_name}.hwtp", path=master_path, lines=combined_text.count("\n"))
     
     # Step 2: Analyze master config to find suffixes and categorize sections
+    with profiler.stage("variant_split"):
+        sections, suffixes_found = split_config_sections(combined_text)
+    
+    emitter.emit("variants_found", total=len(suffixes_found), variants=sorted(suffixes_found))
+    # If no suffixes found, we're done
+    if not suffixes_found:
+        return
+    
+    # Step 3: Generate config for each suffix
+    for n, suffix in enumerate(sorted(suffixes_found), 1):
+        output_path = os.path.join(output_dir, f"{base_name}_{suffix}.hwtp")
+        
+        with profiler.stage(f"variant_split:{suffix}"):
+            config_lines = variant_config_lines(sections, suffix)
+        
+        # Write config
+        with profiler.stage(f"write:{base_name}_{suffix}.hwtp", lines=len(config_lines)):
+            with open(output_path, "w", encoding="utf-8") as f:
+                f.write('\n'.join(config_lines))
+        
+        profiler.count("variants")
+        emitter.emit("variant_written", suffix, n, len(suffixes_found), path=output_path, lines=len(config_lines))
+
+
+def split_config_sections(combined_text: str) -> Tuple[List[Tuple[str, Optional[str], List[str]]], Set[str]]:
+    """
+    Split a combined config into sections.
+    
+    Returns:
+      sections: list of (header_line, suffix_or_none, section_lines)
+      suffixes_found: set of project suffixes (DZC, MAN, ...)
+    """
     lines = combined_text.split('\n')
     suffixes_found = set()
     sections = []  # List of (header_line, suffix_or_none, section_lines)
@@ -637,31 +1048,19 @@ def generate_multi_configs(xlsx_path: str, output_dir: str, base_name: str = "co
     if current_section_header is not None:
         sections.append((current_section_header, current_section_suffix, current_section_lines))
     
-    # If no suffixes found, we're done
-    if not suffixes_found:
-        print("[INFO] No project suffixes detected in master config.")
-        return
-    
-    print(f"[INFO] Detected {len(suffixes_found)} project variants: {', '.join(sorted(suffixes_found))}")
-    
-    # Step 3: Generate config for each suffix
-    for suffix in sorted(suffixes_found):
-        output_path = os.path.join(output_dir, f"{base_name}_{suffix}.hwtp")
-        print(f"[INFO] Generating {base_name}_{suffix}.hwtp...")
-        
-        config_lines = []
-        for header, section_suffix, section_lines in sections:
-            # Include if:
-            # - Section has no suffix (general block) OR
-            # - Section has THIS suffix
-            if section_suffix is None or section_suffix == suffix:
-                config_lines.extend(section_lines)
-        
-        # Write config
-        with open(output_path, "w", encoding="utf-8") as f:
-            f.write('\n'.join(config_lines))
-        
-        print(f"[OK] Generated: {output_path}")
+    return sections, suffixes_found
+
+
+def variant_config_lines(sections: List[Tuple[str, Optional[str], List[str]]], suffix: str) -> List[str]:
+    """Lines of the config for one project suffix: general blocks + that suffix's blocks."""
+    config_lines = []
+    for header, section_suffix, section_lines in sections:
+        # Include if:
+        # - Section has no suffix (general block) OR
+        # - Section has THIS suffix
+        if section_suffix is None or section_suffix == suffix:
+            config_lines.extend(section_lines)
+    return config_lines
 
 
 def write_outputs(out_dir: str, combined_text: str, per_sheet_lines: Dict[str, List[str]], one_file: bool, per_sheet: bool):
@@ -671,35 +1070,72 @@ def write_outputs(out_dir: str, combined_text: str, per_sheet_lines: Dict[str, L
 
 def main():
     ap = argparse.ArgumentParser(description="Generate .hwtp config from Excel workbook.")
-    ap.add_argument("excel", help="Path to the Excel workbook (.xlsx)")
+    ap.add_argument("excel", nargs="+",
+                    help="Path to the Excel workbook (.xlsx); several = base + overlays, lowest priority first")
     ap.add_argument("--out", "-o", default="./config.hwtp", help="Output file path (default: ./config.hwtp)")
     ap.add_argument("--multi", action="store_true", help="Generate multiple configs based on sheet name suffixes (e.g., MAN, DZC)")
+    ap.add_argument("--engine", choices=EXCEL_ENGINES, default="auto",
+                    help="Workbook reader: pandas, stream (openpyxl only) or auto (default: pandas if installed)")
+    ap.add_argument("--map", metavar="MAP",
+                    help="Linker map (GNU ld / TASKING): cross-check the Master addresses and resolved symbols")
+    add_profile_arguments(ap)
+    add_event_arguments(ap)
     args = ap.parse_args()
+    if args.map and not os.path.exists(args.map):
+        ap.error(f"linker map not found: {args.map}")
+
+    with ExitStack() as stack:
+        run(args, emitter_from_args(args, stack))
+
 
-    xlsx_path = args.excel
+def run(args, events):
+    xlsx_path = args.excel[0]
     out_path = args.out
+    profiler = profiler_from_args(args)
+    # The map check needs the decoded symbols: decode here instead of in generate_multi_configs()
+    ctx = Context() if args.map else None
+
+    merged_text = None
+    if len(args.excel) > 1:
+        merged_text, _, report = generate_from_workbooks(args.excel, engine=args.engine, profiler=profiler, ctx=ctx)
+        print_merge_report(report)
+        xlsx_path = ", ".join(args.excel)
+    elif ctx is not None and args.multi:
+        merged_text, _ = generate_from_excel(xlsx_path, engine=args.engine, profiler=profiler,
+                                             events=events, ctx=ctx)
 
     if args.multi:
         # Multi-config mode: generate separate configs for each project suffix
         out_dir = os.path.dirname(out_path) or "."
         base_name = os.path.splitext(os.path.basename(out_path))[0]
-        generate_multi_configs(xlsx_path, out_dir, base_name)
+        generate_multi_configs(xlsx_path, out_dir, base_name, combined_text=merged_text, engine=args.engine,
+                               profiler=profiler, events=events)
     else:
         # Single config mode (original behavior)
-        combined_text, per_sheet_lines = generate_from_excel(xlsx_path)
+        if merged_text is not None:
+            combined_text = merged_text
+        else:
+            combined_text, per_sheet_lines = generate_from_excel(xlsx_path, engine=args.engine, profiler=profiler,
+                                                                 events=events, ctx=ctx)
 
         # Write single combined file
         out_dir = os.path.dirname(out_path)
         if out_dir:
             os.makedirs(out_dir, exist_ok=True)
         
-        with open(out_path, "w", encoding="utf-8") as f:
-            f.write(combined_text)
+        with (profiler or NULL_PROFILER).stage(f"write:{os.path.basename(out_path)}"):
+            with open(out_path, "w", encoding="utf-8") as f:
+                f.write(combined_text)
 
         # Summary
         print(f"[OK] Generated config from: {xlsx_path}")
         print(f" - Output file: {out_path}")
 
+    if ctx is not None:
+        import linker_map
+        linker_map.print_map_report(check_link_map(ctx, args.map, profiler))
+    finish_profile(profiler, profile_path(args, os.path.dirname(out_path)))
+
 
 if __name__ == "__main__":
     main()
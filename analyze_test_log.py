@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+analyze_test_log.py
+-------------------
+Streaming analyzer for captured ISODiag console logs of test_<variant>_v4.hwtp runs.
+
+The generated script is read first to learn what every printed line means:
+- "=== <name> Test ===" headers identify the hardware group
+- 'EC "<prefix>" DW/DB <symbol>' lines map each printed prefix to its symbol
+- SPI "Pattern n: 0x...." lines are followed by the MD dump of the RxBuf
+Subroutine scripts (--subroutines) are resolved through the WO #p/#q/...
+parameter loads of each group.
+
+The log is then read line by line keeping only running aggregates per
+group and symbol (count, min, max, sum), so memory stays constant and
+multi-hour soak logs are summarized in seconds.
+
+Summary per group:
+- SPI:      echo match count (RxBuf, little-endian, == transmitted pattern)
+- PWM_IN:   min/max per word and period stability (max-min within tolerance)
+- ADC:      min/max/mean
+- DIG_IN:   stuck inputs (never changed across samples)
+- others:   number of runs
+
+Usage:
+  python analyze_test_log.py test_DZC_v4.hwtp bench_DZC.log
+  python analyze_test_log.py test_DZC_v4.hwtp bench_DZC.log --json summary.json
+"""
+
+import argparse
+import json
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from isodiag_sim import Simulator, parse_quoted, split_args
+
+
+HEADER_RE = re.compile(r'^=== (.+) Test ===$')
+MENU_ITEM_RE = re.compile(r'^\[(\d+)\] (\w+): (.+)$')
+PATTERN_RE = re.compile(r'Pattern \d+: (0x[0-9A-Fa-f]+)$')
+HEX_BYTES_RE = re.compile(r'^(?:[0-9A-Fa-f]{1,2}\s+)*[0-9A-Fa-f]{1,2}$')
+
+DEFAULT_PERIOD_TOLERANCE = 0.05
+
+
+# --------------------------- Script layout ---------------------------
+
+@dataclass
+class Probe:
+    """One value printed by an EC ... DW/DB line."""
+    prefix: str
+    symbol: str
+    fmt: str
+
+
+@dataclass
+class GroupLayout:
+    option: int
+    hw_type: str
+    name: str
+    probes: List[Probe] = field(default_factory=list)
+    spi_rx: Optional[str] = None  # RxBuf symbol dumped after each pattern
+
+
+def parse_value(text: str, fmt: str) -> Optional[int]:
+    """Parse a printed value according to its printf format."""
+    base = 16 if fmt.rstrip().lower().endswith('x') else 10
+    try:
+        return int(text.strip().split()[0], base)
+    except (ValueError, IndexError):
+        return None
+
+
+def load_layout(script_path) -> Dict[str, GroupLayout]:
+    """Map every test header name to its group layout, from the generated script."""
+    sim = Simulator()
+    sim.load(script_path)
+
+    menu = {}
+    for stmt in sim.program:
+        if stmt.op == "EC":
+            text, _ = parse_quoted(stmt.args)
+            match = MENU_ITEM_RE.match(text)
+            if match:
+                menu[int(match.group(1))] = (match.group(2).lower(), match.group(3))
+
+    layouts: Dict[str, GroupLayout] = {}
+    for option, (hw_type, name) in sorted(menu.items()):
+        layout = GroupLayout(option, hw_type, name)
+        params: Dict[str, str] = {}
+        visited = set()
+        pc = sim.labels.get(f"TEST_{option}")
+
+        # Walk the test body, following GO into subroutines, until GO MENU
+        while pc is not None and pc < len(sim.program) and pc not in visited:
+            visited.add(pc)
+            stmt = sim.program[pc]
+            pc += 1
+            parts = split_args(stmt.args)
+            if stmt.op == "WO" and len(parts) >= 2 and parts[0].startswith('#'):
+                params[parts[0]] = parts[1]
+            elif stmt.op == "GO":
+                target = stmt.args.strip()
+                pc = None if target == "MENU" else sim.labels.get(target)
+            elif stmt.op == "MD" and parts:
+                layout.spi_rx = params.get(parts[0], parts[0])
+            elif stmt.op == "EC":
+                text, rest = parse_quoted(stmt.args)
+                sub = split_args(rest)
+                if len(sub) >= 2 and sub[0].upper() in ("DB", "DW"):
+                    symbol = params.get(sub[1], sub[1])
+                    fmt = sub[2] if len(sub) > 2 else "%x"
+                    layout.probes.append(Probe(text.strip(), symbol, fmt))
+
+        layouts[name] = layout
+    return layouts
+
+
+# --------------------------- Aggregates ---------------------------
+
+class Stats:
+    """Constant-memory running statistics of one printed value."""
+
+    def __init__(self):
+        self.count = 0
+        self.min = None
+        self.max = None
+        self.total = 0
+        self.first = None
+        self.changed = False
+
+    def add(self, value: int):
+        if self.count == 0:
+            self.min = self.max = self.first = value
+        else:
+            self.min = min(self.min, value)
+            self.max = max(self.max, value)
+            if value != self.first:
+                self.changed = True
+        self.count += 1
+        self.total += value
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def to_dict(self) -> dict:
+        return {"count": self.count, "min": self.min, "max": self.max,
+                "mean": round(self.mean, 3), "changed": self.changed}
+
+
+@dataclass
+class GroupResult:
+    layout: GroupLayout
+    runs: int = 0
+    values: Dict[str, Stats] = field(default_factory=dict)
+    echo_ok: int = 0
+    echo_total: int = 0
+
+
+def analyze_log(lines, layouts: Dict[str, GroupLayout]) -> Dict[str, GroupResult]:
+    """Consume log lines (any iterable, read once) and aggregate per group."""
+    results = {name: GroupResult(layout) for name, layout in layouts.items()}
+    current: Optional[GroupResult] = None
+    expected_pattern = None
+
+    for raw in lines:
+        line = raw.strip()
+        if not line:
+            continue
+
+        header = HEADER_RE.match(line)
+        if header:
+            current = results.get(header.group(1))
+            if current:
+                current.runs += 1
+            expected_pattern = None
+            continue
+        if current is None:
+            continue
+
+        layout = current.layout
+        if layout.hw_type == "spi":
+            pattern = PATTERN_RE.search(line)
+            if pattern:
+                expected_pattern = int(pattern.group(1), 16)
+                continue
+            if expected_pattern is not None and HEX_BYTES_RE.match(line):
+                rx = bytes(int(b, 16) for b in line.split())
+                current.echo_total += 1
+                if int.from_bytes(rx, "little") == expected_pattern:
+                    current.echo_ok += 1
+                expected_pattern = None
+            continue
+
+        for probe in layout.probes:
+            if line.startswith(probe.prefix):
+                value = parse_value(line[len(probe.prefix):], probe.fmt)
+                if value is not None:
+                    current.values.setdefault(probe.symbol, Stats()).add(value)
+                break
+
+    return results
+
+
+# --------------------------- Summary ---------------------------
+
+def summarize(results: Dict[str, GroupResult], period_tolerance: float = DEFAULT_PERIOD_TOLERANCE) -> List[dict]:
+    """Per-group summary dicts (JSON-ready), in menu order."""
+    summary = []
+    for result in sorted(results.values(), key=lambda r: r.layout.option):
+        layout = result.layout
+        entry = {
+            "group": f"{layout.hw_type}:{layout.name}",
+            "runs": result.runs,
+            "values": {symbol: stats.to_dict() for symbol, stats in result.values.items()},
+        }
+        if layout.hw_type == "spi":
+            entry["echo_ok"] = result.echo_ok
+            entry["echo_total"] = result.echo_total
+            entry["status"] = "OK" if result.echo_total and result.echo_ok == result.echo_total else (
+                "MISMATCH" if result.echo_total else "NO DATA")
+        elif layout.hw_type == "pwm_in":
+            # The third word printed ("Period") is the period
+            period = None
+            for probe in layout.probes:
+                if probe.prefix.lower().startswith("period"):
+                    period = result.values.get(probe.symbol)
+            if period and period.count:
+                spread = period.max - period.min
+                stable = spread <= period_tolerance * abs(period.mean) if period.mean else spread == 0
+                entry["period_stable"] = stable
+                entry["status"] = "OK" if stable else "UNSTABLE"
+            else:
+                entry["status"] = "NO DATA"
+        elif layout.hw_type == "dig_in":
+            stuck = [s for s, stats in result.values.items() if stats.count > 1 and not stats.changed]
+            entry["stuck"] = stuck
+            entry["status"] = "STUCK" if stuck else ("OK" if result.values else "NO DATA")
+        else:
+            entry["status"] = "OK" if result.runs else "NOT RUN"
+        summary.append(entry)
+    return summary
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Summarize ISODiag logs of generated test menus.")
+    ap.add_argument("script", help="Generated test script (test_<variant>_v4.hwtp)")
+    ap.add_argument("log", help="Captured ISODiag console log")
+    ap.add_argument("--json", help="Write the summary as JSON to this file")
+    ap.add_argument("--period-tolerance", type=float, default=DEFAULT_PERIOD_TOLERANCE,
+                    help="Allowed PWM-in period spread as a fraction of the mean (default: 0.05)")
+    args = ap.parse_args()
+
+    for path in (args.script, args.log):
+        if not Path(path).exists():
+            print(f"[ERROR] Not found: {path}")
+            return 1
+
+    layouts = load_layout(args.script)
+    print(f"[INFO] Script layout: {len(layouts)} test groups")
+
+    with open(args.log, 'r', encoding='utf-8', errors='replace') as f:
+        results = analyze_log(f, layouts)
+    summary = summarize(results, args.period_tolerance)
+
+    for entry in summary:
+        details = ""
+        if "echo_total" in entry:
+            details = f" echo {entry['echo_ok']}/{entry['echo_total']}"
+        elif entry.get("stuck"):
+            details = f" stuck: {', '.join(entry['stuck'])}"
+        else:
+            ranges = [f"{s}=[{v['min']}..{v['max']}]" for s, v in entry["values"].items()]
+            details = " " + " ".join(ranges) if ranges else ""
+        print(f"  - {entry['group']}: {entry['status']} ({entry['runs']} runs){details}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2)
+        print(f"[OK] Summary written: {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1 @@
+"""Performance benchmarks and regression budgets for the VRG generators."""
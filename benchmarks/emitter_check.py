@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+benchmarks/emitter_check.py
+---------------------------
+Check of the config_emitters C header / CSV output on offsets the
+synthetic workbooks never produce: negative offsets, next to ordinary
+and multi-word rows, in a common and a variant sheet. Negative decimal
+offsets ("-5.") come from the check workbook; negative hex ones are
+added as records with radix "hex" (the processors' Hex column parser
+takes no sign, so no workbook cell yields one).
+
+Checks:
+  records   every definition of the check workbook has its offset (a
+            negative one is neither dropped nor None)
+  csv       offsets are 0x1A / -0x1A, never "0x-1A"
+  header    offsets are 0x1Au / (-0x1A); with gcc on PATH, config.h is
+            compiled for the common part and every variant with
+            _Static_assert()s on the expected values
+
+Exit code 1 on any failure.
+
+Usage:
+  python benchmarks/emitter_check.py
+  python benchmarks/emitter_check.py --keep out/     # keep workbook + outputs
+"""
+
+import argparse
+import csv
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+from typing import Dict, List
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from benchmarks.synthetic_workbook import MASTER_SYMBOL  # noqa: E402
+from GenSymb_ConfigVRG import SymbolRecord  # noqa: E402
+
+
+VARIANT = "DZC"
+
+# Check workbook rows; "Hex" and "Offset" cells as written in a workbook
+COMMON_ROWS = [
+    # Symbol, Reference, Size, Hex, Offset
+    ("chk_g_Plain_u32", MASTER_SYMBOL, 4, "1C", None),
+    ("chk_g_NegDec_u16", MASTER_SYMBOL, 2, None, "-5."),
+    ("chk_g_NegWide_s", MASTER_SYMBOL, 8, None, "-8."),     # _low -8, _high -4
+]
+# Negative hex offsets, as records of the common section
+HEX_RECORDS = [
+    SymbolRecord("chk_g_Common", None, "by", "chk_g_NegHex_u8", 1, MASTER_SYMBOL, -0x10, "hex",
+                 expression=f"{MASTER_SYMBOL} +  -0x10"),
+    SymbolRecord("chk_g_Common", None, "wo32", "chk_g_NegHexPtr_pu8", 4, MASTER_SYMBOL, -0x1F0, "hex",
+                 indirect=True, expression=f"$$$$({MASTER_SYMBOL} +  -0x1F0)"),
+]
+VARIANT_ROWS = [
+    ("chk_g_NegDec_u16", MASTER_SYMBOL, 2, None, "-7."),    # redefined in the variant
+    ("chk_g_Var_u32", "chk_g_Plain_u32", 4, None, "-12."),
+]
+# variant ("" = common) -> symbol -> expected offset
+EXPECTED: Dict[str, Dict[str, int]] = {
+    "": {"chk_g_Plain_u32": 0x1C, "chk_g_NegDec_u16": -5, "chk_g_NegHex_u8": -0x10, "chk_g_NegHexPtr_pu8": -0x1F0,
+         "chk_g_NegWide_s": -8, "chk_g_NegWide_s_low": -8, "chk_g_NegWide_s_high": -4},
+    VARIANT: {"chk_g_NegDec_u16": -7, "chk_g_Var_u32": -12},
+}
+
+CSV_OFFSET_RE = re.compile(r"^-?0x[0-9A-F]+$")
+HEADER_OFFSET_RE = re.compile(r"_OFFSET (0x[0-9A-F]+u|\(-0x[0-9A-F]+\)) ")
+
+
+def write_check_workbook(path: str) -> str:
+    from openpyxl import Workbook
+
+    book = Workbook(write_only=True)
+    master = book.create_sheet("Master Symbol Table")
+    master.append(["Symbol", "Address"])
+    master.append([MASTER_SYMBOL, "0x80001000"])
+    for name, rows in (("chk_g_Common", COMMON_ROWS), (f"chk_g_Variant_{VARIANT}", VARIANT_ROWS)):
+        sheet = book.create_sheet(name)
+        sheet.append(["Symbol", "Reference", "Size", "Hex", "Offset"])
+        for row in rows:
+            sheet.append(list(row))
+    book.save(path)
+    return path
+
+
+def check_outputs(parsed, header: str, table: str) -> List[str]:
+    failures = []
+
+    records = {(r.variant or "", r.symbol): r for r in parsed.records if r.op != "var"}
+    for variant, symbols in EXPECTED.items():
+        for symbol, offset in symbols.items():
+            record = records.get((variant, symbol))
+            if record is None:
+                failures.append(f"records: {symbol} ({variant or 'common'}) missing")
+            elif record.offset != offset:
+                failures.append(f"records: {symbol} offset {record.offset}, expected {offset}")
+
+    for row in csv.DictReader(table.splitlines()):
+        if row["base"] and not CSV_OFFSET_RE.match(row["offset"]):
+            failures.append(f"csv: {row['symbol']} offset {row['offset']!r}")
+
+    for line in header.splitlines():
+        if "_OFFSET " in line and not HEADER_OFFSET_RE.search(line):
+            failures.append(f"header: {line}")
+    return failures
+
+
+def compile_header(header_path: str) -> List[str]:
+    """gcc -fsyntax-only with value asserts, common part and the variant."""
+    gcc = shutil.which("gcc")
+    if gcc is None:
+        print("[WARN] gcc not found: header not compiled")
+        return []
+    failures = []
+    for variant in ("", VARIANT):
+        expected = dict(EXPECTED[""])
+        if variant:
+            expected.update(EXPECTED[variant])
+        source = [f'#include "{os.path.basename(header_path)}"']
+        source += [f'_Static_assert({symbol}_OFFSET == {offset}, "{symbol}");'
+                   for symbol, offset in expected.items()]
+        check_path = os.path.join(os.path.dirname(header_path), "check_offsets.c")
+        with open(check_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(source) + "\n")
+        cmd = [gcc, "-fsyntax-only", "-Werror", "-Wall"] + ([f"-DVRG_VARIANT_{variant}"] if variant else [])
+        result = subprocess.run(cmd + [check_path], capture_output=True, text=True,
+                                cwd=os.path.dirname(header_path))
+        if result.returncode != 0:
+            failures.append(f"gcc ({variant or 'common'}): {result.stderr.strip()}")
+    return failures
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Check negative offsets in the C header / CSV emitters.")
+    ap.add_argument("--keep", metavar="DIR", help="Write the workbook and outputs to DIR and keep them")
+    args = ap.parse_args()
+
+    import config_emitters
+
+    work_dir = args.keep or tempfile.mkdtemp(prefix="vrg_emitters_")
+    os.makedirs(work_dir, exist_ok=True)
+    try:
+        workbook = write_check_workbook(os.path.join(work_dir, "emitter_check.xlsx"))
+        parsed = config_emitters.parse_workbook(workbook)
+        common_end = max(n for n, r in enumerate(parsed.records) if r.section == "chk_g_Common") + 1
+        parsed.records[common_end:common_end] = HEX_RECORDS
+        written = config_emitters.write_formats(parsed, work_dir, ["h", "csv"])
+        with open(written["h"], encoding="utf-8") as f:
+            header = f.read()
+        with open(written["csv"], encoding="utf-8") as f:
+            table = f.read()
+        failures = check_outputs(parsed, header, table) + compile_header(written["h"])
+    finally:
+        if not args.keep:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    for failure in failures:
+        print(f"[ERROR] {failure}")
+    if failures:
+        return 1
+    print(f"[OK] Negative offsets: {sum(len(s) for s in EXPECTED.values())} symbols checked (records, csv, header)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+benchmarks/equivalence.py
+-------------------------
+Differential (golden) check: every generation pipeline must write
+byte-identical outputs to the reference pipeline.
+
+Reference: GenSymb_ConfigVRG.generate_multi_configs() with the pandas
+reader, then generate_test_menu_v4 on every config_<variant>.hwtp - the
+two-step path the scripts have always used.
+
+Pipelines compared against it:
+  stream            generate_multi_configs() with the stream reader (xlsx_stream.py)
+  variant_tests     test menus from one parse of the master config (--variants)
+  vrg_gen           vrg_gen.generate_all(), in-process
+  vrg_gen_parallel  vrg_gen.generate_all() with 2 worker processes
+  vrg_gen_stream    vrg_gen.generate_all() with the stream reader
+A new engine is added to PIPELINES and checked the same way.
+
+Inputs: workbooks given on the command line, the default synthetic
+workbook and --random N randomized synthetic workbooks (sheet count,
+rows, variant suffixes and seed drawn from --seed). Every output file
+(master config, variant configs, test menus) is compared line by line;
+the first divergence per file is reported with both lines.
+
+--save-golden DIR stores the reference outputs; --golden DIR also checks
+the reference itself against them (catches changes to today's output).
+
+Exit code 1 on any divergence.
+
+Usage:
+  python benchmarks/equivalence.py
+  python benchmarks/equivalence.py input.xlsx customer.xlsx --random 20 --seed 7
+  python benchmarks/equivalence.py --pipelines stream,vrg_gen --random 5
+  python benchmarks/equivalence.py --save-golden golden/        # before the change
+  python benchmarks/equivalence.py --golden golden/             # after the change
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from benchmarks.synthetic_workbook import WorkbookSpec, write_workbook  # noqa: E402
+
+
+# Suffix pool of the randomized workbooks (2-4 uppercase letters, as in real sheets)
+SUFFIX_POOL = ("DZC", "MAN", "TRT", "AB", "XYZW", "VW")
+
+OUTPUT_PATTERNS = ("config*.hwtp", "test_*_v4.hwtp")
+
+# Reader of the reference outputs: today's default (pandas)
+REFERENCE_ENGINE = "pandas" if importlib.util.find_spec("pandas") else "stream"
+
+
+@dataclass
+class Divergence:
+    workbook: str
+    pipeline: str
+    file: str
+    line: int = 0              # 1-based, 0 = whole file (missing / extra)
+    expected: Optional[str] = None
+    actual: Optional[str] = None
+    error: Optional[str] = None   # the pipeline raised
+
+    def describe(self) -> str:
+        where = f"{self.workbook} [{self.pipeline}] {self.file}"
+        if self.error:
+            return f"{self.workbook} [{self.pipeline}]: failed: {self.error}"
+        if self.expected is None:
+            return f"{where}: unexpected file"
+        if self.actual is None:
+            return f"{where}: missing"
+        return f"{where}:{self.line}: expected {self.expected!r}, got {self.actual!r}"
+
+
+# ----- Pipelines -----
+
+def _silent():
+    # An emitter without listeners: the generators print nothing
+    from vrg_events import EventEmitter
+    return EventEmitter()
+
+
+def _tests_per_config(out_dir: str):
+    """test_<variant>_v4.hwtp from every config_<variant>.hwtp, one parse each."""
+    import generate_test_menu_v4 as gentest
+    for config in sorted(Path(out_dir).glob("config_*.hwtp")):
+        variant = config.stem[len("config_"):]
+        gentest.write_test_menu(gentest.parse_config(config), Path(out_dir) / f"test_{variant}_v4.hwtp")
+
+
+def two_step(engine: str) -> Callable[[str, str], None]:
+    def run(xlsx_path: str, out_dir: str):
+        import GenSymb_ConfigVRG as genconf
+        genconf.generate_multi_configs(xlsx_path, out_dir, engine=engine, events=_silent())
+        _tests_per_config(out_dir)
+    return run
+
+
+def variant_tests(xlsx_path: str, out_dir: str):
+    import GenSymb_ConfigVRG as genconf
+    import generate_test_menu_v4 as gentest
+    genconf.generate_multi_configs(xlsx_path, out_dir, engine=REFERENCE_ENGINE, events=_silent())
+    gentest.generate_variant_tests(Path(out_dir) / "config.hwtp", Path(out_dir))
+
+
+def vrg_gen_all(engine: str, jobs: int) -> Callable[[str, str], None]:
+    def run(xlsx_path: str, out_dir: str):
+        import vrg_gen
+        vrg_gen.generate_all(xlsx_path, out_dir, jobs=jobs, engine=engine)
+    return run
+
+
+PIPELINES: Dict[str, Callable[[str, str], None]] = {
+    "stream": two_step("stream"),
+    "variant_tests": variant_tests,
+    "vrg_gen": vrg_gen_all(REFERENCE_ENGINE, 1),
+    "vrg_gen_parallel": vrg_gen_all(REFERENCE_ENGINE, 2),
+    "vrg_gen_stream": vrg_gen_all("stream", 1),
+}
+
+
+# ----- Comparison -----
+
+def output_files(out_dir: str) -> Dict[str, Path]:
+    files = {}
+    for pattern in OUTPUT_PATTERNS:
+        for path in Path(out_dir).glob(pattern):
+            files[path.name] = path
+    return files
+
+
+def first_divergence(expected: bytes, actual: bytes) -> Optional[Tuple[int, Optional[str], Optional[str]]]:
+    """(line number, expected line, actual line) of the first differing line, None if identical."""
+    if expected == actual:
+        return None
+    expected_lines = expected.decode("utf-8", "replace").splitlines(keepends=True)
+    actual_lines = actual.decode("utf-8", "replace").splitlines(keepends=True)
+    for n, (a, b) in enumerate(zip(expected_lines, actual_lines), 1):
+        if a != b:
+            return n, a, b
+    # One file is a prefix of the other
+    n = min(len(expected_lines), len(actual_lines)) + 1
+    return (n,
+            expected_lines[n - 1] if n <= len(expected_lines) else "<end of file>",
+            actual_lines[n - 1] if n <= len(actual_lines) else "<end of file>")
+
+
+def compare_dirs(workbook: str, pipeline: str, expected_dir: str, actual_dir: str) -> Tuple[int, List[Divergence]]:
+    """(files compared, divergences) of two output folders."""
+    expected, actual = output_files(expected_dir), output_files(actual_dir)
+    divergences = []
+    for name in sorted(set(expected) | set(actual)):
+        if name not in actual:
+            divergences.append(Divergence(workbook, pipeline, name, expected="", actual=None))
+        elif name not in expected:
+            divergences.append(Divergence(workbook, pipeline, name, expected=None, actual=""))
+        else:
+            diff = first_divergence(expected[name].read_bytes(), actual[name].read_bytes())
+            if diff:
+                divergences.append(Divergence(workbook, pipeline, name, *diff))
+    return len(expected), divergences
+
+
+# ----- Inputs -----
+
+def random_specs(count: int, seed: int) -> List[WorkbookSpec]:
+    rng = random.Random(seed)
+    specs = []
+    for _ in range(count):
+        suffixes = tuple(rng.sample(SUFFIX_POOL, rng.randint(0, 4)))
+        specs.append(WorkbookSpec(sheets=rng.randint(1, 8), rows=rng.randint(5, 300),
+                                  suffixes=suffixes, seed=rng.randrange(1 << 30)))
+    return specs
+
+
+def collect_workbooks(paths: List[str], count: int, seed: int, work_dir: str, default: bool) -> List[str]:
+    workbooks = list(paths)
+    specs = ([WorkbookSpec()] if default else []) + random_specs(count, seed)
+    for spec in specs:
+        path = os.path.join(work_dir, "workbooks", spec.file_name())
+        if not os.path.exists(path):
+            write_workbook(path, spec)
+        workbooks.append(path)
+    return workbooks
+
+
+def golden_name(workbook: str) -> str:
+    return os.path.splitext(os.path.basename(workbook))[0]
+
+
+def check_workbook(workbook: str, pipelines: List[str], work_dir: str,
+                   golden: Optional[str], save_golden: Optional[str]) -> Tuple[int, List[Divergence]]:
+    """Run the reference and every pipeline on one workbook; (files compared, divergences)."""
+    name = golden_name(workbook)
+    base = os.path.join(work_dir, "out", name)
+    shutil.rmtree(base, ignore_errors=True)
+
+    reference_dir = os.path.join(base, "reference")
+    two_step(REFERENCE_ENGINE)(workbook, reference_dir)
+
+    compared, divergences = 0, []
+    if golden and os.path.isdir(os.path.join(golden, name)):
+        n, found = compare_dirs(name, "golden", os.path.join(golden, name), reference_dir)
+        compared, divergences = compared + n, divergences + found
+    if save_golden:
+        target = os.path.join(save_golden, name)
+        shutil.rmtree(target, ignore_errors=True)
+        shutil.copytree(reference_dir, target)
+
+    for pipeline in pipelines:
+        out_dir = os.path.join(base, pipeline)
+        try:
+            PIPELINES[pipeline](workbook, out_dir)
+        except Exception as e:
+            divergences.append(Divergence(name, pipeline, "", error=f"{type(e).__name__}: {e}"))
+            continue
+        n, found = compare_dirs(name, pipeline, reference_dir, out_dir)
+        compared, divergences = compared + n, divergences + found
+    return compared, divergences
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Byte-for-byte equivalence of the generation pipelines.")
+    ap.add_argument("workbooks", nargs="*", help="Workbooks to check (in addition to the synthetic ones)")
+    ap.add_argument("--random", type=int, default=10, help="Randomized synthetic workbooks (default: 10)")
+    ap.add_argument("--seed", type=int, default=0, help="Seed of the randomized workbooks (default: 0)")
+    ap.add_argument("--no-default", action="store_true", help="Skip the default synthetic workbook")
+    ap.add_argument("--pipelines", default=",".join(PIPELINES),
+                    help=f"Comma-separated pipelines (default: all: {', '.join(PIPELINES)})")
+    ap.add_argument("--work-dir", help="Folder for workbooks and outputs (default: temp dir)")
+    ap.add_argument("--golden", help="Also compare the reference outputs with those stored in this folder")
+    ap.add_argument("--save-golden", help="Store the reference outputs in this folder")
+    ap.add_argument("--json", help="Write the divergences as JSON to this file")
+    args = ap.parse_args()
+
+    pipelines = [p.strip() for p in args.pipelines.split(",") if p.strip()]
+    unknown = [p for p in pipelines if p not in PIPELINES]
+    if unknown:
+        print(f"[ERROR] Unknown pipeline(s): {', '.join(unknown)} (available: {', '.join(PIPELINES)})")
+        return 1
+    missing = [w for w in args.workbooks if not os.path.exists(w)]
+    if missing:
+        print(f"[ERROR] Not found: {', '.join(missing)}")
+        return 1
+    if REFERENCE_ENGINE != "pandas":
+        print("[WARN] pandas is not installed: the stream reader is the reference")
+
+    work_dir = args.work_dir or os.path.join(tempfile.gettempdir(), "vrg_equivalence")
+    workbooks = collect_workbooks(args.workbooks, args.random, args.seed, work_dir, not args.no_default)
+    print(f"[INFO] {len(workbooks)} workbook(s) x {len(pipelines)} pipeline(s) vs reference ({REFERENCE_ENGINE})")
+
+    total_files, all_divergences = 0, []
+    for workbook in workbooks:
+        compared, divergences = check_workbook(workbook, pipelines, work_dir, args.golden, args.save_golden)
+        total_files += compared
+        all_divergences += divergences
+        if divergences:
+            print(f"[ERROR] {os.path.basename(workbook)}: {len(divergences)} divergence(s)")
+            for divergence in divergences:
+                print(f"  - {divergence.describe()}")
+        else:
+            print(f"[OK] {os.path.basename(workbook)}: identical ({compared} files)")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump([d.__dict__ for d in all_divergences], f, indent=2)
+        print(f"[OK] Results written: {args.json}")
+    if args.save_golden:
+        print(f"[OK] Golden outputs saved: {args.save_golden}")
+
+    if all_divergences:
+        print(f"[ERROR] {len(all_divergences)} divergence(s) in {total_files} compared files")
+        return 1
+    print(f"[OK] All pipelines identical ({total_files} compared files)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+benchmarks/generation.py
+------------------------
+Generation benchmark over synthetic workbooks of several sizes, with
+stored baselines and a regression check.
+
+Stages timed (median of --runs) and memory-profiled (peak Python heap,
+tracemalloc, in one extra run) for every size:
+  generate_from_excel     workbook decode -> master config text
+  generate_multi_configs  master config -> master + variant config files
+                          (from the decoded text: the decode is not counted twice)
+  parse_config            every variant config -> hardware test groups
+  generate_test_menu      every variant's groups -> test menu lines
+
+Sizes are "<sheets>x<rows>" (generic sheets x rows per sheet, see
+synthetic_workbook.py); workbooks are written once to --work-dir and
+reused.
+
+--save-baseline stores the results; later runs compare against it and
+exit 1 when a stage is slower (best of --runs) or uses more memory than
+the baseline by more than --threshold. Stages under NOISE_FLOOR_S /
+NOISE_FLOOR_MB are not compared.
+
+Usage:
+  python benchmarks/generation.py --save-baseline
+  python benchmarks/generation.py
+  python benchmarks/generation.py --sizes 10x200,40x2000 --runs 5 --threshold 0.15
+  python benchmarks/generation.py --engine stream --baseline stream_baseline.json --json run.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from benchmarks.synthetic_workbook import WorkbookSpec, write_workbook  # noqa: E402
+
+
+DEFAULT_SIZES = "5x100,20x500,40x1000"
+DEFAULT_BASELINE = os.path.join(REPO_ROOT, "benchmarks", "generation_baseline.json")
+DEFAULT_THRESHOLD = 0.20
+
+# Timings / heap peaks below these are dominated by noise
+NOISE_FLOOR_S = 0.005
+NOISE_FLOOR_MB = 1.0
+
+STAGES = ("generate_from_excel", "generate_multi_configs", "parse_config", "generate_test_menu")
+
+
+def parse_sizes(text: str) -> List[Tuple[int, int]]:
+    sizes = []
+    for item in text.split(","):
+        sheets, _, rows = item.strip().lower().partition("x")
+        sizes.append((int(sheets), int(rows)))
+    return sizes
+
+
+def measure(fn: Callable, runs: int) -> Tuple[object, dict]:
+    """Median wall time of `runs` calls, then one traced call for the peak heap."""
+    times = []
+    result = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return result, {
+        "seconds": round(statistics.median(times), 4),
+        "min_seconds": round(min(times), 4),
+        "peak_mb": round(peak / (1024 * 1024), 2),
+    }
+
+
+def bench_workbook(xlsx_path: str, work_dir: str, runs: int, engine: str) -> Dict[str, dict]:
+    """Time every stage for one workbook."""
+    import GenSymb_ConfigVRG as genconf
+    import generate_test_menu_v4 as gentest
+
+    results: Dict[str, dict] = {}
+    out_dir = os.path.join(work_dir, "out")
+
+    (combined_text, _), results["generate_from_excel"] = measure(
+        lambda: genconf.generate_from_excel(xlsx_path, engine=engine), runs)
+
+    def multi_configs():
+        # The generator reports every file it writes
+        with contextlib.redirect_stdout(io.StringIO()):
+            genconf.generate_multi_configs(xlsx_path, out_dir, combined_text=combined_text)
+    _, results["generate_multi_configs"] = measure(multi_configs, runs)
+
+    variant_configs = sorted(Path(out_dir).glob("config_*.hwtp"))
+    all_groups, results["parse_config"] = measure(
+        lambda: [gentest.parse_config(path) for path in variant_configs], runs)
+
+    _, results["generate_test_menu"] = measure(
+        lambda: [gentest.generate_test_menu(groups) for groups in all_groups], runs)
+
+    results["generate_from_excel"]["config_lines"] = combined_text.count("\n")
+    results["parse_config"]["variants"] = len(variant_configs)
+    return results
+
+
+def run(sizes: List[Tuple[int, int]], work_dir: str, runs: int, engine: str, seed: int = 0) -> Dict[str, Dict[str, dict]]:
+    results = {}
+    for sheets, rows in sizes:
+        spec = WorkbookSpec(sheets=sheets, rows=rows, seed=seed)
+        xlsx_path = os.path.join(work_dir, spec.file_name())
+        if not os.path.exists(xlsx_path):
+            print(f"[INFO] Writing synthetic workbook {spec.label} ...")
+            write_workbook(xlsx_path, spec)
+        print(f"[INFO] Benchmarking {spec.label} ({sheets * rows} generic rows, {runs} run(s))...")
+        results[spec.label] = bench_workbook(xlsx_path, work_dir, runs, engine)
+    return results
+
+
+def compare(results: Dict[str, Dict[str, dict]], baseline: Dict[str, Dict[str, dict]],
+            threshold: float) -> List[str]:
+    """
+    Regression messages: stages slower / heavier than baseline * (1 + threshold).
+    Time is compared on the best run, which is far less noisy than the median.
+    """
+    regressions = []
+    for label, stages in results.items():
+        for stage, current in stages.items():
+            previous = baseline.get(label, {}).get(stage)
+            if not previous:
+                continue
+            limit = 1.0 + threshold
+            if previous["min_seconds"] >= NOISE_FLOOR_S and current["min_seconds"] > previous["min_seconds"] * limit:
+                regressions.append(f"{label} {stage}: {current['min_seconds']:.4f} s vs baseline "
+                                   f"{previous['min_seconds']:.4f} s "
+                                   f"(+{current['min_seconds'] / previous['min_seconds'] - 1:.0%})")
+            if previous["peak_mb"] >= NOISE_FLOOR_MB and current["peak_mb"] > previous["peak_mb"] * limit:
+                regressions.append(f"{label} {stage}: peak {current['peak_mb']} MB vs baseline "
+                                   f"{previous['peak_mb']} MB (+{current['peak_mb'] / previous['peak_mb'] - 1:.0%})")
+    return regressions
+
+
+def print_results(results: Dict[str, Dict[str, dict]], baseline: Dict[str, Dict[str, dict]]):
+    print(f"\n{'size':<10} {'stage':<24} {'median s':>9} {'best s':>8} {'peak MB':>8} {'vs base':>8}")
+    for label, stages in results.items():
+        for stage in STAGES:
+            r = stages[stage]
+            previous = baseline.get(label, {}).get(stage)
+            delta = f"{r['min_seconds'] / previous['min_seconds'] - 1:+.0%}" \
+                if previous and previous["min_seconds"] else "-"
+            print(f"{label:<10} {stage:<24} {r['seconds']:>9.4f} {r['min_seconds']:>8.4f} "
+                  f"{r['peak_mb']:>8.2f} {delta:>8}")
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Generation benchmark over synthetic workbooks.")
+    ap.add_argument("--sizes", default=DEFAULT_SIZES,
+                    help=f"Comma-separated <sheets>x<rows> sizes (default: {DEFAULT_SIZES})")
+    ap.add_argument("--runs", type=int, default=3, help="Timed runs per stage (default: 3)")
+    ap.add_argument("--engine", choices=("auto", "pandas", "stream"), default="auto",
+                    help="Workbook reader (default: auto)")
+    ap.add_argument("--seed", type=int, default=0, help="Synthetic workbook seed (default: 0)")
+    ap.add_argument("--work-dir", help="Folder for the synthetic workbooks and outputs (default: temp dir)")
+    ap.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline file (default: benchmarks/generation_baseline.json)")
+    ap.add_argument("--save-baseline", action="store_true", help="Store these results as the new baseline")
+    ap.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                    help=f"Allowed slowdown / memory growth before failing (default: {DEFAULT_THRESHOLD})")
+    ap.add_argument("--json", help="Write the results as JSON to this file")
+    args = ap.parse_args()
+
+    try:
+        sizes = parse_sizes(args.sizes)
+    except ValueError:
+        print(f"[ERROR] Invalid --sizes: {args.sizes} (expected e.g. 10x200,40x1000)")
+        return 1
+
+    work_dir = args.work_dir or os.path.join(tempfile.gettempdir(), "vrg_generation_bench")
+    os.makedirs(work_dir, exist_ok=True)
+    results = run(sizes, work_dir, max(1, args.runs), args.engine, args.seed)
+
+    baseline = {}
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            stored = json.load(f)
+        baseline = stored.get("results", {})
+        if stored.get("engine") != args.engine:
+            print(f"[WARN] Baseline was measured with engine '{stored.get('engine')}', this run uses '{args.engine}'")
+    print_results(results, baseline)
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "engine": args.engine,
+        "runs": args.runs,
+        "measured": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "results": results,
+    }
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"[OK] Results written: {args.json}")
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"[OK] Baseline saved: {args.baseline}")
+        return 0
+
+    if not baseline:
+        print(f"[INFO] No baseline at {args.baseline}; run with --save-baseline to create one")
+        return 0
+
+    regressions = compare(results, baseline, args.threshold)
+    for message in regressions:
+        print(f"[ERROR] Regression {message}")
+    if regressions:
+        print(f"[ERROR] {len(regressions)} regression(s) over {args.threshold:.0%}")
+        return 1
+    print(f"[OK] No regression over {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
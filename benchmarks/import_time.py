@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+benchmarks/import_time.py
+-------------------------
+Cold-start regression benchmark based on `python -X importtime`.
+
+Every module is imported in a fresh interpreter; the cumulative import
+time of all top-level imports is summed and the median over --runs is
+compared with a per-module budget. Heavy dependencies (pandas, numpy,
+openpyxl) must not be pulled in at import time at all: they are only
+loaded when a workbook is actually decoded.
+
+Exit code 1 if any budget is exceeded or a heavy module is imported.
+
+Usage:
+  python benchmarks/import_time.py
+  python benchmarks/import_time.py --runs 9 --scale 2.0
+  python benchmarks/import_time.py --json import_time.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Cold import budgets in milliseconds (cumulative, top-level imports)
+BUDGETS_MS: Dict[str, float] = {
+    "GenSymb_ConfigVRG": 150.0,
+    "generate_test_menu_v4": 150.0,
+    "hwtp_reader": 100.0,
+    "vrg_gen": 250.0,
+}
+
+HEAVY_MODULES = ("pandas", "numpy", "openpyxl")
+
+
+def measure_import(module: str) -> Tuple[float, List[str]]:
+    """Import `module` in a fresh interpreter; return (total ms, heavy modules seen)."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr.strip()}")
+
+    total_us = 0
+    heavy = set()
+    # Lines look like: "import time:   self [us] | cumulative | <indent>name"
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[1].strip().isdigit():
+            continue
+        name = fields[2].rstrip()
+        stripped = name.lstrip()
+        if stripped.split(".")[0] in HEAVY_MODULES:
+            heavy.add(stripped.split(".")[0])
+        # Top-level entries (no extra indentation) already include their children
+        if len(name) - len(stripped) == 1:
+            total_us += int(fields[1])
+    return total_us / 1000.0, sorted(heavy)
+
+
+def run(modules: Dict[str, float], runs: int = 5, scale: float = 1.0) -> List[dict]:
+    results = []
+    for module, budget in modules.items():
+        samples = []
+        heavy: List[str] = []
+        for _ in range(runs):
+            ms, heavy = measure_import(module)
+            samples.append(ms)
+        median = statistics.median(samples)
+        limit = budget * scale
+        results.append({
+            "module": module,
+            "median_ms": round(median, 1),
+            "min_ms": round(min(samples), 1),
+            "budget_ms": round(limit, 1),
+            "heavy_imports": heavy,
+            "ok": median <= limit and not heavy,
+        })
+    return results
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Cold import-time budget check.")
+    ap.add_argument("--runs", type=int, default=5, help="Fresh interpreters per module (default: 5)")
+    ap.add_argument("--scale", type=float, default=1.0,
+                    help="Multiply every budget (e.g. 2.0 on slow CI machines)")
+    ap.add_argument("--module", action="append", help="Only check this module (repeatable)")
+    ap.add_argument("--json", help="Write the results as JSON to this file")
+    args = ap.parse_args()
+
+    modules = BUDGETS_MS
+    if args.module:
+        unknown = [m for m in args.module if m not in BUDGETS_MS]
+        if unknown:
+            print(f"[ERROR] No budget defined for: {', '.join(unknown)}")
+            return 1
+        modules = {m: BUDGETS_MS[m] for m in args.module}
+
+    try:
+        results = run(modules, runs=max(1, args.runs), scale=args.scale)
+    except RuntimeError as e:
+        print(f"[ERROR] {e}")
+        return 1
+
+    for r in results:
+        tag = "[OK]" if r["ok"] else "[ERROR]"
+        extra = f" imports {', '.join(r['heavy_imports'])}" if r["heavy_imports"] else ""
+        print(f"{tag} {r['module']}: {r['median_ms']} ms (budget {r['budget_ms']} ms){extra}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"[OK] Results written: {args.json}")
+
+    failed = [r for r in results if not r["ok"]]
+    if failed:
+        print(f"[ERROR] {len(failed)} module(s) over budget")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+benchmarks/synthetic_workbook.py
+--------------------------------
+Synthetic workbooks with the same shape as the real VRG symbol workbooks,
+at any size, for benchmarks and equivalence checks.
+
+Every workbook has:
+- "Master Symbol Table"    main_c_SymMaster_u32 at an absolute address
+- "Symbol Tables"          symbol tables referencing the master (decimal offsets)
+- "Standard Symbol Table"  base structures of the standard symtab (hex offsets,
+                           some names with spaces, some pointer bases _pu8/_ps)
+- N generic sheets x M rows, named <base>_<SUFFIX> over several variant
+  suffixes, with every row kind the processors handle:
+    by/wo16/wo32 sizes, 8/16-byte multi-word splits (_low/_high, _wN),
+    pointer symbols and pointer bases ($$$$()), CAN_xx_Tx / CAN_MSG rows
+    (var lines), hex and decimal offsets, references to rows defined
+    earlier in the sheet (chains)
+  plus a small share of rows the processors skip: undefined base,
+  self reference (circular), unparsable offset and empty rows.
+
+The content only depends on (sheets, rows, suffixes, seed), so a
+workbook can be rebuilt anywhere for the same numbers. Written with
+openpyxl in write-only mode (no pandas needed).
+
+Usage:
+  python benchmarks/synthetic_workbook.py out.xlsx --sheets 20 --rows 1000
+  python benchmarks/synthetic_workbook.py out.xlsx --sheets 4 --rows 50 --suffixes DZC,MAN --seed 7
+
+  from benchmarks.synthetic_workbook import WorkbookSpec, write_workbook
+  write_workbook("big.xlsx", WorkbookSpec(sheets=40, rows=2500))
+"""
+
+import argparse
+import os
+import random
+import sys
+from dataclasses import dataclass
+from typing import List, Tuple
+
+
+MASTER_SYMBOL = "main_c_SymMaster_u32"
+STD_SYMTAB = "main_c_SymtabStd_u32"
+
+# Standard symbol table: (name as written in the sheet, hex offset)
+STANDARD_BASES = [
+    ("spi_g_Data_s", 0x0),
+    ("pwm_g_Out_s", 0x4),
+    ("dio_g_DigIn_u8", 0x8),
+    ("adc_g_In_s", 0xC),
+    ("can_g_Msg_s", 0x10),
+    ("lin_g_Frame_s", 0x14),
+    ("nfc_g_Buf_pu8", 0x18),        # pointer base: $$$$() indirection
+    ("psu_g_Control_b16", 0x1C),
+    ("wdg g Ctrl s", 0x20),         # spaces -> underscores
+    ("flash_g_Desc_ps", 0x24),      # pointer base
+]
+
+# Share of skipped rows (each kind) in the generic sheets
+SKIP_RATE = 0.01
+
+# (kind, weight) of generated generic rows
+ROW_KINDS = [
+    ("spi", 14), ("pwm_out", 8), ("pwm_in", 6), ("adc", 10), ("dig_in", 12), ("dig_out", 10),
+    ("can", 10), ("can_msg", 6), ("pointer", 6), ("chain", 8), ("plain", 10),
+]
+
+
+@dataclass(frozen=True)
+class WorkbookSpec:
+    sheets: int = 10               # generic sheets
+    rows: int = 200                # rows per generic sheet
+    suffixes: Tuple[str, ...] = ("DZC", "MAN", "TRT")
+    seed: int = 0
+
+    @property
+    def label(self) -> str:
+        return f"{self.sheets}x{self.rows}"
+
+    def file_name(self) -> str:
+        return f"synthetic_{self.sheets}x{self.rows}_{'-'.join(self.suffixes)}_s{self.seed}.xlsx"
+
+
+def sheet_names(spec: WorkbookSpec) -> List[str]:
+    """Generic sheet names: one base per sheet, suffixes cycled."""
+    names = []
+    for k in range(spec.sheets):
+        suffix = spec.suffixes[k % len(spec.suffixes)] if spec.suffixes else None
+        base = f"hw_g_Data{k // max(1, len(spec.suffixes))}_s"
+        names.append(f"{base}_{suffix}" if suffix else base)
+    return names
+
+
+def standard_base_names() -> List[str]:
+    return [name.replace(" ", "_") for name, _ in STANDARD_BASES]
+
+
+def generic_rows(rng: random.Random, sheet_no: int, rows: int) -> List[tuple]:
+    """(Symbol, Reference, Size, Hex, Offset) rows of one generic sheet."""
+    kinds = [kind for kind, _ in ROW_KINDS]
+    weights = [weight for _, weight in ROW_KINDS]
+    bases = standard_base_names()
+    defined: List[str] = []
+    out: List[tuple] = []
+    offset = 0
+
+    for i in range(rows):
+        n = sheet_no * 100000 + i
+        roll = rng.random()
+        # Rows the processors skip, by reason
+        if roll < SKIP_RATE:
+            out.append((f"ORPHAN_{n}_u32", f"undefined_g_Base{n}_s", 4, hex(offset), None))
+            continue
+        if roll < 2 * SKIP_RATE:
+            out.append((f"self_g_Loop{n}_s", f"self_g_Loop{n}_s", 4, hex(offset), None))
+            continue
+        if roll < 3 * SKIP_RATE:
+            out.append((f"BAD_OFF_{n}_u16", bases[0], 2, "zz?", "n/a"))
+            continue
+        if roll < 4 * SKIP_RATE:
+            out.append((None, None, None, None, None))
+            continue
+
+        kind = rng.choices(kinds, weights)[0]
+        base = rng.choice(bases)
+        size = rng.choice((1, 2, 4))
+        if kind == "spi":
+            part = rng.choice(("TxBuf_pu8", "RxBuf_pu8", "Ctrl_b16", "TxLim_u8"))
+            symbol, base = f"SPI_{n % 100:02d}_{part}", "spi_g_Data_s"
+            size = {"TxBuf_pu8": 4, "RxBuf_pu8": 4, "Ctrl_b16": 2, "TxLim_u8": 1}[part]
+        elif kind == "pwm_out":
+            symbol, base, size = f"PWM_OUT_{n}_UC", "pwm_g_Out_s", 8          # _low/_high
+        elif kind == "pwm_in":
+            symbol, base, size = f"PWM_IN_{n}_UC", "pwm_g_Out_s", 16          # _w0.._w3
+        elif kind == "adc":
+            symbol, base, size = f"ANA_IN_{n}_UC", "adc_g_In_s", 2
+        elif kind == "dig_in":
+            symbol, base, size = f"DIG_IN_{n}", "dio_g_DigIn_u8", 1
+        elif kind == "dig_out":
+            symbol, base, size = f"DIG_OUT_{n}", "dio_g_DigIn_u8", 1
+        elif kind == "can":
+            symbol, base, size = f"CAN_{n % 100:02d}_Tx{i % 100:02d}", "can_g_Msg_s", 4
+        elif kind == "can_msg":
+            symbol, base = f"CAN_MSG_{n}", "can_g_Msg_s"
+            size = rng.choice((4, 8))                                         # var line
+        elif kind == "pointer":
+            symbol = f"buf_g_Ptr{n}_pu8"
+        elif kind == "chain" and defined:
+            symbol, base = f"sub_g_Field{n}_u32", rng.choice(defined[-50:])
+        else:
+            symbol = f"misc_g_Val{n}_u{8 * size}"
+
+        # Hex offsets mostly, some decimal
+        if rng.random() < 0.8:
+            hex_cell, dec_cell = hex(offset), None
+        else:
+            hex_cell, dec_cell = None, f"{offset}."
+        out.append((symbol, base, size, hex_cell, dec_cell))
+        offset += size
+        defined.append(symbol)
+    return out
+
+
+def write_workbook(path: str, spec: WorkbookSpec) -> str:
+    """Write the synthetic workbook for `spec` to `path`."""
+    from openpyxl import Workbook
+
+    rng = random.Random(spec.seed)
+    book = Workbook(write_only=True)
+
+    master = book.create_sheet("Master Symbol Table")
+    master.append(["Symbol", "Address"])
+    master.append([MASTER_SYMBOL, "0x80001000"])
+    master.append(["main_c_Version_u32", "0x80000F00"])
+
+    symtab = book.create_sheet("Symbol Tables")
+    symtab.append(["Symbol", "Reference", "Offset"])
+    symtab.append([STD_SYMTAB, MASTER_SYMBOL, "0."])
+    for k in range(1, 4):
+        symtab.append([f"main_c_Symtab{k}_u32", MASTER_SYMBOL, f"{4 * k}."])
+
+    standard = book.create_sheet("Standard Symbol Table")
+    standard.append(["Symbol", "Hex", "Offset"])
+    for name, offset in STANDARD_BASES:
+        standard.append([name, f"{offset:X}", None])
+
+    for sheet_no, name in enumerate(sheet_names(spec)):
+        sheet = book.create_sheet(name)
+        sheet.append(["Symbol", "Reference", "Size", "Hex", "Offset"])
+        for row in generic_rows(rng, sheet_no, spec.rows):
+            sheet.append(list(row))
+
+    folder = os.path.dirname(path)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    book.save(path)
+    return path
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Write a synthetic VRG symbol workbook.")
+    ap.add_argument("out", help="Output workbook (.xlsx)")
+    ap.add_argument("--sheets", type=int, default=10, help="Generic sheets (default: 10)")
+    ap.add_argument("--rows", type=int, default=200, help="Rows per generic sheet (default: 200)")
+    ap.add_argument("--suffixes", default="DZC,MAN,TRT", help="Variant suffixes (default: DZC,MAN,TRT)")
+    ap.add_argument("--seed", type=int, default=0, help="Random seed (default: 0)")
+    args = ap.parse_args()
+
+    suffixes = tuple(s.strip().upper() for s in args.suffixes.split(",") if s.strip())
+    spec = WorkbookSpec(args.sheets, args.rows, suffixes, args.seed)
+    write_workbook(args.out, spec)
+    print(f"[OK] Synthetic workbook ({spec.label}, {', '.join(suffixes) or 'no suffixes'}): {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,39 +5,257 @@ build_exe.py
 ------------
 Script for building standalone .exe for VRG Config & Test Generator GUI.
 
-This creates a single executable that includes:
+This creates an executable that includes:
+- ConfigTestGenerator.py (entry point: GUI, or headless commands when
+  arguments are given, e.g. "ConfigTestGenerator.exe all input.xlsx")
 - ConfigTestGenerator_GUI.py
 - GenSymb_ConfigVRG.py
+- xlsx_stream.py (pandas-free workbook reader)
 - generate_test_menu_v4.py
+- hwtp_reader.py
+- vrg_gen.py
+- config_emitters.py
+- symbol_db.py
+- symbol_search.py
+- isodiag_sim.py, analyze_test_log.py (headless commands)
 - VRG_Logo.ico (if exists)
 - All Python dependencies
-- Pandas, NumPy, OpenPyXL, et_xmlfile packages
+- Pandas, NumPy, OpenPyXL, et_xmlfile packages (pandas/NumPy not with --lite)
+
+Build profiles:
+  onefile  dist/ConfigTestGenerator.exe - one portable file; every launch
+           unpacks the whole bundle to a temp folder first (slow start)
+  fast     dist/ConfigTestGenerator/ConfigTestGenerator.exe - onedir build,
+           nothing to unpack, no UPX, unused modules excluded (fast start)
+
+--lite leaves pandas and NumPy out: workbooks are then read by the
+"stream" engine (xlsx_stream.py, openpyxl only, identical output), which
+is picked automatically when pandas is not installed.
+
+After the build the startup time is measured (skip with --no-bench):
+  cold  first launch after the build (onefile: includes the first unpack)
+  warm  median of the following launches (OS file cache warm)
+for "headless" (ConfigTestGenerator.exe help) and "gui" (window drawn,
+then exit). Results go to dist/startup_<profile>[_lite].json; --max-startup
+fails the build when the warm GUI start exceeds the cap.
 
 Usage:
     python build_exe.py
+    python build_exe.py --profile fast --lite
+    python build_exe.py --profile fast --max-startup 1.5
+    python build_exe.py --profile fast --bench-only --runs 10
 
 Output:
-    dist/ConfigTestGenerator.exe
+    dist/ConfigTestGenerator.exe                      (onefile)
+    dist/ConfigTestGenerator/ConfigTestGenerator.exe  (fast)
 """
 
+import argparse
+import json
+import os
+import statistics
 import subprocess
 import sys
+import time
 from pathlib import Path
 import shutil
 
 
-def build_exe():
+APP_NAME = "ConfigTestGenerator"
+
+PROFILES = {
+    "onefile": "single portable .exe, unpacked to a temp folder at every launch",
+    "fast": "onedir build, no UPX, unused modules excluded",
+}
+
+# Never imported by the generators or the GUI, but pulled in by the
+# analysis of pandas/NumPy/openpyxl optional features (fast profile)
+EXCLUDED_MODULES = [
+    "matplotlib", "scipy", "IPython", "jupyter", "notebook", "PyQt5", "PyQt6", "PySide2", "PySide6",
+    "pytest", "sphinx", "docutils", "setuptools", "pip", "lib2to3", "pydoc_data", "xmlrpc",
+    "tkinter.test", "pandas.tests", "numpy.tests", "pandas.plotting", "pandas.io.formats.style",
+    "pyarrow", "numexpr", "bottleneck", "tables", "sqlalchemy", "psycopg2", "xlrd", "xlsxwriter",
+    "odf", "pyxlsb", "python_calamine", "fsspec", "s3fs", "gcsfs", "botocore", "lxml", "bs4", "html5lib",
+    "jinja2", "PIL", "numba",
+]
+
+# Left out by --lite: the stream engine reads workbooks without them
+PANDAS_MODULES = ["pandas", "numpy", "pytz", "dateutil", "tzdata"]
+
+STARTUP_PROBE_ENV = "VRG_STARTUP_PROBE"   # see ConfigTestGenerator.py
+
+
+def exe_path_for(profile: str) -> Path:
+    exe_name = f"{APP_NAME}.exe" if sys.platform.startswith("win") else APP_NAME
+    if profile == "fast":
+        return Path("dist") / APP_NAME / exe_name
+    return Path("dist") / exe_name
+
+
+def pyinstaller_command(profile: str, lite: bool, has_icon: bool) -> list:
+    """PyInstaller command line for a build profile."""
+    cmd = [
+        sys.executable,
+        "-m", "PyInstaller",
+        "--onefile" if profile == "onefile" else "--onedir",
+        "--windowed",                         # No console window (GUI only)
+        f"--name={APP_NAME}",                 # Output name
+        "--clean",                            # Clean cache
+        "--noconfirm",
+    ]
+
+    if profile == "fast":
+        # UPX-compressed DLLs are decompressed at every launch
+        cmd.append("--noupx")
+        # The PyInstaller hooks find what pandas/openpyxl import; collect-all
+        # would also bundle their test suites and optional backends
+        for module_name in EXCLUDED_MODULES:
+            cmd.append(f"--exclude-module={module_name}")
+        packages = ["openpyxl", "et_xmlfile"] if lite else ["pandas", "numpy", "openpyxl", "et_xmlfile"]
+        for package in packages:
+            cmd.extend(["--collect-submodules", package])
+    else:
+        packages = ["openpyxl", "et_xmlfile"] if lite else ["pandas", "numpy", "openpyxl", "et_xmlfile"]
+        for package in packages:
+            cmd.extend(["--collect-all", package])
+
+    if lite:
+        for module_name in PANDAS_MODULES:
+            cmd.append(f"--exclude-module={module_name}")
+
+    # Headless commands import their script by name at run time
+    from ConfigTestGenerator import COMMANDS
+    hidden = {module for module, _, _ in COMMANDS.values()} | {"ConfigTestGenerator_GUI", "xlsx_stream"}
+    for module_name in sorted(hidden):
+        cmd.append(f"--hidden-import={module_name}")
+
+    # Optional drag & drop support for the batch queue
+    try:
+        import tkinterdnd2  # noqa: F401
+        cmd.extend(["--collect-all", "tkinterdnd2"])
+    except ImportError:
+        pass
+
+    # Add icon if exists
+    if has_icon:
+        cmd.extend(["--icon=VRG_Logo.ico"])
+
+    # Add main script (dispatches to the GUI or a headless command)
+    cmd.append(f"{APP_NAME}.py")
+    return cmd
+
+
+def bundle_size(profile: str) -> int:
+    """Bytes on disk: the .exe (onefile) or the whole output folder (fast)."""
+    exe_path = exe_path_for(profile)
+    if profile == "onefile":
+        return exe_path.stat().st_size
+    return sum(f.stat().st_size for f in exe_path.parent.rglob("*") if f.is_file())
+
+
+# --------------------------- Startup benchmark ---------------------------
+
+def time_launch(cmd: list, env: dict) -> float:
+    start = time.perf_counter()
+    subprocess.run(cmd, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                   timeout=300, check=True)
+    return time.perf_counter() - start
+
+
+def measure_startup(exe_path: Path, runs: int = 5) -> dict:
+    """
+    Cold (first launch) and warm (median of `runs` launches) startup time
+    of the headless dispatcher and of the GUI window.
+    """
+    exe = str(exe_path.absolute())
+    env = dict(os.environ)
+    env.pop(STARTUP_PROBE_ENV, None)
+    probe_env = dict(env, **{STARTUP_PROBE_ENV: "1"})
+
+    modes = {"headless": ([exe, "help"], env)}
+    if sys.platform.startswith("win") or os.environ.get("DISPLAY"):
+        modes["gui"] = ([exe], probe_env)
+
+    results = {}
+    for mode, (cmd, mode_env) in modes.items():
+        cold = time_launch(cmd, mode_env)
+        warm = [time_launch(cmd, mode_env) for _ in range(runs)]
+        results[mode] = {
+            "cold": round(cold, 3),
+            "warm": round(statistics.median(warm), 3),
+            "warm_min": round(min(warm), 3),
+            "warm_max": round(max(warm), 3),
+        }
+    return results
+
+
+def report_startup(profile: str, lite: bool, runs: int, max_startup=None) -> bool:
+    """Measure, print and save the startup times; False if over the cap."""
+    exe_path = exe_path_for(profile)
+    if not exe_path.exists():
+        print(f"\n❌ ERROR: {exe_path} not found (build it first)")
+        return False
+
+    print("\n" + "-"*60)
+    print(f"Measuring startup time ({runs} warm runs)...")
+    print("-"*60)
+    timings = measure_startup(exe_path, runs)
+    for mode, t in timings.items():
+        print(f"   {mode:<9} cold {t['cold']:.3f} s   warm {t['warm']:.3f} s "
+              f"(min {t['warm_min']:.3f}, max {t['warm_max']:.3f})")
+    if "gui" not in timings:
+        print("   gui       skipped (no display)")
+
+    report = {
+        "profile": profile,
+        "lite": lite,
+        "size_mb": round(bundle_size(profile) / (1024 * 1024), 1),
+        "runs": runs,
+        "measured": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "startup": timings,
+    }
+    report_path = Path("dist") / f"startup_{profile}{'_lite' if lite else ''}.json"
+    with open(report_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"   Report: {report_path}")
+
+    if max_startup is not None:
+        measured = timings.get("gui", timings["headless"])["warm"]
+        if measured > max_startup:
+            print(f"\n❌ Startup {measured:.3f} s exceeds the cap of {max_startup:.3f} s")
+            return False
+        print(f"   ✅ Within the startup cap ({measured:.3f} s <= {max_startup:.3f} s)")
+    return True
+
+
+# --------------------------- Build ---------------------------
+
+def build_exe(profile: str = "onefile", lite: bool = False):
     """Build standalone executable."""
     
     print("\n" + "="*60)
     print("  VRG Config & Test Generator - EXE Builder")
+    print(f"  Profile: {profile}{' (lite: no pandas/NumPy)' if lite else ''} - {PROFILES[profile]}")
     print("="*60 + "\n")
     
     # Check if required files exist
     required_files = [
+        "ConfigTestGenerator.py",
         "ConfigTestGenerator_GUI.py",
         "GenSymb_ConfigVRG.py",
-        "generate_test_menu_v4.py"
+        "xlsx_stream.py",
+        "generate_test_menu_v4.py",
+        "hwtp_reader.py",
+        "vrg_profile.py",
+        "vrg_events.py",
+        "symbol_table.py",
+        "linker_map.py",
+        "vrg_gen.py",
+        "config_emitters.py",
+        "symbol_db.py",
+        "symbol_search.py",
+        "isodiag_sim.py",
+        "analyze_test_log.py"
     ]
     
     print("Checking required files...")
@@ -60,70 +278,61 @@ def build_exe():
     print("-"*60 + "\n")
     
     # PyInstaller command (modules are imported directly; no add-data for scripts)
-    cmd = [
-        sys.executable,
-        "-m", "PyInstaller",
-        "--onefile",                          # Single .exe file
-        "--windowed",                         # No console window (GUI only)
-        "--name=ConfigTestGenerator",         # Output name
-        "--clean",                            # Clean cache
-        "--noconfirm",
-        "--collect-all", "pandas",
-        "--collect-all", "numpy",
-        "--collect-all", "openpyxl",
-        "--collect-all", "et_xmlfile",
-    ]
-    
-    # Add icon if exists
-    if has_icon:
-        cmd.extend(["--icon=VRG_Logo.ico"])
-    
-    # Add main script
-    cmd.append("ConfigTestGenerator_GUI.py")
+    cmd = pyinstaller_command(profile, lite, has_icon)
     
     print(f"Command: {' '.join(cmd)}\n")
     
+    # A previous build of the other profile would be left next to this one
+    for stale in (Path("dist") / APP_NAME, Path("dist") / f"{APP_NAME}.exe"):
+        if stale.is_dir():
+            shutil.rmtree(stale)
+        elif stale.exists():
+            stale.unlink()
+    
     # Run PyInstaller
     try:
         result = subprocess.run(cmd, check=True)
-        
+    
         print("\n" + "="*60)
         print("  ✅ BUILD SUCCESSFUL!")
         print("="*60)
-        
+    
         # Check output
-        exe_path = Path("dist") / "ConfigTestGenerator.exe"
+        exe_path = exe_path_for(profile)
         if exe_path.exists():
-            size_mb = exe_path.stat().st_size / (1024 * 1024)
+            size_mb = bundle_size(profile) / (1024 * 1024)
             print(f"\n📦 Executable created:")
             print(f"   Location: {exe_path.absolute()}")
             print(f"   Size: {size_mb:.1f} MB")
-            
+    
+            ship = f"dist/{exe_path.name}" if profile == "onefile" else f"the whole 'dist/{APP_NAME}/' folder"
             print("\n📋 How to use:")
-            print("   1. Copy 'dist/ConfigTestGenerator.exe' to any computer")
+            print(f"   1. Copy {ship} to any computer")
             print("   2. Double-click to run (no Python required!)")
             print("   3. Use the 3-step workflow:")
             print("      - Import Excel file")
             print("      - Generate configs")
             print("      - Generate tests")
-            
+            print("   4. Or headless (CI): ConfigTestGenerator.exe all input.xlsx --out-dir out")
+            print("      (ConfigTestGenerator.exe help lists the commands)")
+    
             print("\n💡 Tips:")
             print("   - No installation needed")
             print("   - Works on any Windows PC")
             print("   - All dependencies included")
             print("   - Portable (can run from USB stick)")
-            
+    
             # Cleanup recommendation
             print("\n🧹 Cleanup (optional):")
             print("   - Delete 'build/' folder (temporary files)")
-            print("   - Keep 'dist/ConfigTestGenerator.exe' (final executable)")
+            print(f"   - Keep '{exe_path.parent if profile == 'fast' else exe_path}' (final executable)")
             print("   - Delete 'ConfigTestGenerator.spec' (build config)")
-            
+    
             return True
         else:
             print("\n❌ ERROR: Executable not found in dist/")
             return False
-            
+    
     except subprocess.CalledProcessError as e:
         print("\n" + "="*60)
         print("  ❌ BUILD FAILED!")
@@ -138,6 +347,24 @@ def build_exe():
         return False
 
 
+def main():
+    ap = argparse.ArgumentParser(description="Build the standalone ConfigTestGenerator executable.")
+    ap.add_argument("--profile", choices=sorted(PROFILES), default="onefile",
+                    help="onefile (portable, slow start) or fast (onedir, fast start); default: onefile")
+    ap.add_argument("--lite", action="store_true",
+                    help="Leave pandas/NumPy out (workbooks are read by the stream engine)")
+    ap.add_argument("--no-bench", action="store_true", help="Skip the startup time measurement")
+    ap.add_argument("--bench-only", action="store_true", help="Only measure the existing build of --profile")
+    ap.add_argument("--runs", type=int, default=5, help="Warm launches to measure (default: 5)")
+    ap.add_argument("--max-startup", type=float, help="Fail if the warm startup exceeds this many seconds")
+    args = ap.parse_args()
+
+    if not args.bench_only and not build_exe(args.profile, args.lite):
+        return 1
+    if args.no_bench and not args.bench_only:
+        return 0
+    return 0 if report_startup(args.profile, args.lite, max(1, args.runs), args.max_startup) else 1
+
+
 if __name__ == "__main__":
-    success = build_exe()
-    sys.exit(0 if success else 1)
+    sys.exit(main())
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+config_emitters.py
+------------------
+Pluggable output formats for the symbol/offset data of one workbook.
+
+The workbook is decoded ONCE by GenSymb_ConfigVRG.generate_from_excel();
+process_master / process_symbol_tables / process_standard_symbol_table /
+process_generic keep a structured SymbolRecord next to every line they
+write (Context.records: size, base, offset, radix, $$$$() indirection,
+multi-word parent, section and variant), and every requested emitter
+writes its file from those same records:
+
+  hwtp   config.hwtp        ISODiag config (unchanged master config text)
+  h      config.h           C header: #define <sym>_ADDR / _OFFSET / _SIZE,
+                            variant sections guarded by VRG_VARIANT_<suffix>
+  json   config.json        symbol map: one object per symbol
+  csv    config.csv         flat table for the calibration tool
+  db     config.db          indexed SQLite symbol database (see symbol_db.py)
+
+New text formats are added with the @register_emitter decorator, formats
+that write the file themselves with @register_file_emitter.
+
+Usage:
+  python config_emitters.py workbook.xlsx --formats hwtp,h,json,csv --out-dir out/
+  python config_emitters.py workbook.xlsx --formats json --base-name symbols
+  python config_emitters.py workbook.xlsx --formats db
+"""
+
+import argparse
+import csv
+import io
+import json
+import os
+import re
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Dict, List, Optional
+
+from GenSymb_ConfigVRG import Context, SymbolRecord, generate_from_excel, split_config_sections
+
+
+# --------------------------- Records ---------------------------
+
+@dataclass
+class ParsedConfig:
+    """Processed workbook data shared by every emitter."""
+    workbook: str
+    base_name: str
+    combined_text: str
+    records: List[SymbolRecord] = field(default_factory=list)
+    sections: List[str] = field(default_factory=list)
+    variants: List[str] = field(default_factory=list)
+
+
+def parse_workbook(xlsx_path: str, base_name: str = "config", combined_text: Optional[str] = None,
+                   records: Optional[Dict[str, List[SymbolRecord]]] = None) -> ParsedConfig:
+    """
+    Decode the workbook once and take the records from the processors.
+
+    combined_text, records: the text and Context.records (section ->
+    SymbolRecords) of a decode the caller already ran with
+    ctx.records = {}; the workbook is only decoded when one is missing.
+    """
+    if combined_text is None or records is None:
+        ctx = Context(records={})
+        combined_text, _ = generate_from_excel(xlsx_path, ctx=ctx)
+        records = ctx.records
+
+    sections, suffixes = split_config_sections(combined_text)
+    names = [header.strip(';= ') for header, _, _ in sections]
+    return ParsedConfig(
+        workbook=xlsx_path,
+        base_name=base_name,
+        combined_text=combined_text,
+        records=[record for name in names for record in records.get(name, ())],
+        sections=names,
+        variants=sorted(suffixes),
+    )
+
+
+# --------------------------- Emitters ---------------------------
+
+@dataclass
+class Emitter:
+    name: str
+    extension: str
+    description: str
+    render: Optional[Callable[[ParsedConfig], str]] = None
+    write: Optional[Callable[[ParsedConfig, str], None]] = None
+
+
+EMITTERS: Dict[str, Emitter] = {}
+
+
+def register_emitter(name: str, extension: str, description: str = ""):
+    """Decorator: register `render(parsed) -> text` as output format `name`."""
+    def decorator(render: Callable[[ParsedConfig], str]):
+        EMITTERS[name] = Emitter(name, extension, description, render=render)
+        return render
+    return decorator
+
+
+def register_file_emitter(name: str, extension: str, description: str = ""):
+    """Decorator: register `write(parsed, path)` for formats that are not plain text."""
+    def decorator(write: Callable[[ParsedConfig, str], None]):
+        EMITTERS[name] = Emitter(name, extension, description, write=write)
+        return write
+    return decorator
+
+
+def c_identifier(name: str) -> str:
+    ident = re.sub(r'\W', '_', name)
+    return f"_{ident}" if ident[:1].isdigit() else ident
+
+
+def hex_text(value: int) -> str:
+    """0x1A / -0x1A (offsets may be negative)."""
+    return f"-0x{-value:X}" if value < 0 else f"0x{value:X}"
+
+
+def c_hex_literal(value: int, width: int = 0) -> str:
+    """C constant: 0x0000001Au, or (-0x1A) for a negative offset (signed, parenthesized)."""
+    return f"(-0x{-value:X})" if value < 0 else f"0x{value:0{width}X}u"
+
+
+@register_emitter("hwtp", ".hwtp", "ISODiag config")
+def render_hwtp(parsed: ParsedConfig) -> str:
+    return parsed.combined_text
+
+
+@register_emitter("h", ".h", "C header with addresses, offsets and sizes")
+def render_c_header(parsed: ParsedConfig) -> str:
+    guard = c_identifier(f"{parsed.base_name}_H").upper()
+    out = [
+        "/* Generated by config_emitters.py from "
+        f"{os.path.basename(parsed.workbook)} - do not edit. */",
+        f"#ifndef {guard}",
+        f"#define {guard}",
+    ]
+
+    # A symbol defined again later (another section, an overlay) is #undef'd
+    # first: like the .hwtp, the last definition the variant sees wins
+    defined = set()
+    current_section = None
+    current_variant = None
+    for record in parsed.records:
+        if record.op == "var":
+            continue
+        if record.section != current_section:
+            if current_variant:
+                out.append(f"#endif /* VRG_VARIANT_{current_variant} */")
+            current_section, current_variant = record.section, record.variant
+            out.append("")
+            out.append(f"/* {record.section} */")
+            if current_variant:
+                out.append(f"#if defined(VRG_VARIANT_{current_variant})")
+
+        ident = c_identifier(record.symbol)
+        macros = (f"{ident}_ADDR", f"{ident}_OFFSET", f"{ident}_SIZE")
+        out += [f"#undef {macro}" for macro in macros if macro in defined]
+        defined.update(macros)
+        if record.base is None:
+            if record.offset is not None:
+                out.append(f"#define {ident}_ADDR {c_hex_literal(record.offset, 8)}")
+        else:
+            note = f"*({record.base}) + offset" if record.indirect else f"{record.base} + offset"
+            if record.offset is not None:
+                out.append(f"#define {ident}_OFFSET {c_hex_literal(record.offset)} /* {note} */")
+        out.append(f"#define {ident}_SIZE {record.size}u")
+
+    if current_variant:
+        out.append(f"#endif /* VRG_VARIANT_{current_variant} */")
+    out += ["", f"#endif /* {guard} */", ""]
+    return "\n".join(out)
+
+
+@register_emitter("json", ".json", "Symbol map (one object per symbol)")
+def render_json(parsed: ParsedConfig) -> str:
+    payload = {
+        "workbook": os.path.basename(parsed.workbook),
+        "variants": parsed.variants,
+        "sections": parsed.sections,
+        "symbols": [asdict(record) for record in parsed.records],
+    }
+    return json.dumps(payload, indent=2) + "\n"
+
+
+CSV_COLUMNS = ["symbol", "op", "size", "base", "offset", "indirect", "variant", "section", "parent"]
+
+
+@register_emitter("csv", ".csv", "Flat symbol table for the calibration tool")
+def render_csv(parsed: ParsedConfig) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(CSV_COLUMNS)
+    for record in parsed.records:
+        offset = "" if record.offset is None else hex_text(record.offset)
+        writer.writerow([record.symbol, record.op, record.size, record.base or "", offset,
+                         int(record.indirect), record.variant or "", record.section, record.parent or ""])
+    return buffer.getvalue()
+
+
+@register_file_emitter("db", ".db", "Indexed SQLite symbol database")
+def write_sqlite(parsed: ParsedConfig, path: str):
+    from symbol_db import write_symbol_db
+    write_symbol_db(parsed, path)
+
+
+def write_formats(parsed: ParsedConfig, output_dir: str, formats: List[str]) -> Dict[str, str]:
+    """Write every requested format from the same parsed data. Returns format -> path."""
+    unknown = [name for name in formats if name not in EMITTERS]
+    if unknown:
+        raise ValueError(f"Unknown format(s): {', '.join(unknown)} (available: {', '.join(EMITTERS)})")
+
+    os.makedirs(output_dir, exist_ok=True)
+    written = {}
+    for name in formats:
+        emitter = EMITTERS[name]
+        path = os.path.join(output_dir, f"{parsed.base_name}{emitter.extension}")
+        if emitter.write is not None:
+            emitter.write(parsed, path)
+        else:
+            with open(path, "w", encoding="utf-8", newline="") as f:
+                f.write(emitter.render(parsed))
+        written[name] = path
+    return written
+
+
+def parse_formats(text: str) -> List[str]:
+    return [name.strip().lower() for name in text.split(",") if name.strip()]
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Write config data from one workbook in several formats.")
+    ap.add_argument("excel", help="Path to the Excel workbook (.xlsx)")
+    ap.add_argument("--formats", "-f", default="hwtp,h,json,csv",
+                    help=f"Comma-separated formats (available: {', '.join(EMITTERS)}; default: all)")
+    ap.add_argument("--out-dir", "-o", default=".", help="Output directory (default: .)")
+    ap.add_argument("--base-name", default="config", help="Output base name (default: config)")
+    args = ap.parse_args()
+
+    if not os.path.exists(args.excel):
+        print(f"[ERROR] Not found: {args.excel}")
+        return 1
+    formats = parse_formats(args.formats)
+    unknown = [name for name in formats if name not in EMITTERS]
+    if unknown:
+        print(f"[ERROR] Unknown format(s): {', '.join(unknown)} (available: {', '.join(EMITTERS)})")
+        return 1
+
+    parsed = parse_workbook(args.excel, args.base_name)
+    print(f"[INFO] {len(parsed.records)} symbols in {len(parsed.sections)} sections")
+    for name, path in write_formats(parsed, args.out_dir, formats).items():
+        print(f"[OK] {name}: {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
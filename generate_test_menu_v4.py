@@ -10,79 +10,264 @@ Changes from V3:
 - ONE balanced test level (moderate cycles, practical)
 - Works with ANY board automatically
 - Simplified CLI (no --level parameter)
+- Optional subroutine mode (--subroutines): each test body is emitted once
+  as a parametrized subroutine and every group only loads its symbols
+- Variant mode (--variants): parse the master config.hwtp once and emit
+  test_<variant>_v4.hwtp for every project suffix
+- --profile [PATH]: parse / test grouping / write timings and heap peaks
+  as JSON (vrg_profile.py); --event-log PATH: progress events as JSON lines
+  (vrg_events.py)
 """
 
 import argparse
+import heapq
 import re
 from collections import defaultdict
+from contextlib import ExitStack
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from GenSymb_ConfigVRG import extract_suffix_from_section_header
+from hwtp_reader import HwtpReader
+from vrg_events import add_event_arguments, as_emitter, emitter_from_args
+from vrg_profile import NULL_PROFILER, add_profile_arguments, finish_profile, profile_path, profiler_from_args
+
+
+# wo32/wo16/by record of a stripped config line -> (cmd, symbol)
+RECORD_RE = re.compile(r'^(wo32|wo16|by)\s+(\w+)')
+
+
+def classify_symbol(symbol: str) -> Optional[str]:
+    """Return the hardware group key ('type:name') of a symbol, or None."""
+    # Skip internal references
+    if '_g_' in symbol or '_c_' in symbol:
+        return None
+    
+    # Group by hardware pattern
+    if symbol.startswith('SPI_'):
+        # SPI_00_TxBuf, SPI_01_CAN_RxBuf -> SPI_00, SPI_01_CAN
+        match = re.match(r'(SPI_\d+(?:_\w+)?)_(?:TxBuf|RxBuf|Ctrl|TxLim)', symbol)
+        if match:
+            return f'spi:{match.group(1)}'
+    
+    elif symbol.startswith('CAN_'):
+        # CAN_01_Tx00, CAN_02_Rx10 -> CAN_01, CAN_02
+        match = re.match(r'(CAN_\d+)', symbol)
+        if match:
+            return f'can:{match.group(1)}'
+    
+    elif 'PWM_OUT_' in symbol or 'OUT_PWM_' in symbol:
+        # PWM_OUT_01_UC_low, OUT_PWM_02_high -> PWM_OUT_01_UC, OUT_PWM_02
+        if '_low' in symbol or '_high' in symbol:
+            base = symbol.replace('_low', '').replace('_high', '')
+            return f'pwm_out:{base}'
+    
+    elif 'PWM_IN_' in symbol or 'DIG_FREQ_IN_' in symbol:
+        # PWM_IN_01_UC_w0 -> PWM_IN_01_UC
+        match = re.match(r'((?:PWM_IN|DIG_FREQ_IN)_\d+(?:_\w+)?)_w\d+', symbol)
+        if match:
+            return f'pwm_in:{match.group(1)}'
+    
+    elif symbol.startswith('ANA_IN_') or symbol.startswith('ADC_'):
+        # ANA_IN_01_UC, ADC_02 -> ANA_IN_01, ADC_02
+        match = re.match(r'((?:ANA_IN|ADC)_\d+)', symbol)
+        if match:
+            return f'adc:{match.group(1)}'
+    
+    elif 'DIG_IN_' in symbol or 'WAKE' in symbol or 'FAULT' in symbol or 'DETECT' in symbol or 'INT' in symbol or 'FB_' in symbol:
+        return 'dig_in:DIGITAL_IN'
+    
+    elif 'DIG_OUT_' in symbol or '_DO_' in symbol or '_EN' in symbol or '_SEL_' in symbol:
+        return 'dig_out:DIGITAL_OUT'
+    
+    return None
 
 
 def parse_config(config_path: Path) -> Dict[str, List[str]]:
     """Parse config and group symbols by hardware type."""
     groups = defaultdict(list)
     
-    with open(config_path, 'r', encoding='utf-8') as f:
-        for line in f:
-            line = line.strip()
-            if not line or line.startswith(';'):
-                continue
-            
-            # Extract symbol from wo32/wo16/by lines
-            match = re.match(r'^(wo32|wo16|by)\s+(\w+)', line)
-            if not match:
-                continue
-            
-            cmd, symbol = match.groups()
-            
-            # Skip internal references
-            if '_g_' in symbol or '_c_' in symbol:
-                continue
-            
-            # Group by hardware pattern
-            if symbol.startswith('SPI_'):
-                # SPI_00_TxBuf, SPI_01_CAN_RxBuf -> SPI_00, SPI_01_CAN
-                match = re.match(r'(SPI_\d+(?:_\w+)?)_(?:TxBuf|RxBuf|Ctrl|TxLim)', symbol)
-                if match:
-                    groups[f'spi:{match.group(1)}'].append(symbol)
-            
-            elif symbol.startswith('CAN_'):
-                # CAN_01_Tx00, CAN_02_Rx10 -> CAN_01, CAN_02
-                match = re.match(r'(CAN_\d+)', symbol)
-                if match:
-                    groups[f'can:{match.group(1)}'].append(symbol)
-            
-            elif 'PWM_OUT_' in symbol or 'OUT_PWM_' in symbol:
-                # PWM_OUT_01_UC_low, OUT_PWM_02_high -> PWM_OUT_01_UC, OUT_PWM_02
-                if '_low' in symbol or '_high' in symbol:
-                    base = symbol.replace('_low', '').replace('_high', '')
-                    groups[f'pwm_out:{base}'].append(symbol)
-            
-            elif 'PWM_IN_' in symbol or 'DIG_FREQ_IN_' in symbol:
-                # PWM_IN_01_UC_w0 -> PWM_IN_01_UC
-                match = re.match(r'((?:PWM_IN|DIG_FREQ_IN)_\d+(?:_\w+)?)_w\d+', symbol)
-                if match:
-                    groups[f'pwm_in:{match.group(1)}'].append(symbol)
-            
-            elif symbol.startswith('ANA_IN_') or symbol.startswith('ADC_'):
-                # ANA_IN_01_UC, ADC_02 -> ANA_IN_01, ADC_02
-                match = re.match(r'((?:ANA_IN|ADC)_\d+)', symbol)
-                if match:
-                    groups[f'adc:{match.group(1)}'].append(symbol)
-            
-            elif 'DIG_IN_' in symbol or 'WAKE' in symbol or 'FAULT' in symbol or 'DETECT' in symbol or 'INT' in symbol or 'FB_' in symbol:
-                groups['dig_in:DIGITAL_IN'].append(symbol)
-            
-            elif 'DIG_OUT_' in symbol or '_DO_' in symbol or '_EN' in symbol or '_SEL_' in symbol:
-                groups['dig_out:DIGITAL_OUT'].append(symbol)
+    # Only wo32/wo16/by records are scanned (memory-mapped, byte-level)
+    with HwtpReader(config_path) as reader:
+        for cmd, symbol in reader.iter_records():
+            group_key = classify_symbol(symbol)
+            if group_key:
+                groups[group_key].append(symbol)
+    
+    return groups
+
+
+def groups_from_lines(lines: Iterable[str]) -> Dict[str, List[str]]:
+    """Group the symbols of in-memory config lines (same rules as parse_config)."""
+    groups = defaultdict(list)
+    
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith(';'):
+            continue
+        
+        match = RECORD_RE.match(line)
+        if not match:
+            continue
+        
+        cmd, symbol = match.groups()
+        group_key = classify_symbol(symbol)
+        if group_key:
+            groups[group_key].append(symbol)
     
     return groups
 
 
-def generate_test_menu(groups: Dict[str, List[str]]) -> List[str]:
-    """Generate SINGLE balanced test menu."""
-    lines = [
+def parse_master_config(config_path: Path) -> Dict[Optional[str], Dict[str, List[Tuple[int, str]]]]:
+    """
+    Parse the master config ONCE, tagging every grouped symbol with the
+    project suffix of its section (None for common sections).
+    
+    Returns: suffix -> group_key -> [(record_index, symbol), ...]
+    The record index keeps the original file order when variants are merged.
+    """
+    tagged = defaultdict(lambda: defaultdict(list))
+    
+    with HwtpReader(config_path) as reader:
+        suffixes = [extract_suffix_from_section_header(reader.header(i))
+                    for i in range(len(reader.sections))]
+        # Every variant gets a test menu, also one without test groups
+        # (config_<variant>.hwtp is written for it all the same)
+        for suffix in suffixes:
+            if suffix:
+                tagged.setdefault(suffix, defaultdict(list))
+        
+        for index, (section, cmd, symbol) in enumerate(reader.iter_tagged_records()):
+            group_key = classify_symbol(symbol)
+            if group_key:
+                suffix = suffixes[section] if section >= 0 else None
+                tagged[suffix][group_key].append((index, symbol))
+    
+    return tagged
+
+
+def variant_groups(tagged: Dict[Optional[str], Dict[str, List[Tuple[int, str]]]],
+                   variant: str) -> Dict[str, List[str]]:
+    """
+    Derive the groups of one variant from a parse_master_config() result:
+    common groups UNION the variant's own groups, symbols in file order.
+    This is exactly what parse_config() returns for config_<variant>.hwtp.
+    """
+    common = tagged.get(None, {})
+    own = tagged.get(variant, {})
+    
+    groups = {}
+    for group_key in set(common) | set(own):
+        tagged_symbols = heapq.merge(common.get(group_key, []), own.get(group_key, []))
+        groups[group_key] = [symbol for _, symbol in tagged_symbols]
+    return groups
+
+
+# Subroutine parameters per hardware type: (variable, symbol suffix).
+# Symbols evaluate to their address, so each group loads its addresses into
+# the variables and jumps to the shared body.
+SUBROUTINE_PARAMS = {
+    'spi': [('#p', '_TxLim_u8'), ('#q', '_TxBuf_pu8'), ('#r', '_Ctrl_b16'), ('#s', '_RxBuf_pu8')],
+    'pwm_out': [('#p', '_low'), ('#q', '_high')],
+    'pwm_in': [('#p', '_w0'), ('#q', '_w1'), ('#r', '_w2')],
+    'adc': [('#p', '_UC')],
+}
+
+
+def generate_subroutines(hw_types) -> Iterator[str]:
+    """Generate one parametrized subroutine per hardware type in hw_types.
+
+    Every subroutine ends with GO MENU, exactly like the inlined tests, so
+    the callers simply jump to it after loading the parameter variables.
+    """
+    if 'spi' in hw_types:
+        # SPI: 3 patterns × 2 cycles (#p=TxLim, #q=TxBuf, #r=Ctrl, #s=RxBuf)
+        yield "; Subroutine SPI: #p=TxLim #q=TxBuf #r=Ctrl #s=RxBuf"
+        yield ":SUB_SPI"
+        yield "WO #i 0."
+        yield ":SUB_SPI_LOOP"
+        for n, pattern in enumerate(("0xAA55", "0xFF00", "0x5A5A"), 1):
+            yield from [
+                f'EC "  Pattern {n}: {pattern}"',
+                "CB #p 0x02",
+                f"CW #q {pattern}",
+                "CW #r 0x8000",
+                "WA 2",
+                "MD #s 2 %02x",
+            ]
+        yield from [
+            "WO #i (#i + 1.)",
+            "WO #d (#i - 2.)",
+            "IF N GO SUB_SPI_LOOP",
+            'EC "Test completed (2 cycles)"',
+            "GO MENU",
+            "",
+        ]
+    
+    if 'pwm_out' in hw_types:
+        # PWM: Sweep 0-100% in 25% steps (#p=low, #q=high)
+        yield from [
+            "; Subroutine PWM_OUT: #p=low #q=high",
+            ":SUB_PWM_OUT",
+            "WO #i 0.",
+            ":SUB_PWM_OUT_LOOP",
+            "WO #d (#i * 25.)",
+            "CW #p #d",
+            "WO #d (100. - #d)",
+            "CW #q #d",
+            "WA 3",
+            "WO #i (#i + 1.)",
+            "WO #d (#i - 5.)",
+            "IF N GO SUB_PWM_OUT_LOOP",
+            'EC "Sweep completed: 0%% -> 25%% -> 50%% -> 75%% -> 100%%"',
+            "GO MENU",
+            "",
+        ]
+    
+    if 'pwm_in' in hw_types:
+        # PWM Input: Monitor for 5 cycles (#p=w0, #q=w1, #r=w2)
+        yield from [
+            "; Subroutine PWM_IN: #p=w0 #q=w1 #r=w2",
+            ":SUB_PWM_IN",
+            "WO #i 0.",
+            ":SUB_PWM_IN_LOOP",
+            'EC "  Low: " DW #p %d',
+            'EC "  High: " DW #q %d',
+            'EC "  Period: " DW #r %d',
+            "WA 5",
+            "WO #i (#i + 1.)",
+            "WO #d (#i - 5.)",
+            "IF N GO SUB_PWM_IN_LOOP",
+            'EC "Monitor completed (5 cycles)"',
+            "GO MENU",
+            "",
+        ]
+    
+    if 'adc' in hw_types:
+        # ADC: Monitor for 5 readings (#p=value)
+        yield from [
+            "; Subroutine ADC: #p=value",
+            ":SUB_ADC",
+            "WO #i 0.",
+            ":SUB_ADC_LOOP",
+            'EC "  Value: " DW #p %d',
+            "WA 3",
+            "WO #i (#i + 1.)",
+            "WO #d (#i - 5.)",
+            "IF N GO SUB_ADC_LOOP",
+            'EC "Monitor completed (5 readings)"',
+            "GO MENU",
+            "",
+        ]
+
+
+def iter_test_menu(groups: Dict[str, List[str]], subroutines: bool = False) -> Iterator[str]:
+    """Lazily generate the SINGLE balanced test menu, one line at a time.
+
+    With subroutines=True the SPI, PWM and ADC test bodies are emitted once
+    as subroutines and each group only loads its symbols before jumping there.
+    """
+    yield from [
         ";============================================================",
         "; Auto-Generated Test Menu (V4 - Universal Single-Level)",
         ";",
@@ -100,54 +285,68 @@ def generate_test_menu(groups: Dict[str, List[str]]) -> List[str]:
         "WO #n 0.",
         "WO #i 0.",
         "WO #p 0.",
-        "",
     ]
+    if subroutines:
+        yield from ["WO #q 0.", "WO #r 0.", "WO #s 0."]
+    yield ""
     
     # Generate menu
-    lines.append(":MENU")
-    lines.append('EC "============================================================"')
-    lines.append('EC "[0] Exit"')
+    yield ":MENU"
+    yield 'EC "============================================================"'
+    yield 'EC "[0] Exit"'
     
     option = 1
     menu_items = []
     for group_key in sorted(groups.keys()):
         hw_type, hw_name = group_key.split(':', 1)
-        lines.append(f'EC "[{option}] {hw_type.upper()}: {hw_name}"')
+        yield f'EC "[{option}] {hw_type.upper()}: {hw_name}"'
         menu_items.append((option, group_key))
         option += 1
     
-    lines.append('EC "============================================================"')
-    lines.append(f'IN "Select [0..{option-1}]: " #n')
-    lines.append("")
+    yield 'EC "============================================================"'
+    yield f'IN "Select [0..{option-1}]: " #n'
+    yield ""
     
     # Dispatcher
-    lines.append("; Dispatcher")
-    lines.append("WO #d (#n - 0.)")
-    lines.append("IF Z GO EXIT")
+    yield "; Dispatcher"
+    yield "WO #d (#n - 0.)"
+    yield "IF Z GO EXIT"
     
     for opt, _ in menu_items:
-        lines.append(f"WO #d (#n - {opt}.)")
-        lines.append(f"IF Z GO TEST_{opt}")
+        yield f"WO #d (#n - {opt}.)"
+        yield f"IF Z GO TEST_{opt}"
     
-    lines.append("GO MENU")
-    lines.append("")
-    lines.append(":EXIT")
-    lines.append('EC "Exiting."')
-    lines.append("")
+    yield "GO MENU"
+    yield ""
+    yield ":EXIT"
+    yield 'EC "Exiting."'
+    yield ""
+    
+    if subroutines:
+        used_types = {key.split(':', 1)[0] for key in groups}
+        yield from generate_subroutines(used_types)
     
     # Generate tests (BALANCED level - moderate cycles)
     for opt, group_key in menu_items:
         hw_type, hw_name = group_key.split(':', 1)
         symbols = groups[group_key]
         
-        lines.append(f"; {hw_type.upper()}: {hw_name}")
-        lines.append(f":TEST_{opt}")
-        lines.append(f'EC "=== {hw_name} Test ==="')
+        yield f"; {hw_type.upper()}: {hw_name}"
+        yield f":TEST_{opt}"
+        yield f'EC "=== {hw_name} Test ==="'
+        
+        if subroutines and hw_type in SUBROUTINE_PARAMS:
+            # Load parameters and jump; the subroutine returns to the menu
+            for var, suffix in SUBROUTINE_PARAMS[hw_type]:
+                yield f"WO {var} {hw_name}{suffix}"
+            yield f"GO SUB_{hw_type.upper()}"
+            yield ""
+            continue
         
         if hw_type == 'spi':
             # SPI: 3 patterns × 2 cycles
             base = hw_name
-            lines.extend([
+            yield from [
                 "WO #i 0.",
                 f":TEST_{opt}_LOOP",
                 'EC "  Pattern 1: 0xAA55"',
@@ -172,12 +371,12 @@ def generate_test_menu(groups: Dict[str, List[str]]) -> List[str]:
                 "WO #d (#i - 2.)",
                 f"IF N GO TEST_{opt}_LOOP",
                 'EC "Test completed (2 cycles)"',
-            ])
+            ]
         
         elif hw_type == 'pwm_out':
             # PWM: Sweep 0-100% in 25% steps (5 steps × 3 sec = 15 sec)
             base = hw_name
-            lines.extend([
+            yield from [
                 "WO #i 0.",
                 f":TEST_{opt}_LOOP",
                 "WO #d (#i * 25.)",
@@ -189,12 +388,12 @@ def generate_test_menu(groups: Dict[str, List[str]]) -> List[str]:
                 "WO #d (#i - 5.)",
                 f"IF N GO TEST_{opt}_LOOP",
                 'EC "Sweep completed: 0%% -> 25%% -> 50%% -> 75%% -> 100%%"',
-            ])
+            ]
         
         elif hw_type == 'pwm_in':
             # PWM Input: Monitor for 5 cycles
             base = hw_name
-            lines.extend([
+            yield from [
                 "WO #i 0.",
                 f":TEST_{opt}_LOOP",
                 f'EC "  Low: " DW {base}_w0 %d',
@@ -205,11 +404,11 @@ def generate_test_menu(groups: Dict[str, List[str]]) -> List[str]:
                 "WO #d (#i - 5.)",
                 f"IF N GO TEST_{opt}_LOOP",
                 'EC "Monitor completed (5 cycles)"',
-            ])
+            ]
         
         elif hw_type == 'adc':
             # ADC: Monitor for 5 readings
-            lines.extend([
+            yield from [
                 "WO #i 0.",
                 f":TEST_{opt}_LOOP",
                 f'EC "  Value: " DW {hw_name}_UC %d',
@@ -218,60 +417,137 @@ def generate_test_menu(groups: Dict[str, List[str]]) -> List[str]:
                 "WO #d (#i - 5.)",
                 f"IF N GO TEST_{opt}_LOOP",
                 'EC "Monitor completed (5 readings)"',
-            ])
+            ]
         
         elif hw_type in ('dig_in', 'dig_out'):
             # Digital I/O: Monitor first 8 for 3 cycles
-            lines.extend([
+            yield from [
                 "WO #i 0.",
                 f":TEST_{opt}_LOOP",
-            ])
+            ]
             for sym in symbols[:8]:
-                lines.append(f'EC "  {sym}: " DB {sym} %d')
-            lines.extend([
+                yield f'EC "  {sym}: " DB {sym} %d'
+            yield from [
                 "WA 5",
                 "WO #i (#i + 1.)",
                 "WO #d (#i - 3.)",
                 f"IF N GO TEST_{opt}_LOOP",
                 'EC "Monitor completed (3 cycles)"',
-            ])
+            ]
         
         elif hw_type == 'can':
             # CAN: Show status for 3 cycles
-            lines.extend([
+            yield from [
                 "WO #i 0.",
                 f":TEST_{opt}_LOOP",
-            ])
+            ]
             for sym in symbols[:5]:
-                lines.append(f'EC "  {sym}"')
-            lines.extend([
+                yield f'EC "  {sym}"'
+            yield from [
                 "WA 5",
                 "WO #i (#i + 1.)",
                 "WO #d (#i - 3.)",
                 f"IF N GO TEST_{opt}_LOOP",
                 'EC "Monitor completed (3 cycles)"',
-            ])
+            ]
         
         else:
             # Generic: Show symbols for 2 cycles
-            lines.extend([
+            yield from [
                 "WO #i 0.",
                 f":TEST_{opt}_LOOP",
-            ])
+            ]
             for sym in symbols[:5]:
-                lines.append(f'EC "  {sym}"')
-            lines.extend([
+                yield f'EC "  {sym}"'
+            yield from [
                 "WA 5",
                 "WO #i (#i + 1.)",
                 "WO #d (#i - 2.)",
                 f"IF N GO TEST_{opt}_LOOP",
                 'EC "Monitor completed (2 cycles)"',
-            ])
+            ]
         
-        lines.append("GO MENU")
-        lines.append("")
+        yield "GO MENU"
+        yield ""
+
+
+def generate_test_menu(groups: Dict[str, List[str]], subroutines: bool = False) -> List[str]:
+    """Generate SINGLE balanced test menu as a list of lines."""
+    return list(iter_test_menu(groups, subroutines=subroutines))
+
+
+def write_test_menu(groups: Dict[str, List[str]], output_path: Path, subroutines: bool = False) -> int:
+    """
+    Stream the test menu straight to output_path and return the line count.
+    Lines are written as they are generated, so memory stays flat regardless
+    of the number of groups. Output is identical to '\n'.join(generate_test_menu()).
+    """
+    count = 0
+    with open(output_path, 'w', encoding='utf-8') as f:
+        for line in iter_test_menu(groups, subroutines=subroutines):
+            if count:
+                f.write('\n')
+            f.write(line)
+            count += 1
+    return count
+
+
+def generate_variant_tests(config_path: Path, output_dir: Path, subroutines: bool = False,
+                           jobs: int = 1, progress=None, profiler=None, events=None) -> List[Path]:
+    """
+    Generate test_<variant>_v4.hwtp for every variant of a master config
+    from a single parse. Returns the list of written files.
+    
+    jobs:     variants written concurrently on a thread pool (1 = sequential).
+    progress: optional callback progress("variant", done, total), called as
+              each variant file is written; it may raise to cancel.
+    profiler: optional vrg_profile.Profiler: parse_config, then test_grouping
+              and write per variant (with jobs > 1 one write stage for the pool).
+    events:   optional vrg_events.EventEmitter or listener: tests_written(path,
+              lines, groups) per variant, as each file is written.
+    """
+    profiler = profiler or NULL_PROFILER
+    emitter = as_emitter(events, progress)
+    with profiler.stage(f"parse_config:{Path(config_path).name}"):
+        tagged = parse_master_config(config_path)
+    variants = sorted(s for s in tagged if s is not None)
     
-    return lines
+    def write_variant(variant: str, stages=NULL_PROFILER) -> Tuple[Path, int, int]:
+        with stages.stage(f"test_grouping:{variant}"):
+            groups = variant_groups(tagged, variant)
+        test_file = Path(output_dir) / f"test_{variant}_v4.hwtp"
+        with stages.stage(f"write:{test_file.name}") as stage:
+            lines = stage["lines"] = write_test_menu(groups, test_file, subroutines=subroutines)
+        return test_file, lines, len(groups)
+    
+    def written_event(variant: str, done: int, result: Tuple[Path, int, int]):
+        test_file, lines, groups = result
+        emitter.emit("tests_written", variant, done, len(variants), path=str(test_file), lines=lines, groups=groups)
+    
+    if jobs == 1 or len(variants) <= 1:
+        written = []
+        for variant in variants:
+            result = write_variant(variant, profiler)
+            written.append(result[0])
+            written_event(variant, len(written), result)
+        return written
+    
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+    
+    # Stages are not thread-safe: the pool is measured as a whole
+    with profiler.stage("write:test_menus", jobs=jobs), ThreadPoolExecutor(max_workers=jobs) as pool:
+        futures = {pool.submit(write_variant, variant): variant for variant in variants}
+        done = 0
+        try:
+            for future in as_completed(futures):
+                result = future.result()
+                done += 1
+                written_event(futures[future], done, result)
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+    return [Path(output_dir) / f"test_{variant}_v4.hwtp" for variant in variants]
 
 
 def main():
@@ -280,16 +556,38 @@ def main():
     )
     parser.add_argument("config", help="Config file (.hwtp)")
     parser.add_argument("--out", "-o", default="test_menu.hwtp", help="Output file")
+    parser.add_argument("--subroutines", action="store_true",
+                        help="Emit each test body once as a parametrized subroutine (smaller scripts)")
+    parser.add_argument("--variants", action="store_true",
+                        help="Treat config as master config.hwtp and write test_<variant>_v4.hwtp "
+                             "for every variant into the --out directory (default: next to config)")
+    add_profile_arguments(parser)
+    add_event_arguments(parser)
     
     args = parser.parse_args()
+    profiler = profiler_from_args(args)
     
     config_path = Path(args.config)
     if not config_path.exists():
         print(f"[ERROR] Not found: {config_path}")
         return 1
     
+    if args.variants:
+        output_dir = Path(args.out) if args.out != parser.get_default("out") else config_path.parent
+        output_dir.mkdir(parents=True, exist_ok=True)
+        print(f"[INFO] Parsing master config: {config_path}")
+        with ExitStack() as stack:
+            written = generate_variant_tests(config_path, output_dir, subroutines=args.subroutines,
+                                             profiler=profiler, events=emitter_from_args(args, stack))
+        if not written:
+            print("[INFO] No project suffixes detected in master config.")
+        finish_profile(profiler, profile_path(args, str(output_dir)))
+        return 0
+    
+    stages = profiler or NULL_PROFILER
     print(f"[INFO] Parsing: {config_path}")
-    groups = parse_config(config_path)
+    with stages.stage(f"parse_config:{config_path.name}"):
+        groups = parse_config(config_path)
     
     print(f"[INFO] Detected {len(groups)} hardware groups:")
     for key in sorted(groups.keys()):
@@ -297,14 +595,17 @@ def main():
         print(f"  - {hw_type.upper()}: {hw_name} ({len(groups[key])} symbols)")
     
     print(f"[INFO] Generating balanced tests...")
-    lines = generate_test_menu(groups)
-    
     output_path = Path(args.out)
-    with open(output_path, 'w', encoding='utf-8') as f:
-        f.write('\n'.join(lines))
+    with stages.stage(f"write:{output_path.name}") as stage:
+        line_count = write_test_menu(groups, output_path, subroutines=args.subroutines)
+        stage["lines"] = line_count
     
-    print(f"[OK] Generated: {output_path} ({len(lines)} lines)")
+    with ExitStack() as stack:
+        emitter_from_args(args, stack).emit("tests_written", config_path.stem, 1, 1, path=str(output_path),
+                                            lines=line_count, groups=len(groups))
     print(f"[INFO] Test level: BALANCED (moderate cycles, practical testing)")
+    stages.count("hardware_groups", len(groups))
+    finish_profile(profiler, profile_path(args, str(output_path.parent)))
     return 0
 
 
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+hwtp_reader.py
+--------------
+Memory-mapped, line-indexed reader for generated .hwtp config files.
+
+Master configs reach hundreds of thousands of lines, so instead of reading
+and regex-matching every line in Python the reader:
+- mmaps the file (no copy of the text in memory)
+- builds, in ONE pass, a compact array-backed index of the section
+  boundaries (";=== <name> ===" headers); the line offset index is built
+  the same way on first line-level access
+- scans only the wo32/wo16/by records with a precompiled byte-level pattern
+- gives random access by section name, so a tool can read one variant's
+  sections without scanning the whole file
+
+Usage:
+  with HwtpReader("config.hwtp") as reader:
+      for cmd, symbol in reader.iter_records():
+          ...
+      for cmd, symbol in reader.iter_records(sections=["dio_g_DigIn_u8_DZC"]):
+          ...
+
+  python hwtp_reader.py config.hwtp            (prints the section index)
+"""
+
+import argparse
+import mmap
+import re
+from array import array
+from bisect import bisect_right
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+# wo32/wo16/by record -> (cmd, symbol); comment lines never match.
+# Anchored on the preceding newline rather than "^" + MULTILINE so the
+# regex engine can skip ahead on the literal (several times faster).
+RECORD_RE = re.compile(rb'\n[ \t]*(wo32|wo16|by)[ \t]+(\w+)')
+FIRST_RECORD_RE = re.compile(rb'[ \t]*(wo32|wo16|by)[ \t]+(\w+)')
+
+# Section header name, same rule as GenSymb_ConfigVRG.extract_suffix_from_section_header
+SECTION_NAME_RE = re.compile(rb';=+\s*(.+?)\s*=+')
+
+NEWLINE_RE = re.compile(rb'\n')
+
+
+class HwtpReader:
+    """Read-only, memory-mapped view of a .hwtp file with a line/section index."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._file = open(self.path, 'rb')
+        try:
+            self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files cannot be mapped
+            self._data = b""
+
+        # Index arrays: byte offset and line number of every section header.
+        # Line start offsets are built on first line-level access only, so
+        # record scans never pay for them.
+        self.section_offsets = array('q')
+        self.section_line_numbers = array('q')
+        self.sections: List[str] = []
+        self._section_index: Dict[str, List[int]] = {}
+        self._line_offsets: Optional[array] = None
+        self._build_index()
+
+    # --------------------------- Index ---------------------------
+
+    def _build_index(self):
+        """Single pass over the mapped bytes collecting the section headers."""
+        data = self._data
+        find = data.find
+        line_no = 0
+        prev = 0
+        offset = 0 if data[:2] == b';=' else find(b'\n;=')
+        while offset >= 0:
+            if data[offset:offset + 1] == b'\n':
+                offset += 1
+            line_no += data[prev:offset].count(b'\n')
+            prev = offset
+            self._add_section(offset, line_no)
+            offset = find(b'\n;=', offset)
+
+    def _add_section(self, offset: int, line_no: int):
+        end = self._data.find(b'\n', offset)
+        match = SECTION_NAME_RE.search(self._data, offset, end if end >= 0 else len(self._data))
+        name = match.group(1).decode('utf-8', 'replace') if match else ""
+        self._section_index.setdefault(name, []).append(len(self.sections))
+        self.sections.append(name)
+        self.section_offsets.append(offset)
+        self.section_line_numbers.append(line_no)
+
+    @property
+    def line_offsets(self) -> array:
+        """Byte offset of every line start (built lazily, then cached)."""
+        if self._line_offsets is None:
+            offsets = array('q', [0] if self._data else [])
+            offsets.extend(m.end() for m in NEWLINE_RE.finditer(self._data))
+            if offsets and offsets[-1] == len(self._data):
+                offsets.pop()  # trailing newline does not start a line
+            self._line_offsets = offsets
+        return self._line_offsets
+
+    @property
+    def line_count(self) -> int:
+        return len(self.line_offsets)
+
+    def line(self, line_no: int) -> str:
+        """Return one line (without line ending) by 0-based line number."""
+        offsets = self.line_offsets
+        start = offsets[line_no]
+        end = offsets[line_no + 1] if line_no + 1 < len(offsets) else len(self._data)
+        return self._data[start:end].rstrip(b'\r\n').decode('utf-8', 'replace')
+
+    def header(self, section: int) -> str:
+        """Return the raw header line of a section (by index)."""
+        start = self.section_offsets[section]
+        end = self._data.find(b'\n', start)
+        if end < 0:
+            end = len(self._data)
+        return self._data[start:end].rstrip(b'\r').decode('utf-8', 'replace')
+
+    def section_range(self, section: int) -> Tuple[int, int]:
+        """Byte range [start, end) of a section, header line included."""
+        start = self.section_offsets[section]
+        if section + 1 < len(self.section_offsets):
+            end = self.section_offsets[section + 1]
+        else:
+            end = len(self._data)
+        return start, end
+
+    def find_sections(self, name: str) -> List[int]:
+        """Indexes of all sections with this exact name (constant time)."""
+        return self._section_index.get(name, [])
+
+    def section_of_offset(self, offset: int) -> int:
+        """Index of the section containing a byte offset (-1 before the first header)."""
+        return bisect_right(self.section_offsets, offset) - 1
+
+    def section_lines(self, name: str) -> List[str]:
+        """All lines of the named section(s), header included."""
+        lines = []
+        for section in self.find_sections(name):
+            start, end = self.section_range(section)
+            lines.extend(self._data[start:end].decode('utf-8', 'replace').splitlines())
+        return lines
+
+    # --------------------------- Records ---------------------------
+
+    def iter_records(self, sections: Optional[Iterable[str]] = None) -> Iterator[Tuple[str, str]]:
+        """
+        Yield (cmd, symbol) for every wo32/wo16/by record in file order.
+        If sections is given, only those sections are scanned.
+        """
+        if sections is None:
+            ranges = [(0, len(self._data))]
+        else:
+            ranges = [self.section_range(i) for i in self._section_indexes(sections)]
+
+        for start, end in ranges:
+            for match in self._iter_matches(start, end):
+                cmd, symbol = match.groups()
+                yield cmd.decode(), symbol.decode()
+
+    def iter_tagged_records(self, sections: Optional[Iterable[str]] = None) -> Iterator[Tuple[int, str, str]]:
+        """Like iter_records(), but also yield the section index of each record."""
+        if sections is None:
+            ranges = [(-1, 0, len(self._data))]
+        else:
+            ranges = [(i,) + self.section_range(i) for i in self._section_indexes(sections)]
+
+        for section, start, end in ranges:
+            section_offsets = self.section_offsets
+            next_boundary = start if section < 0 else end
+            for match in self._iter_matches(start, end):
+                if section < 0 or match.start(1) >= next_boundary:
+                    # Whole-file scan: track the section we are in
+                    section = self.section_of_offset(match.start(1))
+                    next_boundary = (section_offsets[section + 1]
+                                     if section + 1 < len(section_offsets) else end)
+                cmd, symbol = match.groups()
+                yield section, cmd.decode(), symbol.decode()
+
+    def _iter_matches(self, start: int, end: int):
+        """Record matches in [start, end); start is always a line start."""
+        if start == 0:
+            first = FIRST_RECORD_RE.match(self._data, 0, end)
+            if first:
+                yield first
+        yield from RECORD_RE.finditer(self._data, start, end)
+
+    def _section_indexes(self, sections: Iterable[str]) -> List[int]:
+        """Sorted section indexes for a list of section names."""
+        return sorted(i for name in sections for i in self.find_sections(name))
+
+    # --------------------------- Lifecycle ---------------------------
+
+    def close(self):
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Show the line/section index of a .hwtp file.")
+    ap.add_argument("config", help="Config file (.hwtp)")
+    ap.add_argument("--section", "-s", help="Print the records of this section only")
+    args = ap.parse_args()
+
+    config_path = Path(args.config)
+    if not config_path.exists():
+        print(f"[ERROR] Not found: {config_path}")
+        return 1
+
+    with HwtpReader(config_path) as reader:
+        if args.section:
+            if not reader.find_sections(args.section):
+                print(f"[ERROR] Section not found: {args.section}")
+                return 1
+            for cmd, symbol in reader.iter_records(sections=[args.section]):
+                print(f"{cmd:<4} {symbol}")
+            return 0
+
+        print(f"[INFO] {config_path}: {reader.line_count} lines, {len(reader.sections)} sections")
+        for i, name in enumerate(reader.sections):
+            start, end = reader.section_range(i)
+            print(f"  - line {reader.section_line_numbers[i] + 1:>7}: {name} ({end - start} bytes)")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,531 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+isodiag_sim.py
+--------------
+Local interpreter for the subset of ISODiag that this project emits, so
+generated configs and test menus can be checked in CI without a bench.
+
+Supported:
+- Definitions:  wo32 / wo16 / by <Symbol> <expr>   and   var <Symbol> <expr>
+                (var offsets are kept apart and never replace an address)
+- Expressions:  symbols (= their address), #variables, $$$$(<expr>) (32-bit
+                dereference), + - * / and parentheses.
+                Numbers: 0x1F (hex), 12. (decimal), 1F (bare = hex)
+- Commands:     WO IF GO EC IN CB CW MD DB DW WA CL and :LABELS
+
+Memory model:
+- Sparse, little-endian byte memory; unset bytes read as 0
+- Optional memory image (--image): lines "<address> <byte> [<byte> ...]" (hex)
+- CB/DB access 1 byte, CW/DW access 2 bytes (WORD_SIZE)
+
+Checks:
+- Static: undefined GO/IF labels, duplicate labels, undefined symbols in
+  any expression (including paths that are never executed)
+- Dynamic: undefined symbols met while running, bad formats, step limit
+
+Time:
+- WA <n> advances a virtual clock by n seconds; the report shows the
+  virtual duration of every menu selection.
+
+Usage:
+  python isodiag_sim.py config_DZC.hwtp test_DZC_v4.hwtp --inputs all
+  python isodiag_sim.py config_DZC.hwtp test_DZC_v4.hwtp --inputs 3,0 --image mem.txt
+  python isodiag_sim.py config.hwtp                      (config check only)
+"""
+
+import argparse
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+
+WORD_SIZE = 2
+DEREF_SIZE = 4
+DEFAULT_MAX_STEPS = 1_000_000
+
+DEFINITION_OPS = {"wo32": 4, "wo16": 2, "by": 1, "var": 0}
+
+TOKEN_RE = re.compile(
+    r"\s*(?:"
+    r"(?P<deref>\$\$\$\$\()"
+    r"|(?P<hex>0[xX][0-9A-Fa-f]+)"
+    r"|(?P<dec>\d+\.)"
+    r"|(?P<bare>[0-9][0-9A-Fa-f]*)"
+    r"|(?P<var>#\w+)"
+    r"|(?P<ident>[A-Za-z_]\w*)"
+    r"|(?P<op>[-+*/()])"
+    r")"
+)
+
+IDENT_RE = re.compile(r"(?<![#\w])([A-Za-z_]\w*)")
+
+
+# --------------------------- Helpers ---------------------------
+
+class ExprError(Exception):
+    pass
+
+
+@dataclass
+class Issue:
+    path: str
+    line_no: int
+    message: str
+
+    def __str__(self):
+        return f"{self.path}:{self.line_no}: {self.message}"
+
+
+@dataclass
+class Statement:
+    path: str
+    line_no: int
+    op: str
+    args: str
+
+
+@dataclass
+class SimResult:
+    output: List[str] = field(default_factory=list)
+    issues: List[Issue] = field(default_factory=list)
+    virtual_time: float = 0.0
+    steps: int = 0
+    # (selected value, virtual seconds, steps) per IN read
+    selections: List[Tuple[int, float, int]] = field(default_factory=list)
+    stopped: str = ""
+
+
+def strip_comment(line: str) -> str:
+    """Remove a ';' comment that is not inside a quoted string."""
+    in_quote = False
+    for i, ch in enumerate(line):
+        if ch == '"':
+            in_quote = not in_quote
+        elif ch == ';' and not in_quote:
+            return line[:i]
+    return line
+
+
+def split_args(text: str) -> List[str]:
+    """Split on whitespace outside parentheses and quotes."""
+    args = []
+    depth = 0
+    in_quote = False
+    current = ""
+    for ch in text:
+        if ch == '"':
+            in_quote = not in_quote
+        elif not in_quote:
+            if ch == '(':
+                depth += 1
+            elif ch == ')':
+                depth -= 1
+            elif ch.isspace() and depth == 0:
+                if current:
+                    args.append(current)
+                current = ""
+                continue
+        current += ch
+    if current:
+        args.append(current)
+    return args
+
+
+def parse_quoted(text: str) -> Tuple[str, str]:
+    """Split '"text" rest' into (text, rest)."""
+    text = text.strip()
+    if not text.startswith('"'):
+        return "", text
+    end = text.find('"', 1)
+    if end < 0:
+        return text[1:], ""
+    return text[1:end], text[end + 1:].strip()
+
+
+def expression_symbols(expr: str) -> List[str]:
+    """Symbol names referenced by an expression (numbers excluded)."""
+    return IDENT_RE.findall(expr)
+
+
+# --------------------------- Memory ---------------------------
+
+class Memory:
+    """Sparse little-endian byte memory."""
+
+    def __init__(self):
+        self.bytes: Dict[int, int] = {}
+
+    def read(self, address: int, size: int) -> int:
+        value = 0
+        for i in range(size):
+            value |= self.bytes.get(address + i, 0) << (8 * i)
+        return value
+
+    def write(self, address: int, size: int, value: int):
+        for i in range(size):
+            self.bytes[address + i] = (value >> (8 * i)) & 0xFF
+
+    def load_image(self, image_path):
+        """Load '<address> <byte> [<byte> ...]' lines (hex, ';' comments)."""
+        with open(image_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                parts = strip_comment(line).replace(':', ' ').split()
+                if len(parts) < 2:
+                    continue
+                address = int(parts[0], 16)
+                for i, byte in enumerate(parts[1:]):
+                    self.bytes[address + i] = int(byte, 16) & 0xFF
+
+
+# --------------------------- Simulator ---------------------------
+
+class Simulator:
+    """Load .hwtp files, check them statically and run them against Memory."""
+
+    def __init__(self, memory: Optional[Memory] = None, max_steps: int = DEFAULT_MAX_STEPS):
+        self.memory = memory or Memory()
+        self.max_steps = max_steps
+        self.symbols: Dict[str, int] = {}
+        self.var_offsets: Dict[str, int] = {}
+        self.variables: Dict[str, int] = {}
+        self.program: List[Statement] = []
+        self.labels: Dict[str, int] = {}
+        self.issues: List[Issue] = []
+        self._reported = set()
+
+    # ---- loading ----
+
+    def load(self, path):
+        """Load a config or script; definitions are evaluated immediately."""
+        path = str(path)
+        with open(path, 'r', encoding='utf-8') as f:
+            for line_no, raw in enumerate(f, 1):
+                line = raw.strip()
+                if not line or line.startswith(';'):
+                    continue
+                if line.startswith(':'):
+                    label = line[1:].split()[0] if len(line) > 1 else ""
+                    if label in self.labels:
+                        self._issue(path, line_no, f"duplicate label '{label}'")
+                    self.labels[label] = len(self.program)
+                    continue
+
+                parts = line.split(None, 1)
+                op = parts[0]
+                args = parts[1] if len(parts) > 1 else ""
+                if op.lower() in DEFINITION_OPS:
+                    self._define(path, line_no, op.lower(), strip_comment(args))
+                elif op.upper() == "EC":
+                    self.program.append(Statement(path, line_no, "EC", args.strip()))
+                else:
+                    self.program.append(Statement(path, line_no, op.upper(), strip_comment(args).strip()))
+
+    def _define(self, path: str, line_no: int, op: str, args: str):
+        parts = args.split(None, 1)
+        if len(parts) < 2:
+            self._issue(path, line_no, f"malformed definition '{op} {args.strip()}'")
+            return
+        name, expr = parts
+        value = self._eval(expr, path, line_no)
+        if op == "var":
+            # var lines carry an offset for the same name; keep the address
+            self.var_offsets[name] = value
+        else:
+            self.symbols[name] = value
+
+    # ---- static checks ----
+
+    def check(self) -> List[Issue]:
+        """Check every statement, including never-executed paths."""
+        for stmt in self.program:
+            if stmt.op in ("GO", "IF"):
+                target = stmt.args.split()[-1] if stmt.args else ""
+                if target not in self.labels:
+                    self._issue(stmt.path, stmt.line_no, f"undefined label '{target}'")
+            for expr in self._expressions(stmt):
+                for name in expression_symbols(expr):
+                    if name not in self.symbols:
+                        self._issue(stmt.path, stmt.line_no, f"undefined symbol '{name}'")
+        return self.issues
+
+    def _expressions(self, stmt: Statement) -> List[str]:
+        """Expression arguments of a statement (formats and labels excluded)."""
+        op, args = stmt.op, stmt.args
+        if op == "EC":
+            _, rest = parse_quoted(args)
+            if not rest:
+                return []
+            sub = rest.split(None, 1)
+            return self._expressions(Statement(stmt.path, stmt.line_no, sub[0].upper(),
+                                               sub[1] if len(sub) > 1 else ""))
+        parts = split_args(args)
+        if op in ("WO", "CB", "CW"):
+            return parts[1:2] if op == "WO" else parts[:2]
+        if op in ("DB", "DW", "WA"):
+            return parts[:1]
+        if op == "MD":
+            return parts[:2]
+        return []
+
+    # ---- execution ----
+
+    def run(self, inputs: Optional[List[int]] = None) -> SimResult:
+        result = SimResult(issues=self.issues)
+        inputs = list(inputs or [])
+        flags = {"Z": False, "N": False}
+        pc = 0
+        selection = None  # (value, start_time, start_steps)
+
+        while pc < len(self.program):
+            if result.steps >= self.max_steps:
+                stmt = self.program[pc]
+                self._issue(stmt.path, stmt.line_no, f"step limit reached ({self.max_steps})")
+                result.stopped = "step limit"
+                break
+            result.steps += 1
+            stmt = self.program[pc]
+            pc += 1
+            op = stmt.op
+
+            if op == "WO":
+                parts = split_args(stmt.args)
+                if len(parts) < 2 or not parts[0].startswith('#'):
+                    self._issue(stmt.path, stmt.line_no, f"unsupported WO target '{stmt.args}'")
+                    continue
+                value = self._eval(parts[1], stmt.path, stmt.line_no)
+                self.variables[parts[0]] = value
+                flags["Z"] = value == 0
+                flags["N"] = value < 0
+
+            elif op in ("GO", "IF"):
+                parts = stmt.args.split()
+                if op == "IF":
+                    if len(parts) < 3 or parts[1].upper() != "GO":
+                        self._issue(stmt.path, stmt.line_no, f"malformed IF '{stmt.args}'")
+                        continue
+                    condition = parts[0].upper()
+                    if condition not in flags:
+                        self._issue(stmt.path, stmt.line_no, f"unsupported condition '{condition}'")
+                        continue
+                    if not flags[condition]:
+                        continue
+                target = parts[-1] if parts else ""
+                if target not in self.labels:
+                    self._issue(stmt.path, stmt.line_no, f"undefined label '{target}'")
+                    result.stopped = "undefined label"
+                    break
+                pc = self.labels[target]
+
+            elif op == "IN":
+                prompt, rest = parse_quoted(stmt.args)
+                if selection is not None:
+                    value, start_time, start_steps = selection
+                    result.selections.append((value, result.virtual_time - start_time,
+                                              result.steps - start_steps))
+                    selection = None
+                if not inputs:
+                    result.stopped = "input exhausted"
+                    break
+                value = inputs.pop(0)
+                self.variables[rest.split()[0] if rest else "#n"] = value
+                result.output.append(f"{prompt}{value}")
+                selection = (value, result.virtual_time, result.steps)
+
+            elif op == "EC":
+                text, rest = parse_quoted(stmt.args)
+                text = text.replace("%%", "%")
+                if rest:
+                    sub = rest.split(None, 1)
+                    text += self._display(sub[0].upper(), sub[1] if len(sub) > 1 else "", stmt)
+                result.output.append(text)
+
+            elif op in ("DB", "DW", "MD"):
+                result.output.append(self._display(op, stmt.args, stmt))
+
+            elif op in ("CB", "CW"):
+                parts = split_args(stmt.args)
+                if len(parts) < 2:
+                    self._issue(stmt.path, stmt.line_no, f"malformed {op} '{stmt.args}'")
+                    continue
+                address = self._eval(parts[0], stmt.path, stmt.line_no)
+                value = self._eval(parts[1], stmt.path, stmt.line_no)
+                self.memory.write(address, 1 if op == "CB" else WORD_SIZE, value)
+
+            elif op == "WA":
+                result.virtual_time += self._eval(stmt.args or "0", stmt.path, stmt.line_no)
+
+            elif op == "CL":
+                pass
+
+            else:
+                self._issue(stmt.path, stmt.line_no, f"unsupported command '{op}'")
+
+        if selection is not None:
+            value, start_time, start_steps = selection
+            result.selections.append((value, result.virtual_time - start_time,
+                                      result.steps - start_steps))
+        if not result.stopped:
+            result.stopped = "end of script"
+        return result
+
+    def _display(self, op: str, args: str, stmt: Statement) -> str:
+        """Format DB/DW/MD output."""
+        parts = split_args(args)
+        try:
+            if op in ("DB", "DW"):
+                address = self._eval(parts[0], stmt.path, stmt.line_no)
+                fmt = parts[1] if len(parts) > 1 else "%x"
+                return fmt % self.memory.read(address, 1 if op == "DB" else WORD_SIZE)
+            if op == "MD":
+                address = self._eval(parts[0], stmt.path, stmt.line_no)
+                count = self._eval(parts[1], stmt.path, stmt.line_no) if len(parts) > 1 else 1
+                fmt = parts[2] if len(parts) > 2 else "%02x"
+                return " ".join(fmt % self.memory.read(address + i, 1) for i in range(count))
+        except (IndexError, TypeError, ValueError) as e:
+            self._issue(stmt.path, stmt.line_no, f"bad {op} arguments '{args}': {e}")
+            return ""
+        self._issue(stmt.path, stmt.line_no, f"unsupported display command '{op}'")
+        return ""
+
+    # ---- expressions ----
+
+    def _eval(self, expr: str, path: str, line_no: int) -> int:
+        try:
+            tokens = self._tokenize(expr)
+            value, pos = self._parse_sum(tokens, 0, path, line_no)
+            if pos != len(tokens):
+                raise ExprError(f"unexpected '{tokens[pos][1]}'")
+            return value
+        except ExprError as e:
+            self._issue(path, line_no, f"bad expression '{expr.strip()}': {e}")
+            return 0
+
+    def _tokenize(self, expr: str) -> List[Tuple[str, str]]:
+        tokens = []
+        pos = 0
+        expr = expr.rstrip()
+        while pos < len(expr):
+            match = TOKEN_RE.match(expr, pos)
+            if not match or match.end() == pos:
+                raise ExprError(f"cannot parse near '{expr[pos:].strip()}'")
+            tokens.append((match.lastgroup, match.group(match.lastgroup)))
+            pos = match.end()
+        return tokens
+
+    def _parse_sum(self, tokens, pos, path, line_no):
+        value, pos = self._parse_product(tokens, pos, path, line_no)
+        while pos < len(tokens) and tokens[pos][1] in "+-":
+            op = tokens[pos][1]
+            rhs, pos = self._parse_product(tokens, pos + 1, path, line_no)
+            value = value + rhs if op == "+" else value - rhs
+        return value, pos
+
+    def _parse_product(self, tokens, pos, path, line_no):
+        value, pos = self._parse_atom(tokens, pos, path, line_no)
+        while pos < len(tokens) and tokens[pos][1] in "*/":
+            op = tokens[pos][1]
+            rhs, pos = self._parse_atom(tokens, pos + 1, path, line_no)
+            if op == "*":
+                value *= rhs
+            else:
+                value = int(value / rhs) if rhs else 0
+        return value, pos
+
+    def _parse_atom(self, tokens, pos, path, line_no):
+        if pos >= len(tokens):
+            raise ExprError("unexpected end")
+        kind, text = tokens[pos]
+        if kind == "op" and text == "-":
+            value, pos = self._parse_atom(tokens, pos + 1, path, line_no)
+            return -value, pos
+        if kind in ("deref", "op") and text in ("$$$$(", "("):
+            value, pos = self._parse_sum(tokens, pos + 1, path, line_no)
+            if pos >= len(tokens) or tokens[pos][1] != ")":
+                raise ExprError("missing ')'")
+            if kind == "deref":
+                value = self.memory.read(value, DEREF_SIZE)
+            return value, pos + 1
+        if kind == "hex":
+            return int(text, 16), pos + 1
+        if kind == "dec":
+            return int(text[:-1], 10), pos + 1
+        if kind == "bare":
+            return int(text, 16), pos + 1
+        if kind == "var":
+            if text not in self.variables:
+                self._issue(path, line_no, f"undefined variable '{text}'")
+            return self.variables.get(text, 0), pos + 1
+        if kind == "ident":
+            if text not in self.symbols:
+                self._issue(path, line_no, f"undefined symbol '{text}'")
+            return self.symbols.get(text, 0), pos + 1
+        raise ExprError(f"unexpected '{text}'")
+
+    def _issue(self, path: str, line_no: int, message: str):
+        key = (path, line_no, message)
+        if key not in self._reported:
+            self._reported.add(key)
+            self.issues.append(Issue(path, line_no, message))
+
+
+def parse_inputs(spec: str, sim: Simulator) -> List[int]:
+    """'all' -> every TEST_<n> option once, then 0; else comma-separated decimals."""
+    if not spec:
+        return []
+    if spec == "all":
+        options = sorted(int(label[5:]) for label in sim.labels if re.fullmatch(r"TEST_\d+", label))
+        return options + [0]
+    return [int(v, 10) for v in spec.split(",") if v.strip()]
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Simulate generated ISODiag configs and test menus.")
+    ap.add_argument("files", nargs="+", help="Config and script files (.hwtp), loaded in order")
+    ap.add_argument("--inputs", "-i", default="all",
+                    help="Menu inputs: 'all' (every test once, then 0) or e.g. '3,5,0' (default: all)")
+    ap.add_argument("--image", help="Sparse memory image: '<address> <byte> ...' lines (hex)")
+    ap.add_argument("--max-steps", type=int, default=DEFAULT_MAX_STEPS, help="Abort after this many statements")
+    ap.add_argument("--log", help="Write the simulated console output to this file")
+    ap.add_argument("--quiet", "-q", action="store_true", help="Do not print the console output")
+    args = ap.parse_args()
+
+    memory = Memory()
+    if args.image:
+        memory.load_image(args.image)
+
+    sim = Simulator(memory, max_steps=args.max_steps)
+    for path in args.files:
+        if not Path(path).exists():
+            print(f"[ERROR] Not found: {path}")
+            return 1
+        sim.load(path)
+
+    print(f"[INFO] Loaded {len(sim.symbols)} symbols, {len(sim.program)} statements, {len(sim.labels)} labels")
+    sim.check()
+    result = sim.run(parse_inputs(args.inputs, sim))
+
+    if not args.quiet:
+        for line in result.output:
+            print(line)
+    if args.log:
+        with open(args.log, 'w', encoding='utf-8') as f:
+            f.write("\n".join(result.output) + "\n")
+
+    print(f"[INFO] Stopped: {result.stopped} after {result.steps} steps, "
+          f"virtual time {result.virtual_time:g} s")
+    for value, seconds, steps in result.selections:
+        print(f"  - selection {value}: {seconds:g} s ({steps} steps)")
+
+    for issue in result.issues:
+        print(f"[ERROR] {issue}")
+    if result.issues:
+        print(f"[ERROR] {len(result.issues)} issue(s) found")
+        return 1
+    print("[OK] No issues found")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
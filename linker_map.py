@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+linker_map.py
+-------------
+Linker map file index and the --map cross-check of the config generator.
+
+The Master sheet's absolute addresses are copied by hand from the linker
+map; this catches stale ones at generation time. The map is read line by
+line (never loaded whole) into
+  - a sorted address index (typed array) with the symbol names in the
+    same order, searched by bisection, and
+  - a name index (symbol name -> address(es)).
+
+Supported map formats:
+  GNU ld      symbol lines of the memory map:  "  0x80001000   main_c_Foo_u32"
+  TASKING     rows of the "Symbols (sorted on name/address)" tables:
+              "| main_c_Foo_u32 | 0x80001000 | ..."
+
+Cross-check (cross_check()):
+  master     every Master sheet address against the map address of the
+             same name; names missing from the map are reported too
+  resolved   symbols whose address follows from the config alone
+             (<base> + <off> chains down to a Master address) against the
+             map, when the map knows the name
+Every reported address is located in the map by one bulk bisection pass
+(the map symbol at or below it, e.g. "main_c_Buf_au8+0x4").
+
+Usage:
+  python GenSymb_ConfigVRG.py input.xlsx --multi --map firmware.map
+  python vrg_gen.py all input.xlsx --out-dir out --map firmware.map
+  python linker_map.py firmware.map main_c_SymMaster_u32 0x80001000
+"""
+
+import argparse
+import re
+import sys
+from array import array
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+# GNU ld: "<spaces>0x<address><spaces><symbol>" (assignments like ". = ALIGN" or "_end = ." excluded)
+GNU_SYMBOL_RE = re.compile(r"^\s+0x([0-9A-Fa-f]+)\s+([A-Za-z_.$][\w.$]*)\s*$")
+# TASKING: "***** Symbols (sorted on name) *****" starts a symbol table, any other "*" heading ends it
+TASKING_HEADING_RE = re.compile(r"^\*+\s+(.*?)\s+\*+\s*$")
+HEX_CELL_RE = re.compile(r"^0x[0-9A-Fa-f]+$")
+NAME_CELL_RE = re.compile(r"^[A-Za-z_.$][\w.$@]*$")
+
+# Mismatches printed by print_map_report() (all of them are in the report)
+MAX_REPORTED = 50
+
+
+class LinkerMap:
+    """Symbols of one linker map: sorted address index + name index."""
+
+    def __init__(self, path: str = "", map_format: str = "gnu"):
+        self.path = path
+        self.format = map_format
+        self.addresses = array("Q")        # sorted
+        self.names: List[str] = []         # names[i] is at addresses[i]
+        self.by_name: Dict[str, List[int]] = {}
+
+    @classmethod
+    def from_pairs(cls, pairs: Iterable[Tuple[str, int]], path: str = "", map_format: str = "gnu") -> "LinkerMap":
+        link_map = cls(path, map_format)
+        unique = sorted({(address, name) for name, address in pairs})
+        link_map.addresses = array("Q", (address for address, _ in unique))
+        link_map.names = [name for _, name in unique]
+        for address, name in unique:
+            link_map.by_name.setdefault(name, []).append(address)
+        return link_map
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def address_of(self, name: str) -> Optional[List[int]]:
+        """Map address(es) of `name` (several for same-named static symbols), None if unknown."""
+        return self.by_name.get(name)
+
+    def symbol_at(self, address: int) -> Optional[Tuple[str, int]]:
+        """(name, distance) of the map symbol at or below `address`, None below the first one."""
+        i = bisect_right(self.addresses, address) - 1
+        if i < 0:
+            return None
+        return self.names[i], address - self.addresses[i]
+
+    def locate_many(self, addresses: Iterable[int]) -> Dict[int, Optional[Tuple[str, int]]]:
+        """symbol_at() for many addresses: sorted once, each bisection starts where the last ended."""
+        located: Dict[int, Optional[Tuple[str, int]]] = {}
+        lo = 0
+        for address in sorted(set(addresses)):
+            lo = bisect_right(self.addresses, address, lo)
+            located[address] = (self.names[lo - 1], address - self.addresses[lo - 1]) if lo else None
+        return located
+
+
+def parse_map(path: str) -> LinkerMap:
+    """Read a GNU ld or TASKING map file line by line."""
+    pairs: List[Tuple[str, int]] = []
+    tasking = in_symbols = False
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        for line in f:
+            if line.startswith("*"):
+                heading = TASKING_HEADING_RE.match(line)
+                if heading:
+                    in_symbols = heading.group(1).lower().startswith("symbols")
+                    tasking = tasking or in_symbols
+                continue
+            if in_symbols:
+                if line.startswith("|"):
+                    symbol = tasking_symbol(line)
+                    if symbol:
+                        pairs.append(symbol)
+                continue
+            match = GNU_SYMBOL_RE.match(line)
+            if match:
+                pairs.append((match.group(2), int(match.group(1), 16)))
+    return LinkerMap.from_pairs(pairs, path, "tasking" if tasking else "gnu")
+
+
+def tasking_symbol(row: str) -> Optional[Tuple[str, int]]:
+    """(name, address) of a TASKING symbol table row; columns may come in either order."""
+    name = address = None
+    for cell in row.strip().strip("|").split("|"):
+        cell = cell.strip()
+        if address is None and HEX_CELL_RE.match(cell):
+            address = int(cell, 16)
+        elif name is None and NAME_CELL_RE.match(cell):
+            name = cell
+    if name is None or address is None:
+        return None
+    return name, address
+
+
+# ----- Cross-check -----
+
+@dataclass
+class MapMismatch:
+    symbol: str
+    source: str                        # "master" (Master sheet) or "resolved" (base + offset chain)
+    config_address: int
+    map_addresses: Optional[List[int]] = None   # None: the name is not in the map
+    located: str = ""                  # map symbol at the config address, e.g. "foo+0x4"
+
+    def describe(self) -> str:
+        at = f" (map: {self.located})" if self.located else ""
+        if self.map_addresses is None:
+            return f"{self.symbol}: 0x{self.config_address:X} not in map{at}"
+        expected = ", ".join(f"0x{a:X}" for a in self.map_addresses)
+        return f"{self.symbol}: config 0x{self.config_address:X}, map {expected}{at}"
+
+
+@dataclass
+class MapCheckReport:
+    map_path: str
+    map_format: str
+    map_symbols: int
+    checked: int = 0
+    matched: int = 0
+    not_in_map: int = 0                # resolved symbols the map does not name (not errors)
+    mismatches: List[MapMismatch] = field(default_factory=list)
+
+
+def cross_check(link_map: LinkerMap, master: Dict[str, int],
+                resolved: Iterable[Tuple[str, int]] = ()) -> MapCheckReport:
+    """
+    master:   Master sheet symbol -> address; a missing name is a mismatch.
+    resolved: (symbol, address) computed from the config; checked when the map knows the name.
+    """
+    report = MapCheckReport(link_map.path, link_map.format, len(link_map))
+    checks = [(name, address, "master") for name, address in master.items()]
+    checks += [(name, address, "resolved") for name, address in resolved if name not in master]
+    for name, address, source in checks:
+        map_addresses = link_map.address_of(name)
+        if map_addresses is None and source == "resolved":
+            report.not_in_map += 1
+            continue
+        report.checked += 1
+        if map_addresses is not None and address in map_addresses:
+            report.matched += 1
+        else:
+            report.mismatches.append(MapMismatch(name, source, address, map_addresses))
+
+    located = link_map.locate_many(m.config_address for m in report.mismatches)
+    for mismatch in report.mismatches:
+        at = located.get(mismatch.config_address)
+        if at:
+            mismatch.located = at[0] if not at[1] else f"{at[0]}+0x{at[1]:X}"
+    return report
+
+
+def print_map_report(report: MapCheckReport, limit: int = MAX_REPORTED):
+    print(f"[INFO] Linker map {report.map_path} ({report.map_format}): {report.map_symbols} symbols")
+    for mismatch in report.mismatches[:limit]:
+        print(f"[WARN] Map mismatch [{mismatch.source}] {mismatch.describe()}")
+    if len(report.mismatches) > limit:
+        print(f"[WARN] ... {len(report.mismatches) - limit} more")
+    if report.mismatches:
+        print(f"[WARN] {len(report.mismatches)} of {report.checked} checked address(es) do not match the map")
+    else:
+        print(f"[OK] {report.checked} address(es) match the map")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Look up symbols / addresses in a linker map (GNU ld, TASKING).")
+    ap.add_argument("map", help="Linker map file")
+    ap.add_argument("queries", nargs="*", help="Symbol names or 0x addresses")
+    args = ap.parse_args()
+
+    link_map = parse_map(args.map)
+    print(f"[INFO] {args.map} ({link_map.format}): {len(link_map)} symbols")
+    for query in args.queries:
+        if HEX_CELL_RE.match(query):
+            at = link_map.symbol_at(int(query, 16))
+            print(f"{query}: {at[0]}+0x{at[1]:X}" if at else f"{query}: below the first map symbol")
+        else:
+            addresses = link_map.address_of(query)
+            print(f"{query}: {', '.join(f'0x{a:X}' for a in addresses)}" if addresses else f"{query}: not in map")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+symbol_db.py
+------------
+Indexed SQLite database of every emitted symbol, and a small query CLI.
+
+One row per symbol definition (wo32/wo16/by/var) with:
+  name, op, size, base, offset, radix, indirect ($$$$() deref), sheet,
+  variant (NULL = common to all variants), parent (multi-word symbols),
+  chain (resolved base references up to an absolute address) and depth.
+
+Indexes on name, base and (variant, name), so questions like "which
+symbols sit under main_c_SymtabStd_u32" or "where is CAN_01_Tx00 in
+variant MAN" are index lookups instead of grepping .hwtp files.
+
+The database is written by config_emitters.py (format "db"):
+  python config_emitters.py workbook.xlsx --formats db --out-dir out/
+  python vrg_gen.py all workbook.xlsx --formats db
+
+Usage:
+  python symbol_db.py out/config.db find CAN_01_Tx00 --variant MAN
+  python symbol_db.py out/config.db under main_c_SymtabStd_u32
+  python symbol_db.py out/config.db stats
+"""
+
+import argparse
+import os
+import sqlite3
+from typing import Dict, List, Optional, Tuple
+
+from config_emitters import ParsedConfig, SymbolRecord
+
+
+SCHEMA = """
+CREATE TABLE meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE symbols (
+    id         INTEGER PRIMARY KEY,
+    name       TEXT NOT NULL,
+    op         TEXT NOT NULL,
+    size       INTEGER,
+    base       TEXT,
+    offset     INTEGER,
+    radix      TEXT,
+    indirect   INTEGER NOT NULL,
+    sheet      TEXT NOT NULL,
+    variant    TEXT,
+    parent     TEXT,
+    chain      TEXT,
+    depth      INTEGER,
+    expression TEXT
+);
+"""
+
+# Created after the bulk insert (faster than maintaining them row by row)
+INDEXES = """
+CREATE INDEX idx_symbols_name ON symbols(name);
+CREATE INDEX idx_symbols_base ON symbols(base);
+CREATE INDEX idx_symbols_variant ON symbols(variant, name);
+"""
+
+COLUMNS = ("name", "op", "size", "base", "offset", "radix", "indirect", "sheet",
+           "variant", "parent", "chain", "depth", "expression")
+
+MAX_CHAIN_DEPTH = 32
+
+
+# --------------------------- Build ---------------------------
+
+def resolve_chains(records: List[SymbolRecord]) -> List[Tuple[str, int]]:
+    """
+    For every record, the chain of base references down to an absolute
+    address ("base > base-of-base > ..."), resolved within the record's
+    variant plus the common sections, and its depth.
+    """
+    # (variant, name) -> base; later definitions win, as in ISODiag
+    bases: Dict[Tuple[Optional[str], str], Optional[str]] = {}
+    for record in records:
+        if record.op != "var":
+            bases[(record.variant, record.symbol)] = record.base
+
+    def lookup(variant: Optional[str], name: str):
+        key = (variant, name)
+        if key in bases:
+            return True, bases[key]
+        key = (None, name)
+        if key in bases:
+            return True, bases[key]
+        return False, None
+
+    chains = []
+    for record in records:
+        chain: List[str] = []
+        seen = {record.symbol}
+        base = record.base
+        while base is not None and base not in seen and len(chain) < MAX_CHAIN_DEPTH:
+            chain.append(base)
+            seen.add(base)
+            found, base = lookup(record.variant, base)
+            if not found:
+                chain.append("?")  # undefined reference
+                break
+        chains.append((" > ".join(chain), len(chain)))
+    return chains
+
+
+def write_symbol_db(parsed: ParsedConfig, path: str) -> int:
+    """Write the SQLite database for one parsed workbook. Returns the row count."""
+    tmp_path = path + ".tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    conn = sqlite3.connect(tmp_path)
+    try:
+        conn.execute("PRAGMA journal_mode=OFF")
+        conn.execute("PRAGMA synchronous=OFF")
+        conn.executescript(SCHEMA)
+
+        rows = [
+            (r.symbol, r.op, r.size, r.base, r.offset, r.radix, int(r.indirect), r.section,
+             r.variant, r.parent, chain, depth, r.expression)
+            for r, (chain, depth) in zip(parsed.records, resolve_chains(parsed.records))
+        ]
+        with conn:
+            conn.executemany(
+                f"INSERT INTO symbols ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})",
+                rows)
+            conn.executemany("INSERT INTO meta (key, value) VALUES (?, ?)", [
+                ("workbook", os.path.basename(parsed.workbook)),
+                ("variants", ",".join(parsed.variants)),
+                ("sections", str(len(parsed.sections))),
+            ])
+        conn.executescript(INDEXES)
+        conn.execute("ANALYZE")
+    finally:
+        conn.close()
+
+    os.replace(tmp_path, path)
+    return len(rows)
+
+
+# --------------------------- Query ---------------------------
+
+class SymbolDB:
+    """Read-only queries on a symbol database."""
+
+    def __init__(self, path):
+        self.conn = sqlite3.connect(f"file:{os.path.abspath(path)}?mode=ro", uri=True)
+        self.conn.row_factory = sqlite3.Row
+
+    def _query(self, where: str, params: tuple, variant: Optional[str]) -> List[dict]:
+        sql = f"SELECT {', '.join(COLUMNS)} FROM symbols WHERE {where}"
+        if variant is not None:
+            # A variant sees its own sections plus the common ones
+            sql += " AND (variant = ? OR variant IS NULL)"
+            params += (variant,)
+        sql += " ORDER BY id"
+        return [dict(row) for row in self.conn.execute(sql, params)]
+
+    def find(self, name: str, variant: Optional[str] = None) -> List[dict]:
+        """Every definition of `name` (in `variant`, if given)."""
+        return self._query("name = ?", (name,), variant)
+
+    def under(self, base: str, variant: Optional[str] = None) -> List[dict]:
+        """Symbols whose base reference is `base`."""
+        return self._query("base = ?", (base,), variant)
+
+    def stats(self) -> dict:
+        meta = dict(self.conn.execute("SELECT key, value FROM meta"))
+        per_variant = {row[0] or "(common)": row[1] for row in self.conn.execute(
+            "SELECT variant, COUNT(*) FROM symbols GROUP BY variant ORDER BY variant")}
+        return {"meta": meta, "symbols": sum(per_variant.values()), "per_variant": per_variant}
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def format_row(row: dict) -> str:
+    offset = "" if row["offset"] is None else (
+        f"0x{row['offset']:X}" if row["radix"] == "hex" else f"{row['offset']}.")
+    where = f"{row['base']} + {offset}" if row["base"] else offset
+    if row["indirect"]:
+        where = f"$$$$({where})"
+    variant = row["variant"] or "common"
+    chain = f"  [{row['chain']}]" if row["chain"] else ""
+    return f"{row['op']:<4} {row['name']:<28} {where:<40} {row['size']} B  {row['sheet']} ({variant}){chain}"
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Query a symbol database written by config_emitters.py.")
+    ap.add_argument("db", help="Symbol database (.db)")
+    sub = ap.add_subparsers(dest="command", required=True)
+    p_find = sub.add_parser("find", help="Definitions of a symbol")
+    p_find.add_argument("name")
+    p_find.add_argument("--variant", help="Only this variant (plus common sections)")
+    p_under = sub.add_parser("under", help="Symbols referencing a base symbol")
+    p_under.add_argument("base")
+    p_under.add_argument("--variant", help="Only this variant (plus common sections)")
+    sub.add_parser("stats", help="Symbol counts per variant")
+    args = ap.parse_args()
+
+    if not os.path.exists(args.db):
+        print(f"[ERROR] Not found: {args.db}")
+        return 1
+
+    with SymbolDB(args.db) as db:
+        if args.command == "stats":
+            stats = db.stats()
+            print(f"[INFO] {stats['meta'].get('workbook', '?')}: {stats['symbols']} symbols")
+            for variant, count in stats["per_variant"].items():
+                print(f"  - {variant}: {count}")
+            return 0
+
+        rows = db.find(args.name, args.variant) if args.command == "find" else db.under(args.base, args.variant)
+        if not rows:
+            print("[INFO] No matching symbols")
+            return 1
+        for row in rows:
+            print(format_row(row))
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
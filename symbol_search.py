@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+symbol_search.py
+----------------
+Instant symbol search over a generated master config, backed by a
+trigram index.
+
+The index is built once from the master config (every wo32/wo16/by/var
+definition of every variant) and cached next to it as <config>.symidx
+(plain JSON data, never executed, so a shared output folder is safe);
+the cache is rebuilt automatically when the config changes. Each entry
+keeps its definition line, line number, sheet (section), variant and
+hardware test group.
+
+- substring queries take the posting list of the query's rarest trigram
+  and verify only those candidates
+- fuzzy queries rank symbols by trigram similarity, so typos and
+  reordered parts ("RxBuf SPI_01") still find the symbol
+
+Usage:
+  index = SymbolIndex.load("out/config.hwtp")
+  for hit in index.search("can_rx", variant="DZC"):
+      print(hit.symbol, hit.sheet, hit.line_no)
+
+  python vrg_gen.py search out/config.hwtp CAN_01
+  python vrg_gen.py search out/ "spi rxbuf" --fuzzy --variant MAN
+"""
+
+import heapq
+import json
+import os
+from array import array
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from GenSymb_ConfigVRG import DEFINITION_RE, extract_suffix_from_section_header
+from generate_test_menu_v4 import classify_symbol
+
+
+INDEX_VERSION = 2
+CACHE_SUFFIX = ".symidx"
+
+
+def trigrams(text: str) -> List[str]:
+    return [text[i:i + 3] for i in range(len(text) - 2)]
+
+
+@dataclass
+class SymbolHit:
+    symbol: str
+    op: str
+    definition: str
+    line_no: int             # 1-based line in the master config
+    sheet: str
+    variant: Optional[str]   # None = common to all variants
+    group: Optional[str]     # hardware test group ('spi:SPI_01'), if any
+    score: float
+
+
+class SymbolIndex:
+    """Trigram index over the symbol definitions of one master config."""
+
+    def __init__(self, source: str, key: Tuple[int, int], entries: List[tuple],
+                 names: List[str], name_entries: List[array], postings: Dict[str, array]):
+        self.source = source
+        self.key = key                    # (size, mtime_ns) of the source config
+        # entry: (symbol, op, definition line, line_no, sheet, variant, group)
+        self.entries = entries
+        # The same symbol usually exists in every variant: grams are indexed
+        # per unique lower-case name, each name lists its entries
+        self.names = names
+        self.name_entries = name_entries
+        self.postings = postings          # trigram -> sorted name ids
+
+    # --------------------------- Build / cache ---------------------------
+
+    @staticmethod
+    def source_key(config_path) -> Tuple[int, int]:
+        stat = os.stat(config_path)
+        return stat.st_size, stat.st_mtime_ns
+
+    @classmethod
+    def build(cls, config_path) -> "SymbolIndex":
+        """Scan the master config once and index every definition."""
+        entries = []
+        name_ids: Dict[str, int] = {}
+        name_entries: List[List[int]] = []
+        postings: Dict[str, List[int]] = {}
+        sheet, variant = "", None
+        with open(config_path, "r", encoding="utf-8", errors="replace") as f:
+            for line_no, line in enumerate(f, 1):
+                line = line.rstrip("\r\n")
+                if line.startswith(";="):
+                    sheet = line.strip(";= ")
+                    variant = extract_suffix_from_section_header(line)
+                    continue
+                match = DEFINITION_RE.match(line)
+                if not match:
+                    continue
+                symbol = match.group(2)
+                name = symbol.lower()
+                name_id = name_ids.get(name)
+                if name_id is None:
+                    name_id = name_ids[name] = len(name_entries)
+                    name_entries.append([])
+                    for gram in set(trigrams(name)):
+                        postings.setdefault(gram, []).append(name_id)
+                name_entries[name_id].append(len(entries))
+                entries.append((symbol, match.group(1), line, line_no, sheet, variant, classify_symbol(symbol)))
+
+        return cls(str(config_path), cls.source_key(config_path), entries, list(name_ids),
+                   [array("i", ids) for ids in name_entries],
+                   {gram: array("i", ids) for gram, ids in postings.items()})
+
+    @staticmethod
+    def cache_path_for(config_path) -> Path:
+        path = Path(config_path)
+        return path.with_suffix(CACHE_SUFFIX)
+
+    def save(self, cache_path) -> None:
+        tmp_path = f"{cache_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "version": INDEX_VERSION,
+                "source": self.source,
+                "key": list(self.key),
+                "entries": self.entries,
+                "names": self.names,
+                "name_entries": [ids.tolist() for ids in self.name_entries],
+                "postings": {gram: ids.tolist() for gram, ids in self.postings.items()},
+            }, f, separators=(",", ":"))
+        os.replace(tmp_path, cache_path)
+
+    @classmethod
+    def from_cache(cls, data: dict) -> "SymbolIndex":
+        return cls(data["source"], tuple(data["key"]), [tuple(entry) for entry in data["entries"]],
+                   data["names"], [array("i", ids) for ids in data["name_entries"]],
+                   {gram: array("i", ids) for gram, ids in data["postings"].items()})
+
+    @classmethod
+    def load(cls, config_path, use_cache: bool = True) -> "SymbolIndex":
+        """Load the cached index if it matches the config, else build (and cache) it."""
+        cache_path = cls.cache_path_for(config_path)
+        key = cls.source_key(config_path)
+        if use_cache and cache_path.exists():
+            try:
+                with open(cache_path, "r", encoding="utf-8") as f:
+                    cached = json.load(f)
+                if cached.get("version") == INDEX_VERSION and tuple(cached["key"]) == key:
+                    return cls.from_cache(cached)
+            except (OSError, ValueError, KeyError, TypeError, AttributeError):
+                pass  # stale, damaged or older-format cache: rebuild
+
+        index = cls.build(config_path)
+        if use_cache:
+            try:
+                index.save(cache_path)
+            except OSError:
+                pass  # read-only output folder: search still works
+        return index
+
+    # --------------------------- Search ---------------------------
+
+    def substring_names(self, query: str) -> List[int]:
+        """Name ids whose symbol contains `query` (lower-case)."""
+        names = self.names
+        grams = set(trigrams(query))
+        if not grams:
+            # 1-2 characters: no trigram to look up, plain scan
+            return [i for i, name in enumerate(names) if query in name]
+
+        # The rarest trigram bounds the candidates; verifying them with a
+        # C-level substring test is cheaper than intersecting long lists
+        rarest = min((self.postings.get(gram, ()) for gram in grams), key=len)
+        return [i for i in rarest if query in names[i]]
+
+    def fuzzy_names(self, query: str) -> Dict[int, float]:
+        """Name ids sharing at least half of the query's trigrams -> similarity (0..1)."""
+        # Words of the query are matched independently ("spi rxbuf")
+        words = query.split()
+        grams = set()
+        for word in words if len(words) > 1 else [query]:
+            grams.update(trigrams(word))
+        if not grams:
+            return {}
+
+        shared = Counter()
+        for gram in grams:
+            shared.update(self.postings.get(gram, ()))
+        minimum = max(1, (len(grams) + 1) // 2)
+        scores = {}
+        for i, count in shared.items():
+            if count >= minimum:
+                coverage = count / len(grams)
+                jaccard = count / (len(grams) + max(1, len(self.names[i]) - 2) - count)
+                scores[i] = 0.7 * coverage + 0.3 * jaccard
+        return scores
+
+    def search(self, query: str, fuzzy: bool = False, variant: Optional[str] = None,
+               limit: int = 50) -> List[SymbolHit]:
+        """
+        Substring search (exact > prefix > substring, shorter names first);
+        with fuzzy=True, symbols sharing enough trigrams with the query are
+        ranked by similarity after the substring matches.
+        """
+        query = query.strip().lower()
+        if not query:
+            return []
+
+        scored: Dict[int, float] = {}
+        for i in self.substring_names(query):
+            name = self.names[i]
+            scored[i] = 1.0 if name == query else (0.9 if name.startswith(query) else 0.8)
+        if fuzzy:
+            for i, similarity in self.fuzzy_names(query).items():
+                if i not in scored:
+                    # Always below a real substring match
+                    scored[i] = 0.75 * similarity
+
+        def rank(item):
+            return -item[1], len(self.names[item[0]]), item[0]
+
+        # Rank only as many names as needed; the variant filter may skip
+        # some, in which case everything is ranked
+        wanted = limit * 4
+        ranked = heapq.nsmallest(wanted, scored.items(), key=rank)
+        hits = self._expand(ranked, variant, limit)
+        if len(hits) < limit and len(scored) > wanted:
+            hits = self._expand(sorted(scored.items(), key=rank), variant, limit)
+        return hits
+
+    def _expand(self, ranked, variant: Optional[str], limit: int) -> List[SymbolHit]:
+        """Turn ranked (name id, score) pairs into hits, one per definition."""
+        hits: List[SymbolHit] = []
+        for name_id, score in ranked:
+            for entry_id in self.name_entries[name_id]:
+                symbol, op, definition, line_no, sheet, entry_variant, group = self.entries[entry_id]
+                # A variant sees its own sections plus the common ones
+                if variant is not None and entry_variant not in (None, variant):
+                    continue
+                hits.append(SymbolHit(symbol, op, definition, line_no, sheet, entry_variant,
+                                      group, round(score, 3)))
+                if len(hits) >= limit:
+                    return hits
+        return hits
+
+    def __len__(self) -> int:
+        return len(self.entries)
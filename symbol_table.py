@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+symbol_table.py
+---------------
+Static addresses of the config generator's symbols (Context.symbols),
+for the --map linker map cross-check.
+
+Context.defined_symbols (a set) still answers "is this name defined?".
+This table only holds the symbols whose address follows from the
+workbook alone: the Master symbol and the <base> + <offset> definitions
+(no $$$$() dereference) whose base is itself in the table. Symbols
+reached through a pointer are never stored.
+
+Each stored symbol gets an integer ID; the names are kept in ID order
+(ID -> name) next to a name -> ID dict, and the addresses in a typed
+column indexed by ID. A later definition of a name replaces its address,
+or removes it (forget()) when the new definition is not static.
+
+Usage:
+  table = SymbolTable()
+  table.locate("main_c_SymMaster_u32", 0x80001000)
+  table.locate("main_c_Foo_u32", table.address_of("main_c_SymMaster_u32") + 0x10)
+  dict(table.absolute_addresses())    # {"main_c_SymMaster_u32": ..., "main_c_Foo_u32": ...}
+"""
+
+from array import array
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+NO_ID = -1             # what id_of() returns for a name that is not in the table
+MAX_ADDRESS = (1 << 64) - 1
+
+
+class SymbolTable:
+    """Statically placed symbol name -> integer ID, with the addresses in a typed column."""
+
+    def __init__(self):
+        self.names: List[str] = []           # ID -> name
+        self._ids: Dict[str, int] = {}       # name -> ID
+        self.addresses = array("Q")          # ID -> address
+        self._located = bytearray()          # ID -> 0 once forgotten
+        self._count = 0
+
+    def locate(self, name: str, address: int) -> int:
+        """Store (or move) `name` at `address`; returns its ID, NO_ID for an impossible address."""
+        if not 0 <= address <= MAX_ADDRESS:
+            self.forget(name)
+            return NO_ID
+        sid = self._ids.get(name)
+        if sid is None:
+            sid = self._ids[name] = len(self.names)
+            self.names.append(name)
+            self.addresses.append(address)
+            self._located.append(1)
+            self._count += 1
+            return sid
+        self.addresses[sid] = address
+        if not self._located[sid]:
+            self._located[sid] = 1
+            self._count += 1
+        return sid
+
+    def forget(self, name: str):
+        """`name` was redefined through a pointer (or on an unplaced base): no static address any more."""
+        sid = self._ids.get(name)
+        if sid is not None and self._located[sid]:
+            self._located[sid] = 0
+            self._count -= 1
+
+    def id_of(self, name: str) -> int:
+        sid = self._ids.get(name, NO_ID)
+        return sid if sid != NO_ID and self._located[sid] else NO_ID
+
+    def address_of(self, name: str) -> Optional[int]:
+        sid = self._ids.get(name)
+        if sid is None or not self._located[sid]:
+            return None
+        return self.addresses[sid]
+
+    def absolute_addresses(self) -> Iterator[Tuple[str, int]]:
+        """(name, address) of every stored symbol, in order of first definition."""
+        for sid, name in enumerate(self.names):
+            if self._located[sid]:
+                yield name, self.addresses[sid]
+
+    def describe(self, sid: int) -> dict:
+        return {"name": self.names[sid], "address": self.addresses[sid], "located": bool(self._located[sid])}
+
+    def __contains__(self, name: str) -> bool:
+        return self.id_of(name) != NO_ID
+
+    def __len__(self) -> int:
+        return self._count
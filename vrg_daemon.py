@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+vrg_daemon.py
+-------------
+Warm generation daemon with a local HTTP API, plus a thin client.
+
+Every CLI run of GenSymb_ConfigVRG.py pays Python startup plus the
+pandas/openpyxl import. The daemon pays it once:
+- worker processes are started and warmed up (generators imported) at startup
+- each worker keeps a small cache of decoded workbooks, keyed by
+  (path, size, mtime), so regenerating an unchanged workbook skips Excel;
+  requests are routed by workbook path, so the same workbook always lands
+  on the worker that holds its cache
+- requests are served concurrently (threaded HTTP server + worker processes)
+
+Access: the server only binds to localhost, and every request must
+  - carry the per-daemon token (X-VRG-Token header); serve() writes it to a
+    file only the current user can read (--token-file, default
+    ~/.vrg_daemon_<port>.token) and call() reads it from there
+  - name the daemon in its Host header (127.0.0.1:<port> / localhost:<port>)
+  - be application/json (POST)
+so a web page in the local browser can neither trigger a generation nor
+stop the daemon.
+
+API (JSON):
+  GET  /status     -> {"pid", "uptime", "requests", "workers"}
+  POST /generate   {"workbook": "...xlsx", "output_dir": "...",
+                    "variants": ["DZC"], "outputs": ["configs", "tests"],
+                    "subroutines": false, "formats": ["h", "json"]}
+                                                  -> vrg_gen.generate_all() summary
+                                                     + decode/request timings
+  POST /shutdown   -> stops the daemon
+
+The client does not import pandas or the generators, so it starts
+instantly.
+
+Usage:
+  python vrg_daemon.py serve --port 8765 --workers 4
+  python vrg_daemon.py client workbook.xlsx --out-dir out --variants DZC,MAN
+  python vrg_daemon.py status
+  python vrg_daemon.py stop
+"""
+
+import argparse
+import hmac
+import json
+import os
+import secrets
+import sys
+import threading
+import time
+import zlib
+import urllib.error
+import urllib.request
+from collections import OrderedDict
+from typing import Optional
+
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+CACHE_SIZE = 8
+TOKEN_HEADER = "X-VRG-Token"
+
+
+# --------------------------- Worker side ---------------------------
+
+# Per worker process: (path, size, mtime_ns) -> (master config text,
+# SymbolRecords per section or None if no request asked for --formats yet)
+_workbook_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+
+
+def warm_up() -> int:
+    """Import the generators (and pandas) in a worker process."""
+    import vrg_gen  # noqa: F401
+    return os.getpid()
+
+
+def handle_generate(request: dict) -> dict:
+    """Run one generation request inside a warm worker process."""
+    import GenSymb_ConfigVRG as genconf
+    import vrg_gen
+
+    workbook = os.path.abspath(request["workbook"])
+    stat = os.stat(workbook)
+    key = (workbook, stat.st_size, stat.st_mtime_ns)
+
+    formats = request.get("formats") or ()
+    entry = _workbook_cache.get(key)
+    cached = entry is not None and (entry[1] is not None or not formats)
+    t0 = time.perf_counter()
+    if cached:
+        _workbook_cache.move_to_end(key)
+        combined_text, records = entry
+    else:
+        ctx = genconf.Context(records={} if formats else None)
+        combined_text, _ = genconf.generate_from_excel(workbook, ctx=ctx)
+        records = ctx.records
+        _workbook_cache[key] = (combined_text, records)
+        _workbook_cache.move_to_end(key)
+        while len(_workbook_cache) > CACHE_SIZE:
+            _workbook_cache.popitem(last=False)
+    decode_seconds = time.perf_counter() - t0
+
+    output_dir = request.get("output_dir") or os.path.dirname(workbook)
+    summary = vrg_gen.generate_all(
+        workbook, output_dir,
+        base_name=request.get("base_name", "config"),
+        subroutines=bool(request.get("subroutines", False)),
+        variants=request.get("variants"),
+        outputs=tuple(request.get("outputs") or vrg_gen.ALL_OUTPUTS),
+        combined_text=combined_text,
+        records=records,
+        formats=formats,
+    )
+    # generate_all() got the decoded text, so its total_seconds leaves the decode out
+    summary["generate_seconds"] = summary.pop("total_seconds")
+    summary["decode_seconds"] = 0.0 if cached else round(decode_seconds, 3)
+    summary["cached"] = cached
+    summary["worker"] = os.getpid()
+    return summary
+
+
+# --------------------------- Token ---------------------------
+
+def default_token_file(port: int = DEFAULT_PORT) -> str:
+    return os.path.join(os.path.expanduser("~"), f".vrg_daemon_{port}.token")
+
+
+def write_token_file(path: str) -> str:
+    """Create a fresh token in a file readable by the current user only."""
+    token = secrets.token_urlsafe(32)
+    if os.path.exists(path):
+        os.remove(path)   # O_CREAT keeps the mode of an existing file
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(token)
+    return token
+
+
+def read_token_file(path: str) -> str:
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read().strip()
+
+
+# --------------------------- Server ---------------------------
+
+def serve(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, workers: Optional[int] = None,
+          token_file: Optional[str] = None):
+    """Run the daemon until /shutdown or Ctrl+C."""
+    from concurrent.futures import ProcessPoolExecutor
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    worker_count = workers or os.cpu_count() or 1
+    # One single-process pool per worker: a workbook always goes to the same
+    # worker (see route()), so its decoded text is cached exactly once
+    pools = [ProcessPoolExecutor(max_workers=1) for _ in range(worker_count)]
+    # Warm every worker up front so the first request is already fast
+    for future in [pool.submit(warm_up) for pool in pools]:
+        future.result()
+
+    def route(workbook: str) -> ProcessPoolExecutor:
+        key = os.path.normcase(os.path.abspath(workbook)).encode("utf-8", "surrogatepass")
+        return pools[zlib.crc32(key) % worker_count]
+
+    token_file = token_file or default_token_file(port)
+    token = write_token_file(token_file)
+    allowed_hosts = {f"{name}:{port}" for name in (host, "127.0.0.1", "localhost")}
+
+    started = time.time()
+    stats = {"requests": 0}
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        def _authorized(self) -> bool:
+            """Token and Host checks of every request; replies with the error itself."""
+            if self.headers.get("Host", "").lower() not in allowed_hosts:
+                self._reply(403, {"error": "unexpected Host header"})
+                return False
+            if not hmac.compare_digest(self.headers.get(TOKEN_HEADER, ""), token):
+                self._reply(403, {"error": f"missing or wrong {TOKEN_HEADER}"})
+                return False
+            return True
+
+        def _reply(self, code: int, payload: dict):
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(code)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if not self._authorized():
+                return
+            if self.path == "/status":
+                self._reply(200, {"pid": os.getpid(), "uptime": round(time.time() - started, 1),
+                                  "requests": stats["requests"], "workers": worker_count})
+            else:
+                self._reply(404, {"error": f"unknown path {self.path}"})
+
+        def do_POST(self):
+            received = time.perf_counter()
+            if not self._authorized():
+                return
+            content_type = self.headers.get("Content-Type", "").split(";")[0].strip().lower()
+            if content_type != "application/json":
+                self._reply(415, {"error": "Content-Type must be application/json"})
+                return
+            length = int(self.headers.get("Content-Length") or 0)
+            try:
+                request = json.loads(self.rfile.read(length) or b"{}")
+            except ValueError as e:
+                self._reply(400, {"error": f"invalid JSON: {e}"})
+                return
+
+            if self.path == "/shutdown":
+                self._reply(200, {"status": "stopping"})
+                threading.Thread(target=server.shutdown, daemon=True).start()
+                return
+            if self.path != "/generate":
+                self._reply(404, {"error": f"unknown path {self.path}"})
+                return
+            if not request.get("workbook"):
+                self._reply(400, {"error": "missing 'workbook'"})
+                return
+
+            with lock:
+                stats["requests"] += 1
+            try:
+                summary = route(request["workbook"]).submit(handle_generate, request).result()
+                summary["request_seconds"] = round(time.perf_counter() - received, 3)
+                self._reply(200, summary)
+            except Exception as e:
+                self._reply(500, {"error": f"{type(e).__name__}: {e}"})
+
+        def log_message(self, fmt, *args):
+            print(f"[INFO] {self.address_string()} {fmt % args}")
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    print(f"[OK] VRG daemon listening on http://{host}:{port} ({worker_count} warm workers)")
+    print(f"[INFO] Token file: {token_file}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        for pool in pools:
+            pool.shutdown()
+        if os.path.exists(token_file):
+            os.remove(token_file)
+        print("[INFO] VRG daemon stopped")
+
+
+# --------------------------- Client ---------------------------
+
+def call(path: str, payload: Optional[dict] = None, host: str = DEFAULT_HOST,
+         port: int = DEFAULT_PORT, timeout: float = 600, token_file: Optional[str] = None) -> dict:
+    """Send one request to the daemon and return the decoded JSON reply."""
+    url = f"http://{host}:{port}{path}"
+    data = json.dumps(payload).encode("utf-8") if payload is not None else None
+    token = read_token_file(token_file or default_token_file(port))
+    req = urllib.request.Request(url, data=data, headers={"Content-Type": "application/json",
+                                                          TOKEN_HEADER: token})
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as resp:
+            return json.loads(resp.read())
+    except urllib.error.HTTPError as e:
+        return json.loads(e.read() or b"{}") or {"error": str(e)}
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Warm VRG generation daemon and client.")
+    ap.add_argument("--host", default=DEFAULT_HOST, help=f"Daemon host (default: {DEFAULT_HOST})")
+    ap.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"Daemon port (default: {DEFAULT_PORT})")
+    ap.add_argument("--token-file", help="Daemon token file (default: ~/.vrg_daemon_<port>.token)")
+    sub = ap.add_subparsers(dest="command", required=True)
+
+    p_serve = sub.add_parser("serve", help="Start the daemon")
+    p_serve.add_argument("--workers", "-w", type=int, default=0, help="Worker processes (0 = one per core)")
+
+    p_client = sub.add_parser("client", help="Send a generation request")
+    p_client.add_argument("excel", help="Path to the Excel workbook (.xlsx)")
+    p_client.add_argument("--out-dir", "-o", help="Output directory (default: next to the workbook)")
+    p_client.add_argument("--variants", help="Comma-separated suffixes (default: all)")
+    p_client.add_argument("--outputs", default="master,configs,tests",
+                          help="Comma-separated: master,configs,tests (default: all)")
+    p_client.add_argument("--subroutines", action="store_true", help="Emit parametrized subroutines")
+    p_client.add_argument("--formats", help="Extra comma-separated formats (h, json, csv)")
+
+    sub.add_parser("status", help="Show daemon status")
+    sub.add_parser("stop", help="Stop the daemon")
+
+    args = ap.parse_args()
+
+    if args.command == "serve":
+        serve(args.host, args.port, args.workers or None, args.token_file)
+        return 0
+
+    connection = {"host": args.host, "port": args.port, "token_file": args.token_file}
+    try:
+        if args.command == "status":
+            reply = call("/status", **connection)
+        elif args.command == "stop":
+            reply = call("/shutdown", {}, **connection)
+        else:
+            request = {
+                "workbook": os.path.abspath(args.excel),
+                "output_dir": os.path.abspath(args.out_dir) if args.out_dir else None,
+                "variants": [v.strip() for v in args.variants.split(",")] if args.variants else None,
+                "outputs": [o.strip() for o in args.outputs.split(",") if o.strip()],
+                "subroutines": args.subroutines,
+                "formats": [f.strip() for f in args.formats.split(",") if f.strip()] if args.formats else [],
+            }
+            reply = call("/generate", request, **connection)
+    except FileNotFoundError as e:
+        print(f"[ERROR] No daemon token file {e.filename} (is the daemon running?)")
+        return 1
+    except urllib.error.URLError as e:
+        print(f"[ERROR] Daemon not reachable on {args.host}:{args.port}: {e.reason}")
+        return 1
+
+    if "error" in reply:
+        print(f"[ERROR] {reply['error']}")
+        return 1
+    if args.command != "client":
+        print(json.dumps(reply, indent=2))
+        return 0
+
+    print(f"[OK] {reply['workbook']} ({'cached' if reply.get('cached') else 'decoded'}, "
+          f"{reply['request_seconds']} s)")
+    for variant in reply["variants"]:
+        written = ", ".join(p for p in (variant["config"], variant["test"]) if p)
+        print(f"  - {variant['variant']}: {written}")
+    return 0
+
+
+if __name__ == "__main__":
+    import multiprocessing
+    multiprocessing.freeze_support()
+    sys.exit(main())
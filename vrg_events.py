@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+vrg_events.py
+-------------
+Structured progress events of the generators, one stream for the CLI
+(console lines), the GUI (progress bar / status), batch mode and logs
+(JSON lines).
+
+Events (GenerationEvent.kind, name, done/total, data):
+  workbook_opened   workbook path, total = sheets
+  sheet_started     sheet name, done = sheets finished before it
+  sheet_done        sheet name, data: rows, lines, ms
+  config_written    config file name, data: path, lines (master config)
+  variants_found    total = variants, data: variants
+  variant_written   variant suffix, data: path, lines (config_<variant>.hwtp)
+  tests_written     variant suffix, data: path, lines, groups (test menu)
+  workbook_done     workbook path (batch), data: status, seconds, ...
+
+Per-sheet events are rate-limited per listener and per kind (at most
+one sheet_started and one sheet_done every min_interval seconds, the
+last sheet always passes), so a workbook with hundreds of sheets does
+not flood the GUI queue or the console; file writes are always
+delivered. A listener may raise to cancel the run.
+
+The older progress(stage, done, total) callbacks keep working: they are
+attached as a listener that sees "sheet" and "variant" steps.
+
+Usage:
+  emitter = EventEmitter()
+  emitter.subscribe(console_listener(verbose=True))
+  emitter.subscribe(jsonl_listener(log_file), min_interval=0)
+  generate_multi_configs("input.xlsx", "out", events=emitter)
+
+  python vrg_gen.py all input.xlsx --out-dir out --verbose --event-log out/events.jsonl
+"""
+
+import json
+import os
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Callable, List, Optional
+
+
+# Per-sheet events delivered at most this often (seconds) by default
+DEFAULT_MIN_INTERVAL = 0.1
+
+THROTTLED_KINDS = frozenset(("sheet_started", "sheet_done"))
+
+# Event kind -> stage of the older progress(stage, done, total) callbacks
+PROGRESS_STAGES = {"sheet_done": "sheet", "variant_written": "variant", "tests_written": "variant"}
+
+
+@dataclass
+class GenerationEvent:
+    kind: str
+    name: str = ""
+    done: int = 0
+    total: int = 0
+    data: dict = field(default_factory=dict)
+    time: float = 0.0
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+class EventEmitter:
+    """Fan-out of generation events to listeners, with per-listener rate limiting."""
+
+    def __init__(self):
+        # [listener, min_interval, {throttled kind: time of the last one delivered}]
+        self._listeners: List[list] = []
+
+    def subscribe(self, listener: Callable[[GenerationEvent], None],
+                  min_interval: float = DEFAULT_MIN_INTERVAL) -> "EventEmitter":
+        self._listeners.append([listener, min_interval, {}])
+        return self
+
+    def __bool__(self) -> bool:
+        return bool(self._listeners)
+
+    def emit(self, kind: str, name: str = "", done: int = 0, total: int = 0, **data):
+        if not self._listeners:
+            return
+        now = time.perf_counter()
+        event = GenerationEvent(kind, name, done, total, data, round(time.time(), 3))
+        throttled = kind in THROTTLED_KINDS and done < total
+        for listener, min_interval, last in self._listeners:
+            if kind in THROTTLED_KINDS:
+                # Each kind has its own slot: sheet_started does not use up sheet_done's
+                if throttled and now - last.get(kind, 0.0) < min_interval:
+                    continue
+                last[kind] = now
+            listener(event)
+
+
+def as_emitter(events=None, progress=None) -> EventEmitter:
+    """
+    The emitter a generator reports to: `events` may be an EventEmitter
+    (used as is) or a single listener; `progress` is an older
+    progress(stage, done, total) callback.
+    """
+    if isinstance(events, EventEmitter) and progress is None:
+        return events
+    emitter = EventEmitter()
+    if isinstance(events, EventEmitter):
+        emitter._listeners = list(events._listeners)
+    elif events is not None:
+        emitter.subscribe(events)
+    if progress is not None:
+        emitter.subscribe(progress_listener(progress))
+    return emitter
+
+
+# ----- Listeners -----
+
+def progress_listener(progress: Callable[[str, int, int], None]) -> Callable[[GenerationEvent], None]:
+    """Adapter for progress(stage, done, total) callbacks ("sheet" / "variant")."""
+    def listener(event: GenerationEvent):
+        stage = PROGRESS_STAGES.get(event.kind)
+        if stage:
+            progress(stage, event.done, event.total)
+    return listener
+
+
+def format_event(event: GenerationEvent, verbose: bool = False) -> Optional[str]:
+    """Console line of an event in the scripts' [INFO]/[OK] style (None = not shown)."""
+    data = event.data
+    if event.kind == "workbook_opened":
+        return f"[INFO] Generating master config ({event.total} sheets)..."
+    if event.kind == "sheet_done" and verbose:
+        return (f"[INFO] Sheet {event.done}/{event.total} {event.name}: "
+                f"{data.get('rows', 0)} rows -> {data.get('lines', 0)} lines ({data.get('ms', 0)} ms)")
+    if event.kind == "config_written":
+        return f"[OK] Master config generated: {data['path']}"
+    if event.kind == "variants_found":
+        if not event.total:
+            return "[INFO] No project suffixes detected in master config."
+        return f"[INFO] Detected {event.total} project variants: {', '.join(data['variants'])}"
+    if event.kind == "variant_written":
+        return f"[OK] Generated: {data['path']}"
+    if event.kind == "tests_written":
+        return f"[OK] Generated: {data['path']} ({data.get('groups', 0)} groups, {data.get('lines', 0)} lines)"
+    if event.kind == "workbook_done":
+        if data.get("status") == "ok":
+            return (f"[OK] {event.name}: {data['variants']} variants, "
+                    f"{data['groups']} groups ({data['seconds']} s)")
+        return f"[ERROR] {event.name}: {data.get('error')}"
+    return None
+
+
+def console_listener(verbose: bool = False) -> Callable[[GenerationEvent], None]:
+    """Print events as [INFO]/[OK] lines; per-sheet lines only when verbose."""
+    def listener(event: GenerationEvent):
+        line = format_event(event, verbose)
+        if line:
+            print(line, flush=True)
+    return listener
+
+
+def jsonl_listener(stream) -> Callable[[GenerationEvent], None]:
+    """Write every event as one JSON line (machine-readable run log)."""
+    def listener(event: GenerationEvent):
+        stream.write(json.dumps(event.to_dict()) + "\n")
+        stream.flush()
+    return listener
+
+
+def logging_listener(logger) -> Callable[[GenerationEvent], None]:
+    """Forward events to a logging.Logger (per-sheet events at DEBUG)."""
+    import logging
+
+    def listener(event: GenerationEvent):
+        level = logging.DEBUG if event.kind in THROTTLED_KINDS else logging.INFO
+        if logger.isEnabledFor(level):
+            logger.log(level, "%s %s %d/%d %s", event.kind, event.name, event.done, event.total, event.data)
+    return listener
+
+
+# ----- CLI helpers -----
+
+def add_event_arguments(ap):
+    """--verbose / --event-log, shared by the generator CLIs."""
+    ap.add_argument("--verbose", "-v", action="store_true", help="Also print one line per sheet")
+    ap.add_argument("--event-log", metavar="PATH", help="Append every progress event as JSON lines to PATH")
+
+
+def emitter_from_args(args, stack) -> EventEmitter:
+    """Console listener (+ JSON lines log); the log file is closed by the ExitStack `stack`."""
+    # --verbose prints every sheet, not a rate-limited sample
+    emitter = EventEmitter().subscribe(console_listener(args.verbose),
+                                       min_interval=0 if args.verbose else DEFAULT_MIN_INTERVAL)
+    if args.event_log:
+        folder = os.path.dirname(args.event_log)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        log = stack.enter_context(open(args.event_log, "a", encoding="utf-8"))
+        emitter.subscribe(jsonl_listener(log), min_interval=0)
+    return emitter
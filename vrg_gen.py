@@ -0,0 +1,480 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+vrg_gen.py
+----------
+Single entry point for the whole Excel -> config -> test pipeline.
+
+  all   Generate the master config, every config_<variant>.hwtp and every
+        test_<variant>_v4.hwtp from one workbook, in one process tree.
+  batch Run "all" over directories / globs of workbooks on a bounded worker
+        pool, one output folder per workbook, failures isolated per workbook,
+        and a machine-readable batch_summary.json at the end.
+  search Substring / fuzzy symbol search over a generated master config
+        (trigram index, cached next to the config; see symbol_search.py).
+
+The workbook is decoded once; variant configs are split in memory and
+their test groups are computed from the in-memory symbols (classified
+once per section), so nothing is re-read from disk. Variants are emitted
+in parallel across cores with --jobs N: a worker gets only the master
+config's path and a variant suffix, reads and splits the master itself
+(once per worker process) and builds that variant's lines and groups,
+so no config text crosses the process boundary.
+
+Output is byte-identical to running GenSymb_ConfigVRG.py --multi and then
+generate_test_menu_v4.py on every variant config.
+
+Usage:
+  python vrg_gen.py all workbook.xlsx --out-dir out/ --jobs 4
+  python vrg_gen.py all workbook.xlsx --subroutines
+  python vrg_gen.py all workbook.xlsx --formats h,json,csv
+  python vrg_gen.py all workbook.xlsx --engine stream
+  python vrg_gen.py all workbook.xlsx --profile --cprofile prof/
+  python vrg_gen.py all workbook.xlsx --verbose --event-log out/events.jsonl
+  python vrg_gen.py all workbook.xlsx --map firmware.map
+  python vrg_gen.py batch workbooks/ "release/*.xlsx" --out-dir out/ --jobs 4
+  python vrg_gen.py search out/ CAN_01 --variant MAN
+  python vrg_gen.py search out/config.hwtp "spi rxbuf" --fuzzy
+"""
+
+import argparse
+import glob
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+import traceback
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import ExitStack
+from typing import Dict, List, Optional
+
+import GenSymb_ConfigVRG as genconf
+import generate_test_menu_v4 as gentest
+from vrg_events import add_event_arguments, as_emitter, emitter_from_args
+from vrg_profile import NULL_PROFILER, add_profile_arguments, finish_profile, profile_path, profiler_from_args
+
+
+ALL_OUTPUTS = ("master", "configs", "tests")
+
+
+def emit_variant(output_dir: str, base_name: str, suffix: str, config_lines: List[str],
+                 groups: Dict[str, List[str]], subroutines: bool = False,
+                 outputs=ALL_OUTPUTS) -> dict:
+    """Write config_<suffix>.hwtp and test_<suffix>_v4.hwtp for one variant."""
+    start = time.perf_counter()
+
+    config_path = None
+    if "configs" in outputs:
+        config_path = os.path.join(output_dir, f"{base_name}_{suffix}.hwtp")
+        with open(config_path, "w", encoding="utf-8") as f:
+            f.write('\n'.join(config_lines))
+
+    test_path = None
+    test_lines = 0
+    if "tests" in outputs:
+        test_path = os.path.join(output_dir, f"test_{suffix}_v4.hwtp")
+        test_lines = gentest.write_test_menu(groups, test_path, subroutines=subroutines)
+
+    return {
+        "variant": suffix,
+        "config": config_path,
+        "config_lines": len(config_lines) if config_path else 0,
+        "test": test_path,
+        "groups": len(groups),
+        "test_lines": test_lines,
+        "seconds": round(time.perf_counter() - start, 3),
+    }
+
+
+# Per worker process: (master path, size, mtime_ns) -> split_config_sections() result
+_master_sections: Dict[tuple, list] = {}
+
+
+def emit_variant_from_master(output_dir: str, base_name: str, suffix: str, master_path: str,
+                             subroutines: bool = False, outputs=ALL_OUTPUTS) -> dict:
+    """emit_variant() in a worker process: the variant's lines and groups come from the master file."""
+    stat = os.stat(master_path)
+    key = (master_path, stat.st_size, stat.st_mtime_ns)
+    sections = _master_sections.get(key)
+    if sections is None:
+        with open(master_path, "r", encoding="utf-8") as f:
+            sections, _ = genconf.split_config_sections(f.read())
+        _master_sections.clear()
+        _master_sections[key] = sections
+    config_lines = genconf.variant_config_lines(sections, suffix)
+    # One pass over the variant's lines = the per-section groups merged in section order
+    groups = gentest.groups_from_lines(config_lines)
+    return emit_variant(output_dir, base_name, suffix, config_lines, dict(groups), subroutines, outputs)
+
+
+def generate_all(xlsx_path: str, output_dir: str, base_name: str = "config",
+                 jobs: Optional[int] = 1, subroutines: bool = False,
+                 variants: Optional[List[str]] = None, outputs=ALL_OUTPUTS,
+                 combined_text: Optional[str] = None, formats: List[str] = (),
+                 engine: str = "auto", profiler=None, events=None, map_path: Optional[str] = None,
+                 records: Optional[Dict[str, list]] = None) -> dict:
+    """
+    Generate master config, variant configs and variant test menus.
+
+    jobs:     number of worker processes for the variants (1 = in-process,
+              None = one per CPU core).
+    variants: only emit these suffixes (default: every suffix found).
+    outputs:  any of "master", "configs", "tests" (default: all three).
+    combined_text: already generated master config text; skips the
+              workbook decode (used by the warm daemon's cache).
+    formats:  extra config_emitters formats (e.g. "h", "json", "csv")
+              written from the same decode as <base_name>.<ext>.
+    records:  with combined_text: the SymbolRecords of that decode
+              (Context.records) for the formats; without them the
+              formats decode the workbook again.
+    engine:   workbook reader (GenSymb_ConfigVRG.open_workbook()).
+    profiler: optional vrg_profile.Profiler: decode stages, variant split,
+              test grouping and writes (with worker processes one stage
+              for the whole pool).
+    events:   optional vrg_events.EventEmitter or listener: the decode's
+              sheet events, config_written, variants_found, then
+              variant_written / tests_written per variant as it finishes.
+    map_path: optional linker map: the decoded workbook is cross-checked
+              against it (GenSymb_ConfigVRG.check_link_map(), "map_check"
+              in the summary); needs the decode, not combined_text.
+    Returns a summary dict (master path, per-variant results, timings).
+    """
+    start = time.perf_counter()
+    profiler = profiler or NULL_PROFILER
+    emitter = as_emitter(events)
+    os.makedirs(output_dir, exist_ok=True)
+
+    # Decode the workbook once
+    map_check = None
+    if combined_text is None:
+        ctx = genconf.Context(records={} if formats else None)
+        combined_text, _ = genconf.generate_from_excel(xlsx_path, engine=engine, profiler=profiler,
+                                                       events=emitter, ctx=ctx)
+        if map_path:
+            map_check = genconf.check_link_map(ctx, map_path, profiler)
+        records = ctx.records
+    master_path = os.path.join(output_dir, f"{base_name}.hwtp")
+    if "master" in outputs:
+        with profiler.stage(f"write:{base_name}.hwtp"):
+            with open(master_path, "w", encoding="utf-8") as f:
+                f.write(combined_text)
+        emitter.emit("config_written", f"{base_name}.hwtp", path=master_path, lines=combined_text.count('\n'))
+    written_formats = {}
+    if formats:
+        import config_emitters
+        with profiler.stage("formats", formats=",".join(formats)):
+            parsed_config = config_emitters.parse_workbook(xlsx_path, base_name, combined_text=combined_text,
+                                                           records=records)
+            written_formats = config_emitters.write_formats(parsed_config, output_dir, list(formats))
+    parsed = time.perf_counter()
+
+    # Split in memory and classify every section's symbols once
+    with profiler.stage("variant_split"):
+        sections, suffixes = genconf.split_config_sections(combined_text)
+    if variants is not None:
+        suffixes = suffixes & set(variants)
+    emitter.emit("variants_found", total=len(suffixes), variants=sorted(suffixes))
+    total = len(suffixes)
+
+    def variant_events(result: dict, done: int):
+        if result["config"]:
+            emitter.emit("variant_written", result["variant"], done, total,
+                         path=result["config"], lines=result["config_lines"])
+        if result["test"]:
+            emitter.emit("tests_written", result["variant"], done, total,
+                         path=result["test"], lines=result["test_lines"], groups=result["groups"])
+
+    if jobs == 1 or total <= 1:
+        with profiler.stage("test_grouping"):
+            section_groups = [gentest.groups_from_lines(lines) for _, _, lines in sections]
+        results = []
+        for suffix in sorted(suffixes):
+            with profiler.stage(f"test_grouping:{suffix}"):
+                groups = defaultdict(list)
+                for (_, section_suffix, _), sgroups in zip(sections, section_groups):
+                    if section_suffix is None or section_suffix == suffix:
+                        for key, symbols in sgroups.items():
+                            groups[key].extend(symbols)
+            with profiler.stage(f"variant_split:{suffix}"):
+                config_lines = genconf.variant_config_lines(sections, suffix)
+            with profiler.stage(f"write:variant_{suffix}"):
+                results.append(emit_variant(output_dir, base_name, suffix, config_lines, dict(groups),
+                                            subroutines, outputs))
+            variant_events(results[-1], len(results))
+    else:
+        # Workers read the master file themselves (a temporary copy if it is not an output)
+        source = master_path
+        if "master" not in outputs:
+            fd, source = tempfile.mkstemp(prefix=f".{base_name}_", suffix=".hwtp", dir=output_dir)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(combined_text)
+        try:
+            # Workers are separate processes: the pool is measured as a whole
+            with profiler.stage("write:variants", jobs=jobs or os.cpu_count()):
+                with ProcessPoolExecutor(max_workers=jobs) as pool:
+                    futures = {pool.submit(emit_variant_from_master, output_dir, base_name, suffix,
+                                           os.path.abspath(source), subroutines, outputs): n
+                               for n, suffix in enumerate(sorted(suffixes))}
+                    results = [None] * total
+                    for done, future in enumerate(as_completed(futures), 1):
+                        results[futures[future]] = future.result()
+                        variant_events(results[futures[future]], done)
+        finally:
+            if source != master_path:
+                os.remove(source)
+    profiler.count("variants", len(results))
+    profiler.count("test_lines", sum(r["test_lines"] for r in results))
+
+    return {
+        "workbook": xlsx_path,
+        "master": master_path if "master" in outputs else None,
+        "master_lines": combined_text.count('\n'),
+        "formats": written_formats,
+        "variants": results,
+        "map_check": map_check,
+        "parse_seconds": round(parsed - start, 3),
+        "total_seconds": round(time.perf_counter() - start, 3),
+    }
+
+
+def find_workbooks(patterns: List[str], recursive: bool = False) -> List[str]:
+    """Expand files, directories and glob patterns into a sorted list of .xlsx paths."""
+    found = set()
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            sub = os.path.join(pattern, "**", "*.xlsx") if recursive else os.path.join(pattern, "*.xlsx")
+            matches = glob.glob(sub, recursive=recursive)
+        elif os.path.isfile(pattern):
+            matches = [pattern]
+        else:
+            matches = glob.glob(pattern, recursive=recursive)
+        for path in matches:
+            # Skip Excel lock files (~$name.xlsx)
+            if path.lower().endswith(".xlsx") and not os.path.basename(path).startswith("~$"):
+                found.add(os.path.normpath(path))
+    return sorted(found)
+
+
+def run_workbook(xlsx_path: str, output_dir: str, subroutines: bool = False) -> dict:
+    """Batch worker: run the full pipeline for one workbook, never raising."""
+    start = time.perf_counter()
+    try:
+        summary = generate_all(xlsx_path, output_dir, jobs=1, subroutines=subroutines)
+        return {
+            "workbook": xlsx_path,
+            "output_dir": output_dir,
+            "status": "ok",
+            "seconds": round(time.perf_counter() - start, 3),
+            "master_lines": summary["master_lines"],
+            "variants": len(summary["variants"]),
+            "groups": sum(v["groups"] for v in summary["variants"]),
+            "test_lines": sum(v["test_lines"] for v in summary["variants"]),
+        }
+    except Exception as e:
+        return {
+            "workbook": xlsx_path,
+            "output_dir": output_dir,
+            "status": "error",
+            "seconds": round(time.perf_counter() - start, 3),
+            "error": f"{type(e).__name__}: {e}",
+            "traceback": traceback.format_exc(),
+        }
+
+
+def run_batch(workbooks: List[str], output_root: str, jobs: Optional[int] = None,
+              subroutines: bool = False, progress=None, events=None) -> dict:
+    """
+    Process many workbooks on a bounded process pool.
+    Each workbook gets its own folder <output_root>/<workbook name>.
+    progress(result) is called as each workbook finishes; events
+    (vrg_events.EventEmitter or listener) gets a workbook_done event with
+    the same result.
+    """
+    emitter = as_emitter(events)
+    start = time.perf_counter()
+    os.makedirs(output_root, exist_ok=True)
+
+    # One output folder per workbook (disambiguate equal names)
+    targets = []
+    used = set()
+    for path in workbooks:
+        name = os.path.splitext(os.path.basename(path))[0]
+        folder = name
+        n = 2
+        while folder in used:
+            folder = f"{name}_{n}"
+            n += 1
+        used.add(folder)
+        targets.append((path, os.path.join(output_root, folder)))
+
+    results = []
+
+    def finished(result: dict):
+        results.append(result)
+        emitter.emit("workbook_done", result["workbook"], len(results), len(targets),
+                     **{k: v for k, v in result.items() if k not in ("workbook", "traceback")})
+        if progress:
+            progress(result)
+
+    if jobs == 1:
+        for path, folder in targets:
+            finished(run_workbook(path, folder, subroutines))
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = [pool.submit(run_workbook, path, folder, subroutines) for path, folder in targets]
+            for future in as_completed(futures):
+                finished(future.result())
+
+    order = {path: i for i, (path, _) in enumerate(targets)}
+    results.sort(key=lambda r: order[r["workbook"]])
+    return {
+        "workbooks": len(results),
+        "ok": sum(1 for r in results if r["status"] == "ok"),
+        "failed": sum(1 for r in results if r["status"] != "ok"),
+        "total_seconds": round(time.perf_counter() - start, 3),
+        "results": results,
+    }
+
+
+def cmd_all(args) -> int:
+    if not os.path.exists(args.excel):
+        print(f"[ERROR] Not found: {args.excel}")
+        return 1
+
+    formats = [f.strip().lower() for f in args.formats.split(",") if f.strip()] if args.formats else []
+    if formats:
+        import config_emitters
+        unknown = [f for f in formats if f not in config_emitters.EMITTERS]
+        if unknown:
+            print(f"[ERROR] Unknown format(s): {', '.join(unknown)} "
+                  f"(available: {', '.join(config_emitters.EMITTERS)})")
+            return 1
+
+    if args.map and not os.path.exists(args.map):
+        print(f"[ERROR] Linker map not found: {args.map}")
+        return 1
+
+    jobs = args.jobs if args.jobs > 0 else None
+    profiler = profiler_from_args(args)
+    with ExitStack() as stack:
+        summary = generate_all(args.excel, args.out_dir, args.base_name, jobs=jobs,
+                               subroutines=args.subroutines, formats=formats, engine=args.engine,
+                               profiler=profiler, events=emitter_from_args(args, stack), map_path=args.map)
+
+    for name, path in summary["formats"].items():
+        print(f"[OK] {name}: {path}")
+    if summary["map_check"] is not None:
+        import linker_map
+        linker_map.print_map_report(summary["map_check"])
+    print(f"[INFO] Decode: {summary['parse_seconds']} s, total: {summary['total_seconds']} s")
+    finish_profile(profiler, profile_path(args, args.out_dir))
+    return 0
+
+
+def cmd_batch(args) -> int:
+    workbooks = find_workbooks(args.inputs, recursive=args.recursive)
+    if not workbooks:
+        print("[ERROR] No .xlsx workbooks found")
+        return 1
+
+    jobs = args.jobs if args.jobs > 0 else None
+    print(f"[INFO] Processing {len(workbooks)} workbook(s) with {jobs or os.cpu_count()} worker(s)...")
+
+    with ExitStack() as stack:
+        summary = run_batch(workbooks, args.out_dir, jobs=jobs, subroutines=args.subroutines,
+                            events=emitter_from_args(args, stack))
+
+    summary_path = args.summary or os.path.join(args.out_dir, "batch_summary.json")
+    with open(summary_path, "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2)
+
+    print(f"[INFO] {summary['ok']} ok, {summary['failed']} failed in {summary['total_seconds']} s")
+    print(f"[OK] Summary written: {summary_path}")
+    return 0 if summary["failed"] == 0 else 1
+
+
+def cmd_search(args) -> int:
+    from symbol_search import SymbolIndex
+
+    source = args.source
+    if os.path.isdir(source):
+        source = os.path.join(source, f"{args.base_name}.hwtp")
+    if not os.path.exists(source):
+        print(f"[ERROR] Not found: {source}")
+        return 1
+
+    start = time.perf_counter()
+    index = SymbolIndex.load(source, use_cache=not args.no_cache)
+    loaded = time.perf_counter()
+    hits = index.search(args.query, fuzzy=args.fuzzy, variant=args.variant, limit=args.limit)
+    searched = time.perf_counter()
+
+    print(f"[INFO] {len(index)} definitions indexed (load {round((loaded - start) * 1000, 1)} ms)")
+    for hit in hits:
+        variant = hit.variant or "common"
+        group = hit.group or "-"
+        print(f"  {hit.symbol:<32} [{variant}] {hit.sheet}:{hit.line_no}  {group}  {hit.definition.strip()}")
+    print(f"[OK] {len(hits)} match(es) in {round((searched - loaded) * 1000, 2)} ms")
+    return 0 if hits else 1
+
+
+def build_parser() -> argparse.ArgumentParser:
+    ap = argparse.ArgumentParser(prog="vrg_gen", description="VRG config & test generator pipeline.")
+    sub = ap.add_subparsers(dest="command", required=True)
+
+    p_all = sub.add_parser("all", help="Generate configs and test menus for every variant")
+    p_all.add_argument("excel", help="Path to the Excel workbook (.xlsx)")
+    p_all.add_argument("--out-dir", "-o", default=".", help="Output directory (default: .)")
+    p_all.add_argument("--base-name", default="config", help="Config base name (default: config)")
+    p_all.add_argument("--jobs", "-j", type=int, default=1,
+                       help="Worker processes for the variants (0 = one per core, default: 1)")
+    p_all.add_argument("--subroutines", action="store_true",
+                       help="Emit test bodies once as parametrized subroutines")
+    p_all.add_argument("--formats", help="Extra comma-separated output formats from the same decode "
+                                         "(h, json, csv, db; see config_emitters.py)")
+    p_all.add_argument("--engine", choices=genconf.EXCEL_ENGINES, default="auto",
+                       help="Workbook reader: pandas, stream (openpyxl only) or auto (default)")
+    p_all.add_argument("--map", metavar="MAP",
+                       help="Linker map (GNU ld / TASKING): cross-check the Master addresses and resolved symbols")
+    add_profile_arguments(p_all)
+    add_event_arguments(p_all)
+    p_all.set_defaults(func=cmd_all)
+
+    p_batch = sub.add_parser("batch", help="Run 'all' for every workbook in directories/globs")
+    p_batch.add_argument("inputs", nargs="+", help="Workbook files, directories or glob patterns")
+    p_batch.add_argument("--out-dir", "-o", default="batch_out",
+                         help="Root output directory; one folder per workbook (default: batch_out)")
+    p_batch.add_argument("--jobs", "-j", type=int, default=0,
+                         help="Maximum concurrent workbooks (0 = one per core, default: 0)")
+    p_batch.add_argument("--recursive", "-r", action="store_true", help="Search directories recursively")
+    p_batch.add_argument("--summary", help="Summary JSON path (default: <out-dir>/batch_summary.json)")
+    p_batch.add_argument("--subroutines", action="store_true",
+                         help="Emit test bodies once as parametrized subroutines")
+    p_batch.add_argument("--event-log", metavar="PATH",
+                         help="Append a workbook_done event per workbook as JSON lines to PATH")
+    p_batch.set_defaults(func=cmd_batch, verbose=False)
+
+    p_search = sub.add_parser("search", help="Search symbols of a generated master config")
+    p_search.add_argument("source", help="Master config (config.hwtp) or the output directory holding it")
+    p_search.add_argument("query", help="Substring (case-insensitive) or fuzzy query")
+    p_search.add_argument("--fuzzy", action="store_true", help="Also rank near matches (typos, word order)")
+    p_search.add_argument("--variant", help="Only this variant (plus common sections)")
+    p_search.add_argument("--limit", type=int, default=20, help="Maximum matches (default: 20)")
+    p_search.add_argument("--base-name", default="config", help="Config base name in a directory (default: config)")
+    p_search.add_argument("--no-cache", action="store_true", help="Rebuild the index, do not read/write the cache")
+    p_search.set_defaults(func=cmd_search)
+
+    return ap
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main())
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+vrg_profile.py
+--------------
+Per-stage run profile for the generators (--profile on the CLIs, the
+Diagnostics toggle in the GUI).
+
+A Profiler records, for every stage of a run:
+  wall time and how often it ran - workbook open, each sheet parse,
+  each processor call, variant split, test grouping, each file write
+and counters:
+  rows processed, rows skipped by reason (missing base, circular
+  reference, unparsable offset, empty), lines emitted, ...
+
+Heap tracing (tracemalloc) slows allocation-heavy code several times
+over, so it is opt-in (trace_memory=True, --profile-memory): it adds
+each stage's own peak (heap high-water mark above the heap at stage
+start) and skews that run's timings - use it for memory, a plain
+--profile run for time.
+
+Stages may nest (a child's peak also counts for its parent). With a
+cProfile directory, every outermost stage is also profiled with cProfile
+and dumped as <n>_<stage>.prof (open with snakeviz / pstats).
+
+The generators take `profiler=None`; NULL_PROFILER is used instead, so
+an unprofiled run pays nothing.
+
+Usage:
+  profiler = Profiler(cprofile_dir="prof/")
+  text, _ = generate_from_excel("input.xlsx", profiler=profiler)
+  profiler.write_json("profile.json")
+
+  python GenSymb_ConfigVRG.py input.xlsx --multi --profile profile.json
+  python vrg_gen.py all input.xlsx --profile --cprofile prof/
+  python vrg_gen.py all input.xlsx --profile --profile-memory
+"""
+
+import json
+import os
+import re
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+
+class Profiler:
+    """Stage timings, counters and (opt-in) heap peaks of one run."""
+
+    def __init__(self, cprofile_dir: Optional[str] = None, trace_memory: bool = False):
+        self.cprofile_dir = cprofile_dir
+        self.trace_memory = trace_memory
+        self.stages: List[dict] = []
+        self.counters: Counter = Counter()
+        self.cprofile_files: List[str] = []
+        self._stack: List[dict] = []
+        self._started_tracing = False
+        self._start = time.perf_counter()
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+
+    @contextmanager
+    def stage(self, name: str, **info):
+        """Time `name` (and its own heap peak); extra keyword info is stored with it."""
+        record = {"stage": name, **info}
+        if self.trace_memory:
+            # The parent's peak so far is kept before the child resets it
+            current, peak = tracemalloc.get_traced_memory()
+            if self._stack:
+                parent = self._stack[-1]
+                parent["_peak"] = max(parent["_peak"], peak)
+            tracemalloc.reset_peak()
+            # Peaks are absolute; the stage reports the part above its starting heap
+            record["_start_heap"] = current
+            record["_peak"] = current
+
+        profile = None
+        if self.cprofile_dir and not self._stack:
+            import cProfile
+            profile = cProfile.Profile()
+
+        # Listed in start order, so nested stages follow their parent
+        record["depth"] = len(self._stack)
+        self.stages.append(record)
+        self._stack.append(record)
+        start = time.perf_counter()
+        if profile is not None:
+            profile.enable()
+        try:
+            yield record
+        finally:
+            if profile is not None:
+                profile.disable()
+            record["seconds"] = round(time.perf_counter() - start, 6)
+            self._stack.pop()
+            if self.trace_memory:
+                peak = max(record.pop("_peak"), tracemalloc.get_traced_memory()[1])
+                record["peak_mb"] = round((peak - record.pop("_start_heap")) / (1024 * 1024), 3)
+                if self._stack:
+                    self._stack[-1]["_peak"] = max(self._stack[-1]["_peak"], peak)
+                tracemalloc.reset_peak()
+            if profile is not None:
+                self._dump_cprofile(profile, name)
+
+    def _dump_cprofile(self, profile, name: str):
+        os.makedirs(self.cprofile_dir, exist_ok=True)
+        safe = re.sub(r"[^\w.-]+", "_", name)
+        path = os.path.join(self.cprofile_dir, f"{len(self.cprofile_files) + 1:03d}_{safe}.prof")
+        profile.dump_stats(path)
+        self.cprofile_files.append(path)
+
+    def count(self, name: str, n: int = 1):
+        self.counters[name] += n
+
+    def add_counters(self, counters: Dict[str, int]):
+        self.counters.update(counters)
+
+    def summary(self) -> Dict[str, dict]:
+        """Totals per stage kind (the part before ':', e.g. all 'sheet_parse:*')."""
+        kinds: Dict[str, dict] = {}
+        for record in self.stages:
+            if "seconds" not in record:
+                continue
+            kind = record["stage"].split(":", 1)[0]
+            total = kinds.setdefault(kind, {"count": 0, "seconds": 0.0})
+            total["count"] += 1
+            total["seconds"] = round(total["seconds"] + record["seconds"], 6)
+            if "peak_mb" in record:
+                total["peak_mb"] = max(total.get("peak_mb", 0.0), record["peak_mb"])
+        return kinds
+
+    def to_dict(self) -> dict:
+        result = {
+            "total_seconds": round(time.perf_counter() - self._start, 6),
+            "summary": self.summary(),
+            "stages": self.stages,
+            "counters": dict(sorted(self.counters.items())),
+        }
+        if self.trace_memory:
+            result["peak_mb"] = round(max((r.get("peak_mb", 0.0) for r in self.stages), default=0.0), 3)
+        if self.cprofile_files:
+            result["cprofile"] = self.cprofile_files
+        return result
+
+    def write_json(self, path: str) -> str:
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2)
+        return path
+
+    def print_summary(self, top: int = 5):
+        """Short [INFO] report: time per stage kind, slowest stages, counters."""
+        data = self.to_dict()
+        print(f"[INFO] Profile: {data['total_seconds']:.3f} s total"
+              + (f", peak heap {data['peak_mb']:.1f} MB" if "peak_mb" in data else ""))
+        for kind, total in sorted(data["summary"].items(), key=lambda item: -item[1]["seconds"]):
+            print(f"  - {kind:<30} {total['seconds']:8.3f} s  ({total['count']}x)")
+        slowest = sorted(self.stages, key=lambda r: -r.get("seconds", 0.0))[:top]
+        if slowest:
+            print("[INFO] Slowest stages:")
+            for record in slowest:
+                print(f"  - {record['stage']:<40} {record['seconds']:8.3f} s")
+        if self.counters:
+            print("[INFO] Counters: " + ", ".join(f"{k}={v}" for k, v in sorted(self.counters.items())))
+
+    def close(self):
+        """Stop tracemalloc if this profiler started it."""
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+
+# ----- CLI helpers -----
+
+def add_profile_arguments(ap, default_name: str = "profile.json"):
+    """--profile [PATH] / --profile-memory / --cprofile DIR, shared by the generator CLIs."""
+    # A bare --profile gives "", resolved by profile_path()
+    ap.add_argument("--profile", nargs="?", const="", default=None, metavar="PATH",
+                    help=f"Write per-stage timings and row counters as JSON "
+                         f"(default file: {default_name} next to the output)")
+    ap.add_argument("--profile-memory", action="store_true",
+                    help="With --profile: also record each stage's heap peak (tracemalloc; "
+                         "several times slower, so timings of that run are skewed)")
+    ap.add_argument("--cprofile", metavar="DIR",
+                    help="With --profile: also dump a cProfile file per stage into DIR")
+
+
+def profiler_from_args(args) -> Optional[Profiler]:
+    if args.profile is None and not args.cprofile and not args.profile_memory:
+        return None
+    return Profiler(cprofile_dir=args.cprofile, trace_memory=args.profile_memory)
+
+
+def profile_path(args, out_dir: str, default_name: str = "profile.json") -> str:
+    """--profile PATH as given; a bare --profile (or only --cprofile / --profile-memory) writes into the output folder."""
+    if args.profile:
+        return args.profile
+    return os.path.join(out_dir or ".", default_name)
+
+
+def finish_profile(profiler: Optional[Profiler], path: str):
+    """Write the JSON profile, print the summary and stop tracing."""
+    if profiler is None:
+        return
+    profiler.close()
+    profiler.print_summary()
+    profiler.write_json(path)
+    print(f"[OK] Profile written: {path}")
+    if profiler.cprofile_files:
+        print(f"[OK] {len(profiler.cprofile_files)} cProfile dump(s) in: {profiler.cprofile_dir}")
+
+
+class NullProfiler:
+    """Stand-in used when no profile is requested: every call is a no-op."""
+
+    @contextmanager
+    def stage(self, name: str, **info):
+        yield {}
+
+    def count(self, name: str, n: int = 1):
+        pass
+
+    def add_counters(self, counters: Dict[str, int]):
+        pass
+
+
+NULL_PROFILER = NullProfiler()